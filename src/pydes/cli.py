@@ -7,7 +7,9 @@ import click
 
 from pydes.core.rnd.rndgen import MarcianiMultiStream, MarcianiSingleStream
 from pydes.core.utils import guiutils, logutils
+from pydes.core.utils.cache import DEFAULT_CACHE_SIZE
 from pydes.exp.analytical import analytical_solution
+from pydes.exp.benchmark import calendar_engines, events, rnd_block
 from pydes.exp.rnd import (
     extremes,
     jumpfind,
@@ -17,7 +19,12 @@ from pydes.exp.rnd import (
     mulfind,
     spectral,
 )
-from pydes.exp.simulation import performance_analysis, transient_analysis, validation
+from pydes.exp.simulation import (
+    performance_analysis,
+    sweep,
+    transient_analysis,
+    validation,
+)
 
 logger = logutils.get_logger(__name__)
 
@@ -227,11 +234,20 @@ def test_kolmogorov_smirnov(ctx, modulus, multiplier, jumper, streams, test, tes
     type=str,
     help="Parameters (JSON), e.g. {'system': {'cloudlet': {'threshold': 20}}}.",
 )
+@click.option(
+    "--workers",
+    default=transient_analysis.DEFAULT_WORKERS,
+    show_default=True,
+    type=int,
+    help="Number of parallel workers (if not given, replications are executed sequentially).",
+)
 @click.pass_context
-def simulate_transient(ctx, config, outdir, parameters):
+def simulate_transient(ctx, config, outdir, parameters, workers):
     logger.info("Executing: {}".format(transient_analysis.__file__))
-    logger.info("Arguments: config={} | outdir={} | parameters={}".format(config, outdir, parameters))
-    transient_analysis.run(config, outdir, json.loads(str(parameters)))
+    logger.info(
+        "Arguments: config={} | outdir={} | parameters={} | workers={}".format(config, outdir, parameters, workers)
+    )
+    transient_analysis.run(config, outdir, json.loads(str(parameters)), workers)
     logger.info("Completed: {}".format(transient_analysis.__file__))
 
 
@@ -257,14 +273,82 @@ def simulate_transient(ctx, config, outdir, parameters):
     type=str,
     help='Parameters (JSON), e.g. \'{"system": {"cloudlet": {"threshold": 20}}}\'.',
 )
+@click.option(
+    "--cache-dir",
+    default=None,
+    show_default=True,
+    type=click.Path(exists=False),
+    help="Cache directory (if not given, results are not cached).",
+)
+@click.option(
+    "--cache-size", default=DEFAULT_CACHE_SIZE, show_default=True, type=int, help="Maximum size of the cache (bytes)."
+)
 @click.pass_context
-def simulate_performance(ctx, config, outdir, parameters):
+def simulate_performance(ctx, config, outdir, parameters, cache_dir, cache_size):
     logger.info("Executing: {}".format(performance_analysis.__file__))
-    logger.info("Arguments: config={} | outdir={} | parameters={}".format(config, outdir, parameters))
-    performance_analysis.run(config, outdir, json.loads(str(parameters)))
+    logger.info(
+        "Arguments: config={} | outdir={} | parameters={} | cache_dir={} | cache_size={}".format(
+            config, outdir, parameters, cache_dir, cache_size
+        )
+    )
+    performance_analysis.run(config, outdir, json.loads(str(parameters)), cache_dir, cache_size)
     logger.info("Completed: {}".format(performance_analysis.__file__))
 
 
+@main.command(name="sweep", help="Simulate (Performance Analysis) over a grid of parameters: Cloud-Cloudlet.")
+@click.option(
+    "--config",
+    default=performance_analysis.DEFAULT_CONFIG_PATH,
+    show_default=True,
+    type=click.Path(exists=True),
+    help="Configuration.",
+)
+@click.option(
+    "--outdir",
+    default=sweep.DEFAULT_OUTDIR,
+    show_default=True,
+    type=click.Path(exists=False),
+    help="Output directory.",
+)
+@click.option(
+    "--grid",
+    default=sweep.DEFAULT_GRID,
+    show_default=True,
+    type=str,
+    help='Grid (JSON), e.g. {"system.cloudlet.threshold": [5, 20], "system.cloudlet.n_servers": [20, 40]}.',
+)
+@click.option(
+    "--parameters",
+    default=sweep.DEFAULT_PARAMETERS,
+    show_default=True,
+    type=str,
+    help='Parameters (JSON) for every point, e.g. {"general": {"batches": 64}}.',
+)
+@click.option(
+    "--workers", default=sweep.DEFAULT_WORKERS, show_default=True, type=int, help="Number of parallel workers."
+)
+@click.option(
+    "--cache-dir",
+    default=None,
+    show_default=True,
+    type=click.Path(exists=False),
+    help="Cache directory (if not given, results are not cached).",
+)
+@click.option(
+    "--cache-size", default=DEFAULT_CACHE_SIZE, show_default=True, type=int, help="Maximum size of the cache (bytes)."
+)
+@click.pass_context
+def sweep_performance(ctx, config, outdir, grid, parameters, workers, cache_dir, cache_size):
+    logger.info("Executing: {}".format(sweep.__file__))
+    logger.info(
+        "Arguments: config={} | outdir={} | grid={} | parameters={} | workers={} | cache_dir={} | cache_size={}".format(
+            config, outdir, grid, parameters, workers, cache_dir, cache_size
+        )
+    )
+    sweep.run(config, outdir, json.loads(str(grid)), json.loads(str(parameters)), workers, cache_dir, cache_size)
+    logger.info("Completed: {}".format(sweep.__file__))
+
+
 @main.command(help="Solve with Markov Chain: Cloud-Cloudlet.")
 @click.option(
     "--config",
@@ -287,11 +371,25 @@ def simulate_performance(ctx, config, outdir, parameters):
     type=str,
     help='Parameters (JSON), e.g. \'{"system": {"cloudlet": {"threshold": 20}}}\'.',
 )
+@click.option(
+    "--cache-dir",
+    default=None,
+    show_default=True,
+    type=click.Path(exists=False),
+    help="Cache directory (if not given, results are not cached).",
+)
+@click.option(
+    "--cache-size", default=DEFAULT_CACHE_SIZE, show_default=True, type=int, help="Maximum size of the cache (bytes)."
+)
 @click.pass_context
-def solve_cloud_cloudlet(ctx, config, outdir, parameters):
+def solve_cloud_cloudlet(ctx, config, outdir, parameters, cache_dir, cache_size):
     logger.info("Executing: {}".format(analytical_solution.__file__))
-    logger.info("Arguments: config={} | outdir={} | parameters={}".format(config, outdir, parameters))
-    analytical_solution.run(config, outdir, json.loads(str(parameters)))
+    logger.info(
+        "Arguments: config={} | outdir={} | parameters={} | cache_dir={} | cache_size={}".format(
+            config, outdir, parameters, cache_dir, cache_size
+        )
+    )
+    analytical_solution.run(config, outdir, json.loads(str(parameters)), cache_dir, cache_size)
     logger.info("Completed: {}".format(analytical_solution.__file__))
 
 
@@ -329,5 +427,91 @@ def validate_cloud_cloudlet(ctx, analytical_result, simulation_result, outdir):
     logger.info("Completed: {}".format(validation.__file__))
 
 
+@main.command(help="Benchmark: event list engines.")
+@click.option(
+    "--events",
+    default=",".join(map(str, calendar_engines.DEFAULT_EVENTS)),
+    show_default=True,
+    type=str,
+    help="Numbers of pending events (comma-separated).",
+)
+@click.option("--holds", default=calendar_engines.DEFAULT_HOLDS, show_default=True, type=int, help="Hold operations.")
+@click.option(
+    "--engines",
+    default=",".join(calendar_engines.DEFAULT_ENGINES),
+    show_default=True,
+    type=str,
+    help="Calendar engines (comma-separated).",
+)
+@click.option(
+    "--outdir",
+    default=calendar_engines.DEFAULT_OUTDIR,
+    show_default=True,
+    type=click.Path(exists=False),
+    help="Output directory.",
+)
+@click.pass_context
+def benchmark_calendar(ctx, events, holds, engines, outdir):
+    logger.info("Executing: {}".format(calendar_engines.__file__))
+    logger.info("Arguments: events={} | holds={} | engines={} | outdir={}".format(events, holds, engines, outdir))
+    calendar_engines.run([int(n) for n in events.split(",")], holds, engines.split(","), outdir)
+    logger.info("Completed: {}".format(calendar_engines.__file__))
+
+
+@main.command(help="Benchmark: event implementations.")
+@click.option(
+    "--events", "n_events", default=events.DEFAULT_EVENTS, show_default=True, type=int, help="Pending events."
+)
+@click.option("--holds", default=events.DEFAULT_HOLDS, show_default=True, type=int, help="Hold operations.")
+@click.option(
+    "--implementations",
+    default=",".join(events.DEFAULT_IMPLEMENTATIONS),
+    show_default=True,
+    type=str,
+    help="Event implementations (comma-separated).",
+)
+@click.option(
+    "--outdir",
+    default=events.DEFAULT_OUTDIR,
+    show_default=True,
+    type=click.Path(exists=False),
+    help="Output directory.",
+)
+@click.pass_context
+def benchmark_events(ctx, n_events, holds, implementations, outdir):
+    logger.info("Executing: {}".format(events.__file__))
+    logger.info(
+        "Arguments: events={} | holds={} | implementations={} | outdir={}".format(
+            n_events, holds, implementations, outdir
+        )
+    )
+    events.run(n_events, holds, implementations.split(","), outdir)
+    logger.info("Completed: {}".format(events.__file__))
+
+
+@main.command(help="Benchmark: scalar and block generation of pseudo-random numbers.")
+@click.option("--samsize", default=rnd_block.DEFAULT_SAMSIZE, show_default=True, type=int, help="Sample size.")
+@click.option(
+    "--blocks",
+    default=",".join(map(str, rnd_block.DEFAULT_BLOCKS)),
+    show_default=True,
+    type=str,
+    help="Block sizes (comma-separated).",
+)
+@click.option(
+    "--outdir",
+    default=rnd_block.DEFAULT_OUTDIR,
+    show_default=True,
+    type=click.Path(exists=False),
+    help="Output directory.",
+)
+@click.pass_context
+def benchmark_rnd(ctx, samsize, blocks, outdir):
+    logger.info("Executing: {}".format(rnd_block.__file__))
+    logger.info("Arguments: samsize={} | blocks={} | outdir={}".format(samsize, blocks, outdir))
+    rnd_block.run(samsize, [int(size) for size in blocks.split(",")], outdir)
+    logger.info("Completed: {}".format(rnd_block.__file__))
+
+
 if __name__ == "__main__":
     main(obj={})
@@ -1,11 +1,79 @@
 from statistics import mean, stdev
 
+import numpy as np
+
 from pydes.core.metrics.accumulator import WelfordAccumulator
 from pydes.core.metrics.confidence_interval import get_interval_estimation
 from pydes.core.metrics.measurement import Measure
 
 
-class BatchedMeasure(Measure):
+class BatchedStatistics(Measure):
+    """
+    A measure that has an instantaneous value and batch means, and computes:
+        * mean
+        * sdev
+        * confidence interval at a given alpha level
+        * autocorrelation
+
+    leveraging the batch means method.
+    Subclasses provide batch means (see *get_batch_means*).
+    """
+
+    def get_batch_means(self):
+        """
+        Returns the array of batch means.
+        :return: the array of batch means.
+        """
+        raise NotImplementedError("Batch means are provided by subclasses")
+
+    def nbatch(self):
+        """
+        Returns the total number of batches.
+        :return: (int) the total number of batches.
+        """
+        return len(self.get_batch_means())
+
+    def mean(self):
+        """
+        Return the mean value among all batch means.
+        :return: (float) the mean value among all batches.
+        """
+        return mean(self.get_batch_means())
+
+    def sdev(self):
+        """
+        Return the standard deviation among all batch means.
+        :return: (float) the standard deviation among all batches.
+        """
+        return stdev(self.get_batch_means()) if self.nbatch() > 1 else 0.0
+
+    def cint(self, alpha):
+        """
+        Return the confidence interval.
+        :param alpha: (float) the significance.
+        :return: the confidence interval.
+        """
+        return get_interval_estimation(self.nbatch(), self.sdev(), alpha)
+
+    def autocorrelation(self, lag=1):
+        """
+        Return the autocorrelation of batch means, at the given lag.
+        :param lag: (int) the lag (Default: 1).
+        :return: (float) the autocorrelation; 0.0, if there are not enough batches or batch means are constant.
+        """
+        batch_means = self.get_batch_means()
+        n = len(batch_means)
+        if n <= lag + 1:
+            return 0.0
+        m = mean(batch_means)
+        deviations = [batch_mean - m for batch_mean in batch_means]
+        variance = sum(d * d for d in deviations)
+        if variance == 0.0:
+            return 0.0
+        return sum(deviations[i] * deviations[i + lag] for i in range(n - lag)) / variance
+
+
+class BatchedMeasure(BatchedStatistics):
     """
     A measure that has an instantaneous value and computes:
         * mean
@@ -78,38 +146,194 @@ class BatchedMeasure(Measure):
         # Reset the accumulator
         self._accumulator.reset()
 
+    def merge_batches(self):
+        """
+        Merge adjacent pairs of batches, as if batches had double dimension.
+        The number of batches must be even, and the current batch must be empty.
+        :return: None
+        """
+        if self.nbatch() % 2 != 0:
+            raise ValueError("Cannot merge an odd number of batches: {}".format(self.nbatch()))
+        self._batch_means = [
+            (self._batch_means[i] + self._batch_means[i + 1]) / 2.0 for i in range(0, self.nbatch(), 2)
+        ]
+
+    def curr_batchdim(self):
+        """
+        Returns the number of samples in the current batch.
+        :return: (int) the number of samples in the current batch.
+        """
+        return self._accumulator.samsize()
+
+
+class BatchedMeasureArray:
+    """
+    A dense array of batch means measures, sharing batches, that computes for every cell:
+        * mean
+        * sdev
+        * confidence interval at a given alpha level
+
+    leveraging:
+        * batch means method
+        * Welford algorithm, vectorized over all the cells
+    """
+
+    def __init__(self, shape):
+        """
+        Creates a new array of batch means measures.
+        :param shape: (tuple) the shape of the array.
+        """
+        self.shape = shape
+        self._value = np.zeros(shape)
+        self._batch_mean = np.zeros(shape)
+        self._batch_samples = 0
+        self._batch_means = np.zeros((16,) + shape)
+        self._nbatch = 0
+
+    def get_value(self):
+        """
+        Returns the array of current values.
+        :return: (numpy.ndarray) the array of current values.
+        """
+        return self._value
+
+    def get_batch_means(self):
+        """
+        Returns the array of batch means, by batch.
+        :return: (numpy.ndarray) the array of batch means, by batch.
+        """
+        return self._batch_means[: self._nbatch]
+
+    def clear(self):
+        """
+        Resets the measurements as if they are just created.
+        :return: None
+        """
+        self._value[...] = 0.0
+        self.discard_data()
+
+    def discard_data(self):
+        """
+        Discards accumulated data, but retains the current values.
+        :return: None
+        """
+        self._batch_mean[...] = 0.0
+        self._batch_samples = 0
+        self._nbatch = 0
+
+    def add_sample(self, values):
+        """
+        Sets the current values and adds them as batch samples, updating the running means of all the cells at once.
+        :param values: (numpy.ndarray) the values to add as samples.
+        :return: None
+        """
+        self._value[...] = values
+        self._batch_samples += 1
+        self._batch_mean += (self._value - self._batch_mean) / self._batch_samples
+
+    def register_batch(self):
+        """
+        Register and close the current batch.
+        :return: None
+        """
+        if self._nbatch == len(self._batch_means):
+            self._batch_means = np.concatenate((self._batch_means, np.zeros_like(self._batch_means)))
+        self._batch_means[self._nbatch] = self._batch_mean
+        self._nbatch += 1
+        self._batch_mean[...] = 0.0
+        self._batch_samples = 0
+
+    def merge_batches(self):
+        """
+        Merge adjacent pairs of batches, as if batches had double dimension.
+        The number of batches must be even, and the current batch must be empty.
+        :return: None
+        """
+        if self._nbatch % 2 != 0:
+            raise ValueError("Cannot merge an odd number of batches: {}".format(self._nbatch))
+        batch_means = self.get_batch_means()
+        merged = (batch_means[0::2] + batch_means[1::2]) / 2.0
+        self._nbatch //= 2
+        self._batch_means[: self._nbatch] = merged
+
     def nbatch(self):
         """
         Returns the total number of batches.
         :return: (int) the total number of batches.
         """
-        return len(self._batch_means)
+        return self._nbatch
 
     def curr_batchdim(self):
         """
         Returns the number of samples in the current batch.
         :return: (int) the number of samples in the current batch.
         """
-        return self._accumulator.samsize()
+        return self._batch_samples
 
-    def mean(self):
+    def cell(self, index):
         """
-        Return the mean value among all batch means.
-        :return: (float) the mean value among all batches.
+        Returns the measure of a single cell.
+        :param index: (tuple) the index of the cell.
+        :return: (BatchedMeasureCell) the measure of the cell.
         """
-        return mean(self._batch_means)
+        return BatchedMeasureCell(self, index)
 
-    def sdev(self):
+
+class BatchedMeasureCell(BatchedStatistics):
+    """
+    The batch means measure of a single cell of a *BatchedMeasureArray*, i.e. a view on the current value and on the
+    batch means of the cell.
+    Statistics are computed on the batch means of the cell, as for *BatchedMeasure*; samples and batches are managed
+    by the array, for all the cells at once, so that the cell does not add samples, nor register, merge or discard
+    batches (see *BatchedMeasureArray*).
+    """
+
+    def __init__(self, array, index, unit=None):
         """
-        Return the standard deviation among all batch means.
-        :return: (float) the standard deviation among all batches.
+        Creates a new batch means measure of a cell.
+        :param array: (BatchedMeasureArray) the array.
+        :param index: (tuple) the index of the cell.
+        :param unit (String) the measurement unit (Default: None).
         """
-        return stdev(self._batch_means) if self.nbatch() > 1 else 0.0
+        Measure.__init__(self, unit)
+        self._array = array
+        self._index = index
 
-    def cint(self, alpha):
+    def get_batch_means(self):
         """
-        Return the confidence interval.
-        :param alpha: (float) the significance.
-        :return: the confidence interval.
+        Returns the list of batch means of the cell.
+        :return: the list of batch means of the cell.
         """
-        return get_interval_estimation(self.nbatch(), self.sdev(), alpha)
+        return self._array.get_batch_means()[(slice(None),) + self._index].tolist()
+
+    def get_value(self, batch=None):
+        """
+        Get the current value or, if a batch is given, the batch mean.
+        :param batch: (int) the batch (Default: None).
+        :return: the current value or the batch mean.
+        """
+        if batch is not None:
+            return self._array.get_batch_means()[(batch,) + self._index].item()
+        return self._array.get_value()[self._index].item()
+
+    def set_value(self, value):
+        """
+        Set the current value, in the array.
+        :param value: the value.
+        :return: None
+        """
+        self._array.get_value()[self._index] = value
+
+    def nbatch(self):
+        """
+        Returns the total number of batches.
+        :return: (int) the total number of batches.
+        """
+        return self._array.nbatch()
+
+    def curr_batchdim(self):
+        """
+        Returns the number of samples in the current batch.
+        :return: (int) the number of samples in the current batch.
+        """
+        return self._array.curr_batchdim()
@@ -0,0 +1,127 @@
+from csv import DictReader
+
+from pydes.core.metrics.accumulator import WelfordAccumulator
+from pydes.core.metrics.simulation_metrics import SimulationMetrics
+from pydes.core.simulation.model.scope import SystemScope, TaskScope
+from pydes.core.utils.csv_utils import save_csv
+from pydes.core.utils.trace_utils import TraceReader, is_trace_file
+
+NAN = float("nan")
+
+
+def get_performance_metrics():
+    """
+    Return the names of performance metrics, as in sampling CSV files.
+    :return: (list(string)) the names of performance metrics.
+    """
+    return [
+        "{}_{}_{}".format(metric, sys.name.lower(), tsk.name.lower())
+        for metric in sorted(SimulationMetrics(1).performance_metrics.__dict__)
+        for sys in SystemScope
+        for tsk in TaskScope
+    ]
+
+
+def get_time_grid(t_stop, t_step):
+    """
+    Return a time grid, from 0 to the stop time (included).
+    :param t_stop: (float) the stop time (s).
+    :param t_step: (float) the grid step (s).
+    :return: (list(float)) the time grid.
+    """
+    return [i * t_step for i in range(int(t_stop / t_step) + 1)]
+
+
+class EnsembleMetrics:
+    """
+    The ensemble (across-replication) statistics of performance metrics, on a common time grid.
+    Replications are aligned on the grid by holding their last sample, i.e. the value of a metric at a grid point is the
+    value of the last sample not later than the grid point; grid points before the first sample of a replication are
+    ignored for that replication.
+    Sampling files are streamed row by row, and only the per-grid-point Welford accumulators are kept in memory.
+    """
+
+    def __init__(self, grid, metrics=None):
+        """
+        Create a new set of ensemble statistics.
+        :param grid: (list(float)) the time grid, sorted.
+        :param metrics: (list(string)) the names of metrics (Default: all the performance metrics).
+        """
+        self.grid = grid
+        self.metrics = metrics if metrics is not None else get_performance_metrics()
+        self.accumulators = [{metric: WelfordAccumulator() for metric in self.metrics} for _ in self.grid]
+        self.n_replications = 0
+
+    def add_replication(self, filename):
+        """
+        Add the samples of a replication.
+        :param filename: (string) the sampling file of the replication, either CSV or trace.
+        :return: None
+        """
+        k = 0  # the next grid point
+        last = None  # the last sample
+        if is_trace_file(filename):
+            # Only the needed columns are read
+            with TraceReader(filename) as reader:
+                k, last = self._add_rows(reader.rows(["time"] + self.metrics), k, last)
+        else:
+            with open(filename, "r") as f:
+                k, last = self._add_rows(DictReader(f), k, last)
+        while k < len(self.grid):
+            self._add_sample(k, last)
+            k += 1
+        self.n_replications += 1
+
+    def _add_rows(self, rows, k, last):
+        """
+        Add the samples of a replication at the grid points they hold, i.e. up to their occurrence time.
+        :param rows: (iterable(dict)) the samples, sorted by time.
+        :param k: (int) the index of the next grid point.
+        :param last: (dict) the last sample, if any.
+        :return: (int, dict) the index of the next grid point and the last sample.
+        """
+        for row in rows:
+            t_now = float(row["time"])
+            while k < len(self.grid) and self.grid[k] < t_now:
+                self._add_sample(k, last)
+                k += 1
+            last = row
+        return k, last
+
+    def _add_sample(self, k, sample):
+        """
+        Add a sample at a grid point.
+        :param k: (int) the index of the grid point.
+        :param sample: (dict) the sample; if None, it is ignored.
+        :return: None
+        """
+        if sample is None:
+            return
+        for metric, accumulator in self.accumulators[k].items():
+            accumulator.add_value(float(sample[metric]))
+
+    def save_csv(self, filename, alpha):
+        """
+        Save the ensemble mean and confidence band of every metric, at every grid point, as CSV.
+        :param filename: (string) the filename.
+        :param alpha: (float) the significance.
+        :return: None
+        """
+        header = ["time", "replications"]
+        for metric in self.metrics:
+            header.extend(["{}_mean".format(metric), "{}_lower".format(metric), "{}_upper".format(metric)])
+
+        data = []
+        for t, accumulators in zip(self.grid, self.accumulators):
+            n = accumulators[self.metrics[0]].samsize() if len(self.metrics) > 0 else 0
+            row = [t, n]
+            for metric in self.metrics:
+                if n == 0:
+                    row.extend([NAN, NAN, NAN])
+                    continue
+                mean = accumulators[metric].mean()
+                cint = accumulators[metric].cint(alpha)
+                row.extend([mean, mean - cint, mean + cint])
+            data.append(row)
+
+        save_csv(filename, header, data, append=False, empty=True)
@@ -1,43 +1,101 @@
+import os
+from enum import Enum
+from functools import lru_cache
 from types import SimpleNamespace
 
+import numpy as np
+
 from pydes.core.simulation.model.scope import SystemScope, TaskScope
-from pydes.core.utils.csv_utils import save_csv
+from pydes.core.utils.csv_utils import BufferedCSVWriter, save_csv
+from pydes.core.utils.trace_utils import TraceWriter
 
 NAN = float("nan")
 
+# The shape of scoped arrays, indexed by (sys, tsk)
+SCOPES = (len(SystemScope), len(TaskScope))
+
+# The counters, with their types
+COUNTERS = {
+    "arrived": np.int64,
+    "completed": np.int64,
+    "service": np.float64,
+    "switched": np.int64,
+    "switched_completed": np.int64,
+    "switched_service": np.float64,
+    "switched_service_lost": np.float64,
+    "population_area": np.float64,
+}
+
+# The performance metrics
+PERFORMANCE_METRICS = ["response", "throughput", "population", "switched_ratio", "switched_response", "service_lost"]
+
+
+class SamplingFormat(Enum):
+    """
+    Enumerate the formats of sampling files.
+    """
+
+    def __new__(cls, *args, **kwds):
+        value = len(cls.__members__) + 1
+        obj = object.__new__(cls)
+        obj._value_ = value
+        return obj
+
+    def __init__(self, extension, writer):
+        self.extension = extension
+        self.writer = writer
+
+    CSV = ("csv", BufferedCSVWriter)  # text, row-oriented (see *save_csv*)
+    NPZ = ("npz", TraceWriter)  # binary, columnar and chunked, either compressed or memory-mappable (see *TraceReader*)
+
+    def filename(self, outdir):
+        """
+        Return the path of the sampling file.
+        :param outdir: (string) the output directory.
+        :return: (string) the path of the sampling file.
+        """
+        return os.path.join(outdir, "result.sampling.{}".format(self.extension))
+
+    def open(self, filename, names, compress=True, dtypes=None):
+        """
+        Open a writer of the sampling file.
+        :param filename: (string) the path of the sampling file.
+        :param names: (list(string)) the names of columns.
+        :param compress: (bool) if True, binary formats are compressed; otherwise, they are stored and memory-mappable
+        on read. Text formats are never compressed (Default: True).
+        :param dtypes: (list(numpy.dtype)) the types of columns of binary formats (Default: None, i.e. inferred).
+        :return: the writer of the sampling file.
+        """
+        if self is SamplingFormat.NPZ:
+            return self.writer(filename, names, compress=compress, dtypes=dtypes)
+        return self.writer(filename, names)
+
 
 class Sample:
     """
     The set of instantaneous sample.
     """
 
-    def __init__(self, t_now):
+    def __init__(self, t_now, counters=None, performance_metrics=None):
         """
         Create a new set of instantaneous sample.
+        Counters and performance metrics are arrays indexed by (sys, tsk).
+        :param t_now: (float) the current time.
+        :param counters: (dict) the arrays of counters, by counter (Default: None, i.e. zeros).
+        :param performance_metrics: (numpy.ndarray) the array of performance metrics, indexed by
+        (metric, sys, tsk), with metrics as in PERFORMANCE_METRICS (Default: None, i.e. zeros).
         """
         self.time = t_now
 
         # Counters
-        self.counters = SimpleNamespace(
-            arrived={sys: {tsk: 0 for tsk in TaskScope} for sys in SystemScope},
-            completed={sys: {tsk: 0 for tsk in TaskScope} for sys in SystemScope},
-            service={sys: {tsk: 0 for tsk in TaskScope} for sys in SystemScope},
-            switched={sys: {tsk: 0 for tsk in TaskScope} for sys in SystemScope},
-            switched_completed={sys: {tsk: 0 for tsk in TaskScope} for sys in SystemScope},
-            switched_service={sys: {tsk: 0 for tsk in TaskScope} for sys in SystemScope},
-            switched_service_lost={sys: {tsk: 0 for tsk in TaskScope} for sys in SystemScope},
-            population_area={sys: {tsk: 0 for tsk in TaskScope} for sys in SystemScope},
-        )
+        if counters is None:
+            counters = {counter: np.full(SCOPES, 0, dtype=object) for counter in COUNTERS}
+        self.counters = SimpleNamespace(**counters)
 
         # Performance Metrics
-        self.performance_metrics = SimpleNamespace(
-            response={sys: {tsk: 0.0 for tsk in TaskScope} for sys in SystemScope},
-            throughput={sys: {tsk: 0.0 for tsk in TaskScope} for sys in SystemScope},
-            population={sys: {tsk: 0.0 for tsk in TaskScope} for sys in SystemScope},
-            switched_ratio={sys: {tsk: 0.0 for tsk in TaskScope} for sys in SystemScope},
-            switched_response={sys: {tsk: 0.0 for tsk in TaskScope} for sys in SystemScope},
-            service_lost={sys: {tsk: 0.0 for tsk in TaskScope} for sys in SystemScope},
-        )
+        if performance_metrics is None:
+            performance_metrics = np.full((len(PERFORMANCE_METRICS),) + SCOPES, 0.0, dtype=object)
+        self.performance_metrics = SimpleNamespace(**dict(zip(PERFORMANCE_METRICS, performance_metrics)))
 
     def save_csv(self, filename, append=False, skip_header=False):
         """
@@ -47,24 +105,52 @@ class Sample:
         :param skip_header: (bool) if True, skip the CSV header.
         :return: None
         """
-        header = ["time"]
-        sample = [self.time]
+        data = [self.get_row()]
+
+        save_csv(filename, get_header(), data, append, skip_header)
+
+    def get_row(self):
+        """
+        Return the row of the sample, with values in the order of the header (see *get_header*).
+        :return: (list) the row of the sample.
+        """
+        row = [self.time]
 
+        # Arrays are flattened in (sys, tsk) order
         for counter in sorted(self.counters.__dict__):
-            for sys in SystemScope:
-                for tsk in TaskScope:
-                    header.append("{}_{}_{}".format(counter, sys.name.lower(), tsk.name.lower()))
-                    sample.append(getattr(self.counters, counter)[sys][tsk])
+            row.extend(getattr(self.counters, counter).ravel().tolist())
 
         for performance_metric in sorted(self.performance_metrics.__dict__):
-            for sys in SystemScope:
-                for tsk in TaskScope:
-                    header.append("{}_{}_{}".format(performance_metric, sys.name.lower(), tsk.name.lower()))
-                    sample.append(getattr(self.performance_metrics, performance_metric)[sys][tsk])
+            row.extend(getattr(self.performance_metrics, performance_metric).ravel().tolist())
 
-        data = [sample]
+        return row
 
-        save_csv(filename, header, data, append, skip_header)
+
+@lru_cache(maxsize=1)
+def get_header():
+    """
+    Return the header of samples.
+    :return: (tuple) the header of samples.
+    """
+    header = ["time"]
+    for name in sorted(COUNTERS) + sorted(PERFORMANCE_METRICS):
+        for sys in SystemScope:
+            for tsk in TaskScope:
+                header.append("{}_{}_{}".format(name, sys.name.lower(), tsk.name.lower()))
+    return tuple(header)
+
+
+@lru_cache(maxsize=1)
+def get_dtypes():
+    """
+    Return the types of values of samples, in the order of the header (see *get_header*).
+    :return: (tuple) the types of values of samples.
+    """
+    dtypes = [np.float64]
+    for counter in sorted(COUNTERS):
+        dtypes.extend([COUNTERS[counter]] * len(SystemScope) * len(TaskScope))
+    dtypes.extend([np.float64] * len(PERFORMANCE_METRICS) * len(SystemScope) * len(TaskScope))
+    return tuple(dtypes)
 
 
 if __name__ == "__main__":
@@ -0,0 +1,191 @@
+"""
+Sampling policies, i.e. when performance metrics are sampled and which samples are written onto the sampling file.
+"""
+
+import random
+from enum import Enum
+from math import floor, log
+
+import numpy as np
+
+
+class EveryKSampler:
+    """
+    Samples performance metrics on every k-th completion, writing every sample onto the sampling file.
+    """
+
+    def __init__(self, interval=1):
+        """
+        Create a new every-k-th-completion sampler.
+        :param interval: (int) the number of completions between samples (Default: 1).
+        """
+        self.interval = interval
+
+    def grid_points(self, t_now):
+        """
+        Return the sampling times passed since the last event, to be sampled before the current event is processed.
+        :param t_now: (float) the time of the current event.
+        :return: (iterable(float)) the sampling times.
+        """
+        return ()
+
+    def fires(self, n_completions):
+        """
+        Checks whether performance metrics are sampled after a completion.
+        :param n_completions: (int) the number of completions so far.
+        :return: (bool) True if performance metrics are sampled; False, otherwise.
+        """
+        return n_completions % self.interval == 0
+
+    def accepts(self):
+        """
+        Checks whether the next sample is written onto the sampling file, i.e. whether it has to be built.
+        Notice that it must be called exactly once for every sample.
+        :return: (bool) True if the next sample is written; False, otherwise.
+        """
+        return True
+
+    def record(self, row, writer):
+        """
+        Record an accepted sample.
+        :param row: (list) the row of the sample.
+        :param writer: the writer of the sampling file.
+        :return: None
+        """
+        writer.write(row)
+
+    def flush(self, writer):
+        """
+        Write the samples retained so far, if any.
+        :param writer: the writer of the sampling file.
+        :return: None
+        """
+        pass
+
+
+class TimeGridSampler(EveryKSampler):
+    """
+    Samples performance metrics on a fixed time grid, i.e. every *interval* time units, independently of completions.
+    Every grid point is sampled before processing the first event following it, so that the sample is time-weighted,
+    i.e. it reflects the state held since the last event (see *update_population_area*).
+    """
+
+    def __init__(self, interval=1.0):
+        """
+        Create a new time grid sampler.
+        :param interval: (float) the time between samples (Default: 1.0).
+        """
+        super().__init__(interval)
+        self._k = 1  # the index of the next grid point
+        self._t_next = self.interval
+
+    def grid_points(self, t_now):
+        while self._t_next <= t_now:
+            yield self._t_next
+            self._k += 1
+            self._t_next = self._k * self.interval  # multiplied, not accumulated, to avoid drifting
+
+    def fires(self, n_completions):
+        return False
+
+
+class ReservoirSampler(EveryKSampler):
+    """
+    Samples performance metrics on every k-th completion, but retains only a uniform random subset of samples with
+    fixed size (reservoir), written onto the sampling file sorted by time at the end of the simulation.
+    Samples are selected by the Algorithm L (Li, 1994), that draws the number of samples to skip, so that only
+    retained samples are built.
+    Retained samples are stored in a preallocated array, one record per slot, along with their indices.
+    """
+
+    def __init__(self, size, interval=1, seed=0, dtypes=None):
+        """
+        Create a new reservoir sampler.
+        :param size: (int) the size of the reservoir (samples).
+        :param interval: (int) the number of completions between samples (Default: 1).
+        :param seed: (int) the seed of the selection, independent of the simulation streams (Default: 0).
+        :param dtypes: (list(numpy.dtype)) the types of values of samples (Default: None, i.e. inferred from the first
+        sample).
+        """
+        super().__init__(interval)
+        self.size = size
+        self.rnd = random.Random(seed)
+        self._rows = None  # the retained samples, by slot
+        self._indices = np.empty(size, dtype=np.int64)  # the indices of the retained samples, by slot
+        self._filled = 0  # the number of filled slots
+        if dtypes is not None:
+            self._allocate(dtypes)
+        self._n = 0  # the number of samples so far
+        self._slot = None  # the slot of the next sample to record
+        self._w = self._draw_weight(1.0)
+        self._next = self.size + self._draw_skip()  # the index of the next sample retained, once the reservoir is full
+
+    def accepts(self):
+        i = self._n
+        self._n += 1
+        if i < self.size:
+            self._slot = i
+            return True
+        if i == self._next:
+            self._slot = self.rnd.randrange(self.size)
+            self._w = self._draw_weight(self._w)
+            self._next += self._draw_skip() + 1
+            return True
+        return False
+
+    def record(self, row, writer):
+        if self._rows is None:
+            self._allocate([np.asarray(value).dtype for value in row])
+        self._rows[self._slot] = tuple(row)
+        self._indices[self._slot] = self._n - 1
+        self._filled = max(self._filled, self._slot + 1)
+
+    def flush(self, writer):
+        if self._filled == 0:
+            return
+        order = np.argsort(self._indices[: self._filled])
+        for row in self._rows[order].tolist():
+            writer.write(list(row))
+        self._filled = 0
+
+    def _allocate(self, dtypes):
+        """
+        Allocate the reservoir, as an array of records with a field per value of samples.
+        :param dtypes: (list(numpy.dtype)) the types of values of samples.
+        :return: None
+        """
+        self._rows = np.empty(self.size, dtype=[("f{}".format(i), dtype) for i, dtype in enumerate(dtypes)])
+
+    def _draw_weight(self, w):
+        """
+        Draw the next weight of the Algorithm L.
+        :param w: (float) the current weight.
+        :return: (float) the next weight.
+        """
+        return w * (1.0 - self.rnd.random()) ** (1.0 / self.size)
+
+    def _draw_skip(self):
+        """
+        Draw the number of samples to skip of the Algorithm L.
+        :return: (int) the number of samples to skip.
+        """
+        return floor(log(1.0 - self.rnd.random()) / log(1.0 - self._w))
+
+
+class SamplingPolicy(Enum):
+    """
+    Enumerate the sampling policies.
+    """
+
+    def __new__(cls, *args, **kwds):
+        value = len(cls.__members__) + 1
+        obj = object.__new__(cls)
+        obj._value_ = value
+        return obj
+
+    def __init__(self, sampler):
+        self.sampler = sampler
+
+    EVERY_K = EveryKSampler  # every k-th completion
+    TIME_GRID = TimeGridSampler  # fixed time grid, time-weighted
+    RESERVOIR = ReservoirSampler  # uniform random subset of every k-th completion, with fixed size
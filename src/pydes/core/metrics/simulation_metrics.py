@@ -1,65 +1,114 @@
+from math import sqrt
+from sys import maxsize as INFINITE
 from types import SimpleNamespace
 
-from pydes.core.metrics.batch_means import BatchedMeasure
-from pydes.core.metrics.sampling import Sample
+import numpy as np
+
+from pydes.core.metrics.batch_means import BatchedMeasureArray
+from pydes.core.metrics.sampling import COUNTERS, PERFORMANCE_METRICS, SCOPES, Sample
+from pydes.core.rnd.rndf import idfNormal
 from pydes.core.simulation.model.scope import SystemScope, TaskScope
 from pydes.core.utils.csv_utils import save_csv
 
 NAN = float("nan")
 
+# The subsystems contributing to system counters, by counter
+_SYSTEM_COUNTER_SUBSYSTEMS = {
+    "arrived": (SystemScope.CLOUDLET, SystemScope.CLOUD),
+    "completed": (SystemScope.CLOUDLET, SystemScope.CLOUD),
+    "service": (SystemScope.CLOUDLET, SystemScope.CLOUD),
+    "switched": (SystemScope.CLOUDLET,),
+    "switched_completed": (SystemScope.CLOUD,),
+    "switched_service": (SystemScope.CLOUDLET, SystemScope.CLOUD),
+    "switched_service_lost": (SystemScope.CLOUDLET, SystemScope.CLOUD),
+    "population_area": (SystemScope.CLOUDLET, SystemScope.CLOUD),
+}
+
+# The indices of performance metrics, sorted by name as in the header of samples (see *get_header*)
+_SORTED_PERFORMANCE_METRICS = sorted(range(len(PERFORMANCE_METRICS)), key=lambda i: PERFORMANCE_METRICS[i])
+
 
 class SimulationMetrics:
     """
     The manager of simulation metrics, i.e. simulation counters and performance metrics.
     """
 
-    def __init__(self, target_batchdim):
+    def __init__(
+        self, target_batchdim, adaptive_batches=None, adaptive_metrics=None, alpha=0.05, max_batchdim=INFINITE
+    ):
         """
         Create a new set of statistics.
         :param target_batchdim: (int) the desired batch dimension (Default: infinite)
+        :param adaptive_batches: (int) if given, the (even) number of batches at which batch means are tested for
+        independence, doubling the batch dimension until they are (Default: None, i.e. fixed batch dimension).
+        :param adaptive_metrics: ([string]) the performance metrics tested for independence, as in sampling files.
+        :param alpha: (float) the significance of the independence test.
+        :param max_batchdim: (int) the maximum batch dimension, settled even if batch means are still correlated.
         """
 
         # Counters
+        # One array per counter, indexed by (sys, tsk)
         self.counters = SimpleNamespace(
-            arrived={sys: {tsk: 0 for tsk in TaskScope} for sys in SystemScope},
-            completed={sys: {tsk: 0 for tsk in TaskScope} for sys in SystemScope},
-            service={sys: {tsk: 0 for tsk in TaskScope} for sys in SystemScope},
-            switched={sys: {tsk: 0 for tsk in TaskScope} for sys in SystemScope},
-            switched_completed={sys: {tsk: 0 for tsk in TaskScope} for sys in SystemScope},
-            switched_service={sys: {tsk: 0 for tsk in TaskScope} for sys in SystemScope},
-            switched_service_lost={sys: {tsk: 0 for tsk in TaskScope} for sys in SystemScope},
-            population_area={sys: {tsk: 0 for tsk in TaskScope} for sys in SystemScope},
+            **{counter: np.zeros(SCOPES, dtype=dtype) for counter, dtype in COUNTERS.items()}
         )
 
         # Performance Metrics
+        # One array for all performance metrics, indexed by (metric, sys, tsk), and one measure per cell
+        self._performance_metrics = BatchedMeasureArray((len(PERFORMANCE_METRICS),) + SCOPES)
         self.performance_metrics = SimpleNamespace(
-            response={sys: {tsk: BatchedMeasure() for tsk in TaskScope} for sys in SystemScope},
-            throughput={sys: {tsk: BatchedMeasure() for tsk in TaskScope} for sys in SystemScope},
-            population={sys: {tsk: BatchedMeasure() for tsk in TaskScope} for sys in SystemScope},
-            switched_ratio={sys: {tsk: BatchedMeasure() for tsk in TaskScope} for sys in SystemScope},
-            switched_response={sys: {tsk: BatchedMeasure() for tsk in TaskScope} for sys in SystemScope},
-            service_lost={sys: {tsk: BatchedMeasure() for tsk in TaskScope} for sys in SystemScope},
+            **{
+                metric: {
+                    sys: {tsk: self._performance_metrics.cell((i, sys, tsk)) for tsk in TaskScope}
+                    for sys in SystemScope
+                }
+                for i, metric in enumerate(PERFORMANCE_METRICS)
+            }
         )
 
+        # Sample serialization
+        # Flattened views of counters and performance metrics, in the order of the header of samples (see *get_header*).
+        # Notice that arrays are always updated in place, so that views always reflect the current values.
+        values = self._performance_metrics.get_value()
+        self._row_views = [getattr(self.counters, counter).ravel() for counter in sorted(COUNTERS)]
+        self._row_views.extend(values[i].ravel() for i in _SORTED_PERFORMANCE_METRICS)
+
+        # Origin of performance metrics, i.e. counters values and time at which data collected so far were discarded
+        self.t_origin = 0.0
+        self._counters_origin = None
+
+        # Start of the current interval, i.e. counters values and time at the last interval (see *get_interval_metrics*)
+        self.t_interval = 0.0
+        self._counters_interval = None
+
         # Batch management
         self.n_samples = 0
         self.n_batches = 0
         self.curr_batchdim = 0
         self.target_batchdim = target_batchdim
 
-    def sampling(self, t_now):
+        # Adaptive batch management
+        self.adaptive_batches = adaptive_batches
+        self.adaptive_measures = [self.get_measure(metric) for metric in adaptive_metrics or []]
+        self.adaptive_alpha = alpha
+        self.max_batchdim = max_batchdim
+        self.batchdim_settled = adaptive_batches is None  # True if the batch dimension is not going to change
+        self.batchdim_uncorrelated = None  # True if batch means passed the independence test
+        if adaptive_batches is not None and (adaptive_batches < 4 or adaptive_batches % 2 != 0):
+            raise ValueError("The number of adaptive batches must be even and at least 4: {}".format(adaptive_batches))
+
+    def sampling(self, t_now, build=False):
         """
-        Registers a new batch sample and return sample values.
+        Registers a new batch sample and, if requested, return sample values.
+        Notice that, to write the sample, *get_row* serializes the current values without building the sample.
         :param t_now: (float) the current time.
-        :return: (Sample) the instantaneous sample.
+        :param build: (bool) if True, build the instantaneous sample; otherwise, only register the batch sample.
+        :return: (Sample) the instantaneous sample, if built; None, otherwise.
         """
-        self._compute_global_counters(t_now)
-
         # Update performance metrics
         self._compute_performance_metrics(t_now)
 
         # Build the instantaneous sample
-        sample = self.build_sample(t_now)
+        sample = self.build_sample(t_now) if build else None
 
         self.n_samples += 1
         self.curr_batchdim += 1
@@ -68,6 +117,8 @@ class SimulationMetrics:
             self._register_batch()
             self.n_batches += 1
             self.curr_batchdim = 0
+            if not self.batchdim_settled and self.n_batches == self.adaptive_batches:
+                self._adapt_batchdim()
 
         return sample
 
@@ -78,111 +129,107 @@ class SimulationMetrics:
         :param t_now: (float) the current time.
         :return: (Sample) the instantaneous sample for metrics.
         """
-        sample = Sample(t_now)
+        return Sample(
+            t_now,
+            counters={counter: values.copy() for counter, values in self.counters.__dict__.items()},
+            performance_metrics=self._performance_metrics.get_value().copy(),
+        )
 
-        # Sample counters and metrics
-        for counter in sample.counters.__dict__:
-            for sys in SystemScope:
-                for tsk in TaskScope:
-                    sample_value = getattr(self.counters, counter)[sys][tsk]
-                    getattr(sample.counters, counter)[sys][tsk] = sample_value
+    def get_row(self, t_now):
+        """
+        Returns the row of the instantaneous sample, serialized straight from the current values of counters and
+        performance metrics, i.e. the same row of *build_sample(t_now).get_row()*, without copying arrays.
+        :param t_now: (float) the current time.
+        :return: (list) the row of the instantaneous sample.
+        """
+        row = [t_now]
+        for view in self._row_views:
+            row.extend(view.tolist())
+        return row
 
-        for performance_metric in sample.performance_metrics.__dict__:
+    def get_measure(self, name):
+        """
+        Return a performance metric by name, as in sampling files, e.g. "response_system_global".
+        :param name: (string) the name of the performance metric.
+        :return: (BatchedMeasureCell) the performance metric.
+        """
+        i, sys, tsk = self.get_index(name)
+        return getattr(self.performance_metrics, PERFORMANCE_METRICS[i])[sys][tsk]
+
+    def get_index(self, name):
+        """
+        Return the index of a performance metric by name, as in sampling files, within arrays of performance metrics
+        indexed by (metric, sys, tsk) (see *get_interval_metrics*).
+        :param name: (string) the name of the performance metric.
+        :return: (tuple) the index of the performance metric.
+        """
+        for i, metric in enumerate(PERFORMANCE_METRICS):
             for sys in SystemScope:
                 for tsk in TaskScope:
-                    sample_value = getattr(self.performance_metrics, performance_metric)[sys][tsk].get_value()
-                    getattr(sample.performance_metrics, performance_metric)[sys][tsk] = sample_value
+                    if name == "{}_{}_{}".format(metric, sys.name.lower(), tsk.name.lower()):
+                        return i, sys, tsk
+        raise ValueError("Unrecognized performance metric {}".format(name))
 
-        return sample
+    def get_interval_metrics(self, t_now):
+        """
+        Returns the performance metrics of the interval since the previous call (or since the start), i.e. computed
+        over counters increments and elapsed time in the interval, rather than since the origin (e.g. the
+        non-cumulative batch values for warm-up detection).
+        :param t_now: (float) the current time.
+        :return: (numpy.ndarray) the array of performance metrics, indexed by (metric, sys, tsk).
+        """
+        c = self.counters
+        if self._counters_interval is not None:
+            c = SimpleNamespace(
+                **{counter: values - self._counters_interval[counter] for counter, values in c.__dict__.items()}
+            )
+        performance_metrics = self._get_performance_metrics(c, t_now - self.t_interval)
+        self.t_interval = t_now
+        self._counters_interval = {counter: values.copy() for counter, values in self.counters.__dict__.items()}
+        return performance_metrics
 
-    def discard_data(self):
+    def discard_data(self, t_now=None):
         """
-        Discard all batch data.
+        Discard all batch data and, if a time is given, all data collected so far, i.e. performance metrics are
+        computed from then on over counters increments and elapsed time since then (e.g. at the end of warm-up).
+        Notice that counters are not reset, so that samples still report counters since the start.
+        :param t_now: (float) the current time (Default: None, i.e. only batch data are discarded).
         :return: None
         """
-        for performance_metric in self.performance_metrics.__dict__:
-            for sys in SystemScope:
-                for tsk in TaskScope:
-                    getattr(self.performance_metrics, performance_metric)[sys][tsk].discard_data()
+        self._performance_metrics.discard_data()
+        if t_now is not None:
+            self.t_origin = t_now
+            self._counters_origin = {counter: values.copy() for counter, values in self.counters.__dict__.items()}
 
         self.n_batches = 0
         self.curr_batchdim = 0
         self.n_samples = 0
 
-    def _compute_global_counters(self, t_now):
+    def increment_counter(self, counter, sys, tsk, value=1):
         """
-        Updates aggregated counters (e.g. system global counters) using task-scoped and subsystem-scoped counters
-        (e.g. counter for task 1 in Cloudlet).
-        :param t_now (float) the current time,
+        Increments a subsystem-scoped and task-scoped counter (e.g. counter for task 1 in Cloudlet), incrementally
+        updating the aggregated counters it contributes to, i.e. system counters and global counters:
+            * arrived_system = arrived_cloudlet + arrived_cloud
+            * completed_system = completed_cloudlet + completed_cloud
+            * service_system = service_cloudlet + service_cloud
+            * switched_system = switched_cloudlet
+            * switched_completed_system = switched_completed_cloud
+            * switched_service_system = switched_service_cloudlet + switched_service_cloud
+            * switched_service_lost_system = switched_service_lost_cloudlet + switched_service_lost_cloud
+            * population_area_system = population_area_cloudlet + population_area_cloud
+            * <counter>_global = <counter>_task_1 + <counter>_task_2
+        :param counter: (string) the name of the counter, e.g. "arrived".
+        :param sys: (SystemScope) the subsystem, i.e. CLOUDLET or CLOUD.
+        :param tsk: (TaskScope) the type of task, i.e. TASK_1 or TASK_2.
+        :param value: (numeric) the increment (Default: 1).
         :return: None
         """
-        # Compute counters for each task class in system
-        #   * arrived_system = arrived_cloudlet + arrived_cloud
-        #   * completed_system = completed_cloudlet + completed_cloud
-        #   * service_system = service_cloudlet + service_cloud
-        #   * switched_system = switched_cloudlet
-        #   * switched_completed_system = switched_completed_cloud
-        #   * switched_service_system = switched_service_cloudlet + switched_service_cloud
-        #   * switched_service_lost_system = switched_service_lost_cloudlet + switched_service_lost_cloud
-        #   * population_area_system = population_area_cloudlet + population_area_lost_cloud
-        for tsk in TaskScope.concrete():
-            self.counters.arrived[SystemScope.SYSTEM][tsk] = sum(
-                self.counters.arrived[sys][tsk] for sys in SystemScope.subsystems()
-            )
-            self.counters.completed[SystemScope.SYSTEM][tsk] = sum(
-                self.counters.completed[sys][tsk] for sys in SystemScope.subsystems()
-            )
-            self.counters.service[SystemScope.SYSTEM][tsk] = sum(
-                self.counters.service[sys][tsk] for sys in SystemScope.subsystems()
-            )
-            self.counters.switched[SystemScope.SYSTEM][tsk] = self.counters.switched[SystemScope.CLOUDLET][tsk]
-            self.counters.switched_completed[SystemScope.SYSTEM][tsk] = self.counters.switched_completed[
-                SystemScope.CLOUD
-            ][tsk]
-            self.counters.switched_service[SystemScope.SYSTEM][tsk] = sum(
-                self.counters.switched_service[sys][tsk] for sys in SystemScope.subsystems()
-            )
-            self.counters.switched_service_lost[SystemScope.SYSTEM][tsk] = sum(
-                self.counters.switched_service_lost[sys][tsk] for sys in SystemScope.subsystems()
-            )
-            self.counters.population_area[SystemScope.SYSTEM][tsk] = sum(
-                self.counters.population_area[sys][tsk] for sys in SystemScope.subsystems()
-            )
-
-        # Compute counters for global tasks
-        #   * arrived_global = arrived_task_1 + arrived_task_2
-        #   * completed_global = completed_task_1 + completed_task_2
-        #   * service_global = service_task_1 + service_task_2
-        #   * switched_global = switched_task_1 + switched_task_2
-        #   * switched_completed_global = switched_completed_task_1 + switched_completed_task_2
-        #   * switched_service_global = switched_service_task_1 + switched_service_task_2
-        #   * switched_service_lost_global = switched_service_lost_task_1 + switched_service_lost_task_2
-        #   * population_area_global = population_area_task_1 + population_area_task_2
-        for sys in SystemScope:
-            self.counters.arrived[sys][TaskScope.GLOBAL] = sum(
-                self.counters.arrived[sys][tsk] for tsk in TaskScope.concrete()
-            )
-            self.counters.completed[sys][TaskScope.GLOBAL] = sum(
-                self.counters.completed[sys][tsk] for tsk in TaskScope.concrete()
-            )
-            self.counters.service[sys][TaskScope.GLOBAL] = sum(
-                self.counters.service[sys][tsk] for tsk in TaskScope.concrete()
-            )
-            self.counters.switched[sys][TaskScope.GLOBAL] = sum(
-                self.counters.switched[sys][tsk] for tsk in TaskScope.concrete()
-            )
-            self.counters.switched_completed[sys][TaskScope.GLOBAL] = sum(
-                self.counters.switched_completed[sys][tsk] for tsk in TaskScope.concrete()
-            )
-            self.counters.switched_service[sys][TaskScope.GLOBAL] = sum(
-                self.counters.switched_service[sys][tsk] for tsk in TaskScope.concrete()
-            )
-            self.counters.switched_service_lost[sys][TaskScope.GLOBAL] = sum(
-                self.counters.switched_service_lost[sys][tsk] for tsk in TaskScope.concrete()
-            )
-            self.counters.population_area[sys][TaskScope.GLOBAL] = sum(
-                self.counters.population_area[sys][tsk] for tsk in TaskScope.concrete()
-            )
+        values = getattr(self.counters, counter)
+        values[sys, tsk] += value
+        values[sys, TaskScope.GLOBAL] += value
+        if sys in _SYSTEM_COUNTER_SUBSYSTEMS[counter]:
+            values[SystemScope.SYSTEM, tsk] += value
+            values[SystemScope.SYSTEM, TaskScope.GLOBAL] += value
 
     def _compute_performance_metrics(self, t_now):
         """
@@ -191,54 +238,68 @@ class SimulationMetrics:
         :param t_now (float) the current time.
         :return: None
         """
-        # Compute performance metrics:
+        # Notice that, once data have been discarded, counters and time are taken since the origin (see *discard_data*).
+        c = self.counters
+        if self._counters_origin is not None:
+            c = SimpleNamespace(
+                **{counter: values - self._counters_origin[counter] for counter, values in c.__dict__.items()}
+            )
+            t_now -= self.t_origin
+
+        self._performance_metrics.add_sample(self._get_performance_metrics(c, t_now))
+
+    @staticmethod
+    def _get_performance_metrics(c, t):
+        """
+        Computes performance metrics from counters values and elapsed time.
+        :param c: (SimpleNamespace) the arrays of counters, by counter.
+        :param t: (float) the elapsed time.
+        :return: (numpy.ndarray) the array of performance metrics, indexed by (metric, sys, tsk).
+        """
+        # Compute performance metrics, for all scopes at once:
         #   * response = service / completed
-        #   * throughput = completed / t_now
-        #   * population = population_area / t_now
+        #   * throughput = completed / t
+        #   * population = population_area / t
         #   * switched_ratio = switched / arrived
         #   * switched_response = switched_service / switched_completed
         #   * service_lost = switched_service_lost / switched
-        for sys in SystemScope:
-            for tsk in TaskScope:
-                self.performance_metrics.response[sys][tsk].add_sample(
-                    (self.counters.service[sys][tsk] / self.counters.completed[sys][tsk])
-                    if self.counters.completed[sys][tsk] > 0
-                    else 0.0
-                )
-
-                self.performance_metrics.throughput[sys][tsk].add_sample(self.counters.completed[sys][tsk] / t_now)
-
-                self.performance_metrics.population[sys][tsk].add_sample(
-                    self.counters.population_area[sys][tsk] / t_now
-                )
-
-                self.performance_metrics.switched_ratio[sys][tsk].add_sample(
-                    (self.counters.switched[sys][tsk] / self.counters.arrived[sys][tsk])
-                    if self.counters.arrived[sys][tsk] > 0
-                    else 0.0
-                )
-
-                self.performance_metrics.switched_response[sys][tsk].add_sample(
-                    (self.counters.switched_service[sys][tsk] / self.counters.switched_completed[sys][tsk])
-                    if self.counters.switched_completed[sys][tsk] > 0
-                    else 0.0
-                )
-
-                self.performance_metrics.service_lost[sys][tsk].add_sample(
-                    (self.counters.switched_service_lost[sys][tsk] / self.counters.switched[sys][tsk])
-                    if self.counters.switched[sys][tsk] > 0
-                    else 0.0
-                )
+        # Notice that ratios with a null denominator are 0.0, e.g. throughput and population over no elapsed time.
+        values = np.zeros((len(PERFORMANCE_METRICS),) + SCOPES)
+        response, throughput, population, switched_ratio, switched_response, service_lost = values
+        np.divide(c.service, c.completed, out=response, where=c.completed > 0)
+        if t > 0.0:
+            np.divide(c.completed, t, out=throughput)
+            np.divide(c.population_area, t, out=population)
+        np.divide(c.switched, c.arrived, out=switched_ratio, where=c.arrived > 0)
+        np.divide(c.switched_service, c.switched_completed, out=switched_response, where=c.switched_completed > 0)
+        np.divide(c.switched_service_lost, c.switched, out=service_lost, where=c.switched > 0)
+        return values
 
     def _register_batch(self):
         """
         Registers the current batch of all performance metrics.
         :return: None
         """
-        for performance_metric in self.performance_metrics.__dict__:
-            for sys in SystemScope:
-                for tsk in TaskScope:
-                    getattr(self.performance_metrics, performance_metric)[sys][tsk].register_batch()
+        self._performance_metrics.register_batch()
+
+    def _adapt_batchdim(self):
+        """
+        Tests batch means for independence, i.e. whether the lag-1 autocorrelation of batch means of every tested
+        metric is within the (1-alpha) acceptance bound for uncorrelated data, z(1-alpha/2)/sqrt(batches).
+        If so, the batch dimension is settled; otherwise, adjacent batches are merged and the batch dimension doubles,
+        up to the maximum batch dimension.
+        :return: None
+        """
+        bound = idfNormal(0.0, 1.0, 1.0 - self.adaptive_alpha / 2) / sqrt(self.n_batches)
+        self.batchdim_uncorrelated = all(abs(measure.autocorrelation(1)) <= bound for measure in self.adaptive_measures)
+        if self.batchdim_uncorrelated or 2 * self.target_batchdim > self.max_batchdim:
+            self.batchdim_settled = True
+            return
+
+        self._performance_metrics.merge_batches()
+
+        self.n_batches //= 2
+        self.target_batchdim *= 2
 
     def save_csv(self, filename, append=False, skip_header=False, batch=None):
         """
@@ -250,15 +311,14 @@ class SimulationMetrics:
         :return: None
         """
         header = ["batch"]
-        data = []
+        for metric in sorted(PERFORMANCE_METRICS):
+            for sys in SystemScope:
+                for tsk in TaskScope:
+                    header.append("{}_{}_{}".format(metric, sys.name.lower(), tsk.name.lower()))
+
+        # Arrays are flattened in (sys, tsk) order
+        batch_means = self._performance_metrics.get_batch_means()
         rng_batches = range(self.n_batches) if batch is None else range(batch, batch + 1)
-        for b in rng_batches:
-            sample = [b]
-            for metric in sorted(self.performance_metrics.__dict__):
-                for sys in SystemScope:
-                    for tsk in TaskScope:
-                        header.append("{}_{}_{}".format(metric, sys.name.lower(), tsk.name.lower()))
-                        sample.append(getattr(self.performance_metrics, metric)[sys][tsk].get_value(b))
-            data.append(sample)
+        data = [[b] + batch_means[b, _SORTED_PERFORMANCE_METRICS].ravel().tolist() for b in rng_batches]
 
         save_csv(filename, header, data, append, skip_header)
@@ -0,0 +1,73 @@
+class MSERWarmupDetector:
+    """
+    An online detector of the initial transient (warm-up) of a sample stream, leveraging the MSER-5 rule, i.e.
+    the Marginal Standard Error Rule applied to the means of batches of 5 samples.
+
+    Given the batch means Z(1),...,Z(n), the truncation point is the number of batches d* minimizing
+        MSER(d) = sum((Z(i) - mean(Z(d+1),...,Z(n)))^2 for i in d+1,...,n) / (n-d)^2
+    over the first half of batches.
+    The truncation point is accepted as soon as it falls strictly within the first half of batches; otherwise, the
+    stream is too short to tell the warm-up from the steady state, and more samples are needed.
+    The rule is evaluated every time the number of batches doubles, so that the overall cost is linear.
+    """
+
+    def __init__(self, batchdim=5, min_batches=20):
+        """
+        Create a new MSER warm-up detector.
+        :param batchdim: (int) the number of samples per batch (Default: 5, i.e. MSER-5).
+        :param min_batches: (int) the number of batches at the first evaluation of the rule (Default: 20).
+        """
+        self.batchdim = batchdim
+        self._batch_means = []
+        self._batch_sum = 0.0
+        self._batch_samples = 0
+        self._next_check = min_batches
+
+        self.detected = False  # True if the end of warm-up has been detected
+        self.truncation = None  # the number of samples in the warm-up, once detected
+
+    def add_sample(self, value):
+        """
+        Add a sample to the stream, evaluating the rule when due.
+        :param value: (numeric) the sample.
+        :return: (bool) True if the end of warm-up has been detected; False, otherwise.
+        """
+        if self.detected:
+            return True
+
+        self._batch_sum += value
+        self._batch_samples += 1
+        if self._batch_samples == self.batchdim:
+            self._batch_means.append(self._batch_sum / self.batchdim)
+            self._batch_sum = 0.0
+            self._batch_samples = 0
+            if len(self._batch_means) == self._next_check:
+                self._next_check *= 2
+                d = self.truncation_point()
+                if d < len(self._batch_means) // 2:
+                    self.detected = True
+                    self.truncation = d * self.batchdim
+                    self._batch_means.clear()
+
+        return self.detected
+
+    def truncation_point(self):
+        """
+        Return the number of batches minimizing the MSER statistic over the first half of batches.
+        :return: (int) the truncation point (batches).
+        """
+        n = len(self._batch_means)
+        # Suffix sums of batch means and of their squares
+        s1 = [0.0] * (n + 1)
+        s2 = [0.0] * (n + 1)
+        for i in range(n - 1, -1, -1):
+            s1[i] = s1[i + 1] + self._batch_means[i]
+            s2[i] = s2[i + 1] + self._batch_means[i] ** 2
+
+        best_d, best_mser = 0, None
+        for d in range(0, n // 2 + 1):
+            m = n - d
+            mser = (s2[d] - s1[d] ** 2 / m) / m**2
+            if best_mser is None or mser < best_mser:
+                best_d, best_mser = d, mser
+        return best_d
@@ -6,7 +6,8 @@ BINS = 1000         # BINS >= 1000
 D = 5               # D >= 2
 CONFIDENCE = 0.95   # CONFIDENCE >= 0.95
 """
-import math
+
+import numpy as np
 
 from pydes.core.rnd.rndf import idfChisquare
 from pydes.core.utils import errutils, mathutils
@@ -27,17 +28,9 @@ def statistics(generator, samsize, bins, d):
 
 
 def observations(generator, samsize, bins, d):
-    observed = [0] * bins
-    for _ in range(samsize):
-        u1 = generator.rnd()
-        for _ in range(1, d):
-            u2 = generator.rnd()
-            if u2 > u1:
-                u1 = u2
-        u = u1 ** d
-        b = math.floor(u * bins)
-        observed[int(b)] += 1
-    return observed
+    u = generator.rnd_block(samsize * d).reshape(samsize, d).max(axis=1) ** d
+    b = np.floor(u * bins).astype(np.int64)
+    return np.bincount(b, minlength=bins).tolist()
 
 
 def _compute_chisquare_statistic(observed, samsize):
@@ -4,12 +4,15 @@ Spectral Test
 # Zoom interval
 DEFAULT_INTERVAL = (0.0, 1.0)
 """
+
+import numpy as np
+
 from pydes.core.utils.csv_utils import save_csv
 from pydes.core.utils.file_utils import empty_file
 from pydes.core.utils.guiutils import print_progress
 
-# Number of observations in memory before flushing into file
-MAX_OBSERVATIONS_BEFORE_FLUSH = 10
+# Number of observations generated (and flushed into file) at once
+OBSERVATIONS_PER_BLOCK = 65536
 
 
 def statistics(filename, rndgen, samsize, interval):
@@ -20,20 +23,17 @@ def statistics(filename, rndgen, samsize, interval):
     low = interval[0]
     high = interval[1]
 
-    observed = []
     found = 0
 
-    u1 = rndgen.rnd()
-    for i in range(1, samsize):
-        u2 = rndgen.rnd()
-        if low <= u1 <= high and low <= u2 <= high:
-            found += 1
-            observed.append((u1, u2))
-            print_progress(i, samsize, message="Found {}".format(found))
-        u1 = u2
-
-        if len(observed) == MAX_OBSERVATIONS_BEFORE_FLUSH:
+    # Generate observations block by block, carrying the last number of each block into the next one
+    u1 = rndgen.rnd_block(1)
+    for i in range(1, samsize, OBSERVATIONS_PER_BLOCK):
+        u = np.concatenate((u1, rndgen.rnd_block(min(OBSERVATIONS_PER_BLOCK, samsize - i))))
+        u1, u2 = u[:-1], u[1:]
+        inside = (low <= u1) & (u1 <= high) & (low <= u2) & (u2 <= high)
+        observed = list(zip(u1[inside].tolist(), u2[inside].tolist()))
+        found += len(observed)
+        if len(observed) != 0:
             save_csv(filename, header, observed, append=True)
-            del observed[:]
-    if len(observed) != 0:
-        save_csv(filename, header, observed, append=True)
+        print_progress(i + len(u) - 2, samsize, message="Found {}".format(found))
+        u1 = u[-1:]
@@ -9,12 +9,79 @@ Suggested configurations:
 
 """
 
+from copy import deepcopy
+
+import numpy as np
+
 DEFAULT_MODULUS = 2147483647
 DEFAULT_MULTIPLIER = 48271
 DEFAULT_STREAMS = 128
 DEFAULT_JUMPER = 40509
 DEFAULT_ISEED = 123456789
 
+# The jump sizes of the suggested configurations, by (modulus, multiplier, jumper)
+JUMP_SIZES = {
+    (2147483647, 48271, 40509): 16775552,
+    (2147483647, 50812, 29872): 8362647,
+}
+
+# The number of consecutive states computed at once by block generation
+BLOCK_SIZE = 4096
+
+# The largest modulus such that the product of two residues fits a signed 64-bit integer
+BLOCK_MAX_MODULUS = 2**31
+
+
+def lehmer_jump(seed, k, multiplier, modulus):
+    """
+    Compute the state of a Lehmer generator after k steps, i.e. seed * multiplier^k mod modulus, in O(log k).
+    :param seed: (int) the current state.
+    :param k: (int) the number of steps; must be non-negative.
+    :param multiplier: (int) the multiplier.
+    :param modulus: (int) the modulus.
+    :return: (int) the state after k steps.
+    """
+    return (seed * pow(multiplier, k, modulus)) % modulus
+
+
+def lehmer_powers(multiplier, modulus, size=BLOCK_SIZE):
+    """
+    Compute the powers of the multiplier, i.e. multiplier^k mod modulus for k in [1,size].
+    :param multiplier: (int) the multiplier.
+    :param modulus: (int) the modulus; must be at most BLOCK_MAX_MODULUS.
+    :param size: (int) the number of powers.
+    :return: (numpy.ndarray) the powers, as 64-bit integers.
+    """
+    powers = np.empty(size, dtype=np.int64)
+    powers[0] = multiplier % modulus
+    n = 1
+    while n < size:
+        # a^(n+k) = a^n * a^k, for k in [1,n]
+        m = min(n, size - n)
+        powers[n : n + m] = (powers[:m] * powers[n - 1]) % modulus
+        n += m
+    return powers
+
+
+def lehmer_block(seed, n, powers, modulus):
+    """
+    Compute the next n states of a Lehmer generator, i.e. seed * multiplier^k mod modulus for k in [1,n].
+    States are computed block by block from the last state of the previous block, with exact 64-bit arithmetic.
+    :param seed: (int) the current state.
+    :param n: (int) the number of states.
+    :param powers: (numpy.ndarray) the powers of the multiplier, as computed by *lehmer_powers*.
+    :param modulus: (int) the modulus; must be at most BLOCK_MAX_MODULUS.
+    :return: (numpy.ndarray) the states, as 64-bit integers.
+    """
+    states = np.empty(n, dtype=np.int64)
+    size = len(powers)
+    for i in range(0, n, size):
+        m = min(size, n - i)
+        np.multiply(powers[:m], seed, out=states[i : i + m])
+        np.remainder(states[i : i + m], modulus, out=states[i : i + m])
+        seed = int(states[i + m - 1])
+    return states
+
 
 class MarcianiMultiStream(object):
     """
@@ -28,6 +95,7 @@ class MarcianiMultiStream(object):
         multiplier=DEFAULT_MULTIPLIER,
         streams=DEFAULT_STREAMS,
         jumper=DEFAULT_JUMPER,
+        jump_size=None,
     ):
         """
         Creates a new rnd number generator.
@@ -39,17 +107,32 @@ class MarcianiMultiStream(object):
         *modulus*.
         Default is 48271.
         :param streams: (int) the number of disjoint streams; must be positive.
-        Default is 256.
+        Default is 128.
         :param jumper: (int) the jumper for the given streams; must be a
-        suitable jumper for the given number of *streams*.
-        Default is 22925.
-        """
+        suitable jumper for the given number of *streams*. If None, it is computed
+        from the jump size.
+        Default is 40509.
+        :param jump_size: (int) the number of steps between consecutive streams;
+        if given, the jumper is computed as multiplier^jump_size mod modulus. If both
+        jumper and jump size are None, the jump size is (modulus-1)/streams.
+        Default is None, i.e. the jump size of the given jumper, if known.
+        """
+        if jump_size is not None:
+            jumper = pow(multiplier, jump_size, modulus)
+        elif jumper is None:
+            jump_size = (modulus - 1) // streams
+            jumper = pow(multiplier, jump_size, modulus)
+        else:
+            jump_size = JUMP_SIZES.get((modulus, multiplier, jumper))
+
         self._iseed = self._seed = iseed
         self._stream = 0
         self._modulus = modulus
         self._multiplier = multiplier
         self._streams = streams
         self._jumper = jumper
+        self._jump_size = jump_size  # the number of steps between consecutive streams, if known
+        self._powers = None  # the powers of the multiplier, computed on first block generation
 
         self._init = False
 
@@ -59,22 +142,17 @@ class MarcianiMultiStream(object):
     def plant_seeds(self, x):
         """
         Initializes all the streams of the generator.
+        Every stream is seeded by jumping ahead from the previous one, with exact integer arithmetic,
+        so that any jumper can be used.
         :param x: (int) the initial seed.
         """
-        Q = int(self._modulus / self._jumper)
-        R = int(self._modulus % self._jumper)
-
         self._init = True
         s = self._stream
         self.stream(0)
         self.put_seed(x)
         self._stream = s
         for j in range(1, self._streams):
-            x = int(self._jumper * (self._seeds[j - 1] % Q) - R * int((self._seeds[j - 1] / Q)))
-            if x > 0:
-                self._seeds[j] = x
-            else:
-                self._seeds[j] = x + self._modulus
+            self._seeds[j] = (self._seeds[j - 1] * self._jumper) % self._modulus
 
     def get_initial_seed(self):
         """
@@ -111,6 +189,13 @@ class MarcianiMultiStream(object):
         """
         return self._jumper
 
+    def get_jump_size(self):
+        """
+        Retrieves the jump size, i.e. the number of steps between consecutive streams.
+        :return: (int) the jump size, if known; None, otherwise.
+        """
+        return self._jump_size
+
     def get_seed(self):
         """
         Retrieves the seed of the current stream.
@@ -138,6 +223,55 @@ class MarcianiMultiStream(object):
         if self._init is False and self._stream != 0:
             self.plant_seeds(self._iseed)
 
+    def jump(self, k):
+        """
+        Advances the current stream by k steps, in O(log k).
+        The stream is left in the same state of k consecutive calls of *rnd*.
+        :param k: (int) the number of steps; must be non-negative.
+        """
+        self._seeds[self._stream] = lehmer_jump(self._seeds[self._stream], k, self._multiplier, self._modulus)
+
+    def spawn(self, n):
+        """
+        Spawns n independent generators, with the same configuration.
+        The i-th generator is initialized with the initial seed jumped ahead by i*(jump_size/n) steps, so that every
+        stream of every spawned generator is a disjoint substream of jump_size/n numbers of the corresponding stream
+        of this generator (the 0-th generator has the same streams of this generator).
+        :param n: (int) the number of generators; must be positive.
+        :return: (list) the spawned generators.
+        """
+        if self._jump_size is None:
+            raise ValueError("Cannot spawn generators: unknown jump size for jumper {}".format(self._jumper))
+        substream = self._jump_size // n
+        if substream == 0:
+            raise ValueError("Cannot spawn {} generators: jump size is {}".format(n, self._jump_size))
+
+        generators = []
+        for i in range(n):
+            generator = deepcopy(self)
+            generator._iseed = lehmer_jump(self._iseed, i * substream, self._multiplier, self._modulus)
+            generator._stream = 0
+            generator.plant_seeds(generator._iseed)
+            generators.append(generator)
+        return generators
+
+    def expand(self, streams):
+        """
+        Increases the number of streams, re-planting all the streams from the initial seed.
+        The jumper is kept if the current jump size fits the new number of streams, so that existing streams are
+        unchanged; otherwise, the jump size becomes (modulus-1)/streams, and every stream but the 1st changes.
+        Streams should be expanded before drawing any number.
+        :param streams: (int) the new number of streams; must not be lower than the current one.
+        """
+        if streams < self._streams:
+            raise ValueError("Cannot shrink streams from {} to {}".format(self._streams, streams))
+        if self._jump_size is None or self._jump_size * streams > self._modulus - 1:
+            self._jump_size = (self._modulus - 1) // streams
+            self._jumper = pow(self._multiplier, self._jump_size, self._modulus)
+        self._streams = streams
+        self._seeds = [int(self._iseed)] * self._streams
+        self.plant_seeds(self._iseed)
+
     def rnd(self):
         """
         Generates a pseudo-rnd number from uniform distribution in [0,1)
@@ -154,6 +288,142 @@ class MarcianiMultiStream(object):
 
         return float(self._seeds[self._stream] / self._modulus)
 
+    def rnd_block(self, n):
+        """
+        Generates n pseudo-rnd numbers from uniform distribution in [0,1), from the current stream.
+        The sequence is identical to the one of n consecutive calls of *rnd*, and leaves the stream in the same state.
+        :param n: (int) the number of pseudo-rnd numbers.
+        :return: (numpy.ndarray) the uniform pseudo-rnd floats in [0,1).
+        """
+        if self._modulus > BLOCK_MAX_MODULUS:
+            return np.array([self.rnd() for _ in range(n)], dtype=np.float64)
+        if n <= 0:
+            return np.empty(0, dtype=np.float64)
+        if self._powers is None:
+            self._powers = lehmer_powers(self._multiplier, self._modulus)
+        states = lehmer_block(self._seeds[self._stream], n, self._powers, self._modulus)
+        self._seeds[self._stream] = int(states[-1])
+        return states / float(self._modulus)
+
+
+class BufferedMultiStream(MarcianiMultiStream):
+    """
+    Implementation of a multi-stream Lehmer pseudo-rnd number generator with per-stream prefetching.
+    Every stream keeps a buffer of pseudo-rnd numbers, refilled in bulk by block generation, so that *rnd* only pops
+    the next number of the current stream. Streams produce exactly the same sequences of *MarcianiMultiStream*, and
+    *get_seed* returns the seed of the last consumed number, not of the last prefetched one.
+    """
+
+    def __init__(
+        self,
+        iseed=DEFAULT_ISEED,
+        modulus=DEFAULT_MODULUS,
+        multiplier=DEFAULT_MULTIPLIER,
+        streams=DEFAULT_STREAMS,
+        jumper=DEFAULT_JUMPER,
+        jump_size=None,
+        buffer=BLOCK_SIZE,
+    ):
+        """
+        Creates a new rnd number generator.
+        :param iseed: (int) the initial seed; must be positive.
+        :param modulus: (int) the modulus; must be positive, prime and at most BLOCK_MAX_MODULUS.
+        :param multiplier: (int) the multiplier; must be a FP/MC multiplier of *modulus*.
+        :param streams: (int) the number of disjoint streams; must be positive.
+        :param jumper: (int) the jumper for the given streams; must be a suitable jumper for the given number of *streams*.
+        :param jump_size: (int) the number of steps between consecutive streams.
+        :param buffer: (int) the number of pseudo-rnd numbers prefetched at once, for every stream.
+        """
+        if modulus > BLOCK_MAX_MODULUS:
+            raise ValueError("modulus must be at most {}. Found {}".format(BLOCK_MAX_MODULUS, modulus))
+        self._buffer = buffer
+        self._numbers = {}  # the prefetched numbers, by stream
+        self._states = {}  # the states of the prefetched numbers, by stream
+        self._pos = {}  # the position of the next number to consume, by stream
+        MarcianiMultiStream.__init__(self, iseed, modulus, multiplier, streams, jumper, jump_size)
+        self._powers = lehmer_powers(self._multiplier, self._modulus, self._buffer)
+
+    def plant_seeds(self, x):
+        """
+        Initializes all the streams of the generator, discarding prefetched numbers.
+        :param x: (int) the initial seed.
+        """
+        self._numbers.clear()
+        self._states.clear()
+        self._pos.clear()
+        MarcianiMultiStream.plant_seeds(self, x)
+
+    def get_seed(self):
+        """
+        Retrieves the seed of the current stream, i.e. the seed of the last consumed number.
+        :return: (int) the seed of the current stream.
+        """
+        pos = self._pos.get(self._stream, 0)
+        if pos == 0:
+            return self._seeds[self._stream]
+        return int(self._states[self._stream][pos - 1])
+
+    def put_seed(self, x):
+        """
+        Initializes the current stream with the specified seed, discarding prefetched numbers.
+        :param x: (int) the seed.
+        """
+        self._discard()
+        MarcianiMultiStream.put_seed(self, x)
+
+    def rnd(self):
+        """
+        Generates a pseudo-rnd number from uniform distribution in [0,1)
+        :return: a uniform pseudo-rnd float in [0,1)
+        """
+        stream = self._stream
+        pos = self._pos.get(stream, self._buffer)
+        if pos == self._buffer:
+            self._refill()
+            pos = 0
+        self._pos[stream] = pos + 1
+        return self._numbers[stream][pos]
+
+    def jump(self, k):
+        """
+        Advances the current stream by k steps, discarding prefetched numbers.
+        :param k: (int) the number of steps; must be non-negative.
+        """
+        self._discard()
+        MarcianiMultiStream.jump(self, k)
+
+    def rnd_block(self, n):
+        """
+        Generates n pseudo-rnd numbers from uniform distribution in [0,1), from the current stream.
+        :param n: (int) the number of pseudo-rnd numbers.
+        :return: (numpy.ndarray) the uniform pseudo-rnd floats in [0,1).
+        """
+        self._discard()
+        return MarcianiMultiStream.rnd_block(self, n)
+
+    def _refill(self):
+        """
+        Prefetch the next numbers of the current stream.
+        :return: None
+        """
+        stream = self._stream
+        self._seeds[stream] = self.get_seed()
+        states = lehmer_block(self._seeds[stream], self._buffer, self._powers, self._modulus)
+        self._states[stream] = states
+        self._numbers[stream] = (states / float(self._modulus)).tolist()
+        self._pos[stream] = 0
+
+    def _discard(self):
+        """
+        Discard the prefetched numbers of the current stream, keeping the seed of the last consumed number.
+        :return: None
+        """
+        stream = self._stream
+        self._seeds[stream] = self.get_seed()
+        self._numbers.pop(stream, None)
+        self._states.pop(stream, None)
+        self._pos.pop(stream, None)
+
 
 class MarcianiSingleStream:
     """
@@ -175,6 +445,7 @@ class MarcianiSingleStream:
         self._seed = iseed
         self._modulus = modulus
         self._multiplier = multiplier
+        self._powers = None  # the powers of the multiplier, computed on first block generation
 
     def get_initial_seed(self):
         """
@@ -231,6 +502,23 @@ class MarcianiSingleStream:
 
         return float(self._seed / self._modulus)
 
+    def rnd_block(self, n):
+        """
+        Generates n pseudo-rnd numbers from uniform distribution in [0,1),
+        The sequence is identical to the one of n consecutive calls of *rnd*, and leaves the generator in the same state.
+        :param n: (int) the number of pseudo-rnd numbers.
+        :return: (numpy.ndarray) the uniform pseudo-rnd floats in [0,1).
+        """
+        if self._modulus > BLOCK_MAX_MODULUS:
+            return np.array([self.rnd() for _ in range(n)], dtype=np.float64)
+        if n <= 0:
+            return np.empty(0, dtype=np.float64)
+        if self._powers is None:
+            self._powers = lehmer_powers(self._multiplier, self._modulus)
+        states = lehmer_block(self._seed, n, self._powers, self._modulus)
+        self._seed = int(states[-1])
+        return states / float(self._modulus)
+
 
 if __name__ == "__main__":
     CHECK = 399268537
@@ -0,0 +1,155 @@
+"""
+A stream allocator for multi-stream rnd generators.
+"""
+
+from enum import Enum, unique
+
+from pydes.core.utils.logutils import get_logger
+
+# Logging
+logger = get_logger(__name__)
+
+
+@unique
+class CollisionPolicy(Enum):
+    """
+    Enumerate the policies to resolve stream collisions.
+    """
+
+    FAIL = 0  # raise an error
+    EXPAND = 1  # allocate a free stream, expanding the generator if needed
+
+
+class StreamAllocator:
+    """
+    Hands out disjoint streams of a multi-stream rnd generator, e.g. to servers and task types, and independent
+    generators, e.g. to replication workers.
+    Streams can be requested by id, e.g. the stream conventionally used by a component, or allocated in order, after
+    the highest stream handed out so far; streams are never handed out twice.
+    A stream collision, i.e. a request of a stream already handed out or beyond the number of streams of the generator,
+    is resolved according to the given policy: either an error is raised, or a free stream is allocated instead.
+    In the latter case, the generator is expanded when all its streams are handed out (see *MarcianiMultiStream.expand*),
+    so streams should be allocated before drawing any number.
+    """
+
+    def __init__(self, generator, first=0, policy=CollisionPolicy.FAIL):
+        """
+        Create a new StreamAllocator.
+        :param generator: (MarcianiMultiStream) the multi-stream rnd generator.
+        :param first: (int) the first stream to allocate.
+        :param policy: (CollisionPolicy) the policy to resolve stream collisions.
+        """
+        self.generator = generator
+        self.policy = policy
+        self._next = first  # the next stream to allocate
+        self._owners = {}  # the owner, by allocated stream
+        self._allocation = {}  # the allocated streams, by owner
+
+    def request(self, owner, stream):
+        """
+        Request the given stream for the given owner.
+        :param owner: (str) the owner of the stream.
+        :param stream: (int) the requested stream.
+        :return: (int) the allocated stream, that is the requested one unless a collision has been resolved.
+        """
+        if stream in self._owners or not 0 <= stream < self.generator.get_nstreams():
+            if self.policy is CollisionPolicy.FAIL:
+                raise RuntimeError(
+                    "Stream collision: cannot allocate stream {} to {}: {}".format(
+                        stream,
+                        owner,
+                        (
+                            "already allocated to {}".format(self._owners[stream])
+                            if stream in self._owners
+                            else "the generator has {} streams".format(self.generator.get_nstreams())
+                        ),
+                    )
+                )
+            allocated = self.allocate(owner)[0]
+            logger.debug("Stream collision: allocated stream %d instead of %d to %s", allocated, stream, owner)
+            return allocated
+
+        self._take(owner, stream)
+        self._next = max(self._next, stream + 1)
+        return stream
+
+    def allocate(self, owner, n=1):
+        """
+        Allocate disjoint streams to the given owner.
+        :param owner: (str) the owner of the streams.
+        :param n: (int) the number of streams.
+        :return: (list(int)) the allocated streams.
+        """
+        if n > self.free():
+            if self.policy is CollisionPolicy.FAIL:
+                raise RuntimeError(
+                    "Cannot allocate {} streams to {}: only {} of {} streams are free".format(
+                        n, owner, self.free(), self.generator.get_nstreams()
+                    )
+                )
+            self._expand(self._next + n)
+        streams = list(range(self._next, self._next + n))
+        self._next += n
+        for stream in streams:
+            self._take(owner, stream)
+        return streams
+
+    def spawn(self, n):
+        """
+        Spawn independent generators, e.g. one for every replication worker.
+        Every stream of every spawned generator is disjoint from the others (see *MarcianiMultiStream.spawn*).
+        :param n: (int) the number of generators.
+        :return: (list) the spawned generators.
+        """
+        return self.generator.spawn(n)
+
+    def free(self):
+        """
+        Return the number of streams not allocated yet, after the highest stream handed out so far.
+        :return: (int) the number of free streams.
+        """
+        return self.generator.get_nstreams() - self._next
+
+    def get_allocation(self):
+        """
+        Return the allocated streams.
+        :return: (dict) the allocated streams, by owner.
+        """
+        return {owner: list(streams) for owner, streams in self._allocation.items()}
+
+    def _take(self, owner, stream):
+        """
+        Record the allocation of a stream.
+        :param owner: (str) the owner of the stream.
+        :param stream: (int) the stream.
+        :return: None
+        """
+        self._owners[stream] = owner
+        self._allocation.setdefault(owner, []).append(stream)
+
+    def _expand(self, streams):
+        """
+        Expand the generator to at least the given number of streams, doubling its number of streams.
+        :param streams: (int) the minimum number of streams.
+        :return: None
+        """
+        nstreams = self.generator.get_nstreams()
+        while nstreams < streams:
+            nstreams *= 2
+        logger.warning("Expanding rnd generator from {} to {} streams".format(self.generator.get_nstreams(), nstreams))
+        self.generator.expand(nstreams)
+
+
+def format_streams(streams):
+    """
+    Format a list of streams as a compact string of ranges, e.g. [1, 2, 3, 5] as "1-3 5".
+    :param streams: (list(int)) the streams.
+    :return: (str) the formatted streams.
+    """
+    ranges = []
+    for stream in streams:
+        if ranges and ranges[-1][1] == stream - 1:
+            ranges[-1][1] = stream
+        else:
+            ranges.append([stream, stream])
+    return " ".join(str(a) if a == b else "{}-{}".format(a, b) for a, b in ranges)
@@ -1,4 +1,8 @@
 import logging
+from bisect import insort
+from enum import Enum, unique
+from heapq import heapify, heappop, heappush
+from itertools import count
 from queue import PriorityQueue
 
 # Configure logger
@@ -6,29 +10,46 @@ from pydes.core.simulation.model.scope import ActionScope
 
 logger = logging.getLogger(__name__)
 
+# The default fraction of dead entries (unscheduled events) that triggers the compaction of the event list
+COMPACTION_RATIO = 0.5
+
+# The calendar queue parameters: initial bucket width (s), minimum number of buckets, events sampled to resize
+CALENDAR_QUEUE_WIDTH = 1.0
+CALENDAR_QUEUE_MIN_BUCKETS = 2
+CALENDAR_QUEUE_SAMPLES = 25
+
 
 class NextEventCalendar:
     """
     Implementation of a simple Next-Event calendar.
+    The event list is a plain binary heap (heapq), with no locking: the calendar is meant to be used by a single thread.
+    Events are sorted by (occurrence time, scheduling sequence), so that events with the same occurrence time are
+    retrieved in scheduling order.
     Notice that the calendar internally manages:
         (i) event sorting, by occurrence time.
         (ii) scheduling of only possible events, that are:
             (ii.i) possible arrivals, i.e. arrivals with occurrence time lower than stop time.
             (ii.ii) departures of possible arrivals.
-        (iii) unscheduling of events to ignore.
+        (iii) unscheduling of events to ignore, by handle.
+    Every scheduled event is identified by an opaque handle, that is returned by *schedule* and attached to the event
+    itself (*event.handle*). Unscheduling a handle marks its entry as dead in O(1); dead entries are discarded lazily,
+    and the event list is compacted when dead entries exceed the given fraction of the event list.
     """
 
-    def __init__(self, t_clock=0.0, t_stop=float("inf")):
+    def __init__(self, t_clock=0.0, t_stop=float("inf"), compaction=COMPACTION_RATIO):
         """
         Create a new *NextEventCalendar*.
         :param t_clock: (float) optional, initialization time for the simulation clock.
         :param t_stop: (float) optional, initialization time for the simulation clock. Default is infinite.
+        :param compaction: (float) optional, the fraction of dead entries that triggers the compaction of the event list.
         """
         self._clock = t_clock  # the simulation clock
         self._stop = t_stop  # the stop time
 
-        self._events = PriorityQueue()  # the event list, implemented as a priority queue
-        self._ignore = set()  # the set of events to ignore (unscheduled events), processed lazily
+        self._events = []  # the event list, implemented as a binary heap of entries [time, sequence, event]
+        self._sequence = count()  # the scheduling sequence, used to break ties between events with the same time
+        self._ndead = 0  # the number of dead entries (unscheduled events) in the event list, discarded lazily
+        self._compaction = compaction  # the fraction of dead entries that triggers the compaction
 
     def get_clock(self):
         """
@@ -48,59 +69,96 @@ class NextEventCalendar:
         """
         Schedule events.
         :param events: (SimpleEvent) the events to schedule.
-        :return: (int,int) (ns,ni), where *ns* is the number of scheduled tasks, and *ni* is the number of ignored tasks.
+        :return: (list) the handles of the events, in the same order; None for events not scheduled (impossible).
         """
-        nscheduled = 0
-        nignored = 0
+        handles = []
 
         for e in events:
             if e.type.act is ActionScope.ARRIVAL and e.time >= self._stop:
-                logger.debug("Not scheduled (impossible): {}".format(e))
-                nignored += 1
+                logger.debug("Not scheduled (impossible): %s", e)
+                handles.append(None)
             else:
-                try:
-                    self._events.put((e.time, e))
-                    nscheduled += 1
-                except TypeError as exc:
-                    print("Error: {} : {}".format(str(exc), e))
-                    continue
-                logger.debug("Scheduled: {}".format(e))
+                entry = [e.time, next(self._sequence), e]
+                e.handle = entry
+                self._push(entry)
+                handles.append(entry)
+                logger.debug("Scheduled: %s", e)
 
-        return nscheduled, nignored
+        return handles
 
-    def unschedule(self, *events):
+    def unschedule(self, *handles):
         """
         Unschedule events.
-        :param events: (SimpleEvent) the events to unschedule.
+        Handles of events already retrieved or already unscheduled are ignored.
+        :param handles: the handles of the events to unschedule.
         """
-        for e in events:
-            self._ignore.add(e)
-            logger.debug("Unscheduled: {}".format(e))
+        for handle in handles:
+            if handle is None or handle[2] is None:
+                continue
+            logger.debug("Unscheduled: %s", handle[2])
+            handle[2] = None
+            self._ndead += 1
+
+        if self._ndead > self._compaction * self._size():
+            self._compact()
 
     def get_next_event(self):
         """
         Retrieve the next scheduled event and update the clock.
         :return: (SimpleEvent) the next event, if present; None, otherwise.
         """
-        if self._events.empty():
-            logger.debug("Event queue is empty, next event is None")
-            return None
-        else:
-            candidate = self._events.get()[1]
-            while candidate in self._ignore:
-                # assert candidate.type == EventType.COMPLETION_CLOUDLET_TASK_2  # TODO eliminare
-                logger.debug("Ignoring next event (unscheduled): {}".format(candidate))
-                self._ignore.discard(candidate)
-                candidate = self._events.get()[1]
+        while not self.empty():
+            entry = self._pop()
+            candidate = entry[2]
+            if candidate is None:
+                logger.debug("Ignoring next event (unscheduled)")
+                self._ndead -= 1
+                continue
+            entry[2] = None
             self.set_clock(candidate.time)
             return candidate
 
+        logger.debug("Event queue is empty, next event is None")
+        return None
+
     def empty(self):
         """
         Check if the calendar is empty.
         :return: True, if the calendar is empty; False, otherwise.
         """
-        return self._events.empty()
+        return self._size() == self._ndead
+
+    def _size(self):
+        """
+        Return the number of entries in the event list, including dead ones.
+        :return: (int) the number of entries in the event list.
+        """
+        return len(self._events)
+
+    def _push(self, entry):
+        """
+        Insert an entry into the event list.
+        :param entry: the entry to insert.
+        :return: None
+        """
+        heappush(self._events, entry)
+
+    def _pop(self):
+        """
+        Remove the next entry from the event list.
+        :return: the next entry.
+        """
+        return heappop(self._events)
+
+    def _compact(self):
+        """
+        Remove all dead entries from the event list.
+        :return: None
+        """
+        logger.debug("Compacting event list: {} dead entries out of {}".format(self._ndead, self._size()))
+        self._events = [entry for entry in self._events if entry[2] is not None]
+        heapify(self._events)
+        self._ndead = 0
 
     def __str__(self):
         """
@@ -113,3 +171,200 @@ class NextEventCalendar:
             if not attr.startswith("__") and not callable(getattr(self, attr))
         ]
         return "Calendar({}:{})".format(id(self), ", ".join(sb))
+
+
+class PriorityQueueCalendar(NextEventCalendar):
+    """
+    Implementation of a Next-Event calendar backed by a synchronized priority queue (queue.PriorityQueue).
+    Every insertion and removal acquires a lock, so this calendar should be used only when the event list is shared
+    among threads.
+    """
+
+    def __init__(self, t_clock=0.0, t_stop=float("inf"), compaction=COMPACTION_RATIO):
+        """
+        Create a new *PriorityQueueCalendar*.
+        :param t_clock: (float) optional, initialization time for the simulation clock.
+        :param t_stop: (float) optional, initialization time for the simulation clock. Default is infinite.
+        :param compaction: (float) optional, the fraction of dead entries that triggers the compaction of the event list.
+        """
+        NextEventCalendar.__init__(self, t_clock, t_stop, compaction)
+        self._events = PriorityQueue()  # the event list, implemented as a priority queue
+
+    def _size(self):
+        """
+        Return the number of entries in the event list, including dead ones.
+        :return: (int) the number of entries in the event list.
+        """
+        return self._events.qsize()
+
+    def _push(self, entry):
+        """
+        Insert an entry into the event list.
+        :param entry: the entry to insert.
+        :return: None
+        """
+        self._events.put(entry)
+
+    def _pop(self):
+        """
+        Remove the next entry from the event list.
+        :return: the next entry.
+        """
+        return self._events.get()
+
+    def _compact(self):
+        """
+        Remove all dead entries from the event list.
+        :return: None
+        """
+        with self._events.mutex:
+            self._events.queue[:] = [entry for entry in self._events.queue if entry[2] is not None]
+            heapify(self._events.queue)
+        self._ndead = 0
+
+
+class CalendarQueueCalendar(NextEventCalendar):
+    """
+    Implementation of a Next-Event calendar backed by a calendar queue (R. Brown, 1988).
+    The event list is an array of buckets ("days") of the given width, each one holding the entries of its days over
+    all "years" as a sorted list; the dequeue scans buckets day by day from the last dequeued one.
+    The number of buckets is doubled (halved) when the number of entries exceeds twice (falls below half) the number of
+    buckets, and the bucket width is re-estimated from the separation of the next events at each resize, so that
+    scheduling and retrieval take O(1) amortized time when the event population is large and dense.
+    """
+
+    def __init__(self, t_clock=0.0, t_stop=float("inf"), compaction=COMPACTION_RATIO):
+        """
+        Create a new *CalendarQueueCalendar*.
+        :param t_clock: (float) optional, initialization time for the simulation clock.
+        :param t_stop: (float) optional, initialization time for the simulation clock. Default is infinite.
+        :param compaction: (float) optional, the fraction of dead entries that triggers the compaction of the event list.
+        """
+        NextEventCalendar.__init__(self, t_clock, t_stop, compaction)
+        self._events = None  # the event list is implemented by the buckets
+        self._nentries = 0  # the number of entries, including dead ones
+        self._width = CALENDAR_QUEUE_WIDTH  # the bucket width (s)
+        self._buckets = [[] for _ in range(CALENDAR_QUEUE_MIN_BUCKETS)]  # the buckets, each one a sorted list
+        self._day = int(t_clock / self._width)  # the absolute index of the current day, i.e. floor(time / width)
+
+    def _size(self):
+        """
+        Return the number of entries in the event list, including dead ones.
+        :return: (int) the number of entries in the event list.
+        """
+        return self._nentries
+
+    def _push(self, entry):
+        """
+        Insert an entry into the event list.
+        :param entry: the entry to insert.
+        :return: None
+        """
+        day = int(entry[0] / self._width)
+        insort(self._buckets[day % len(self._buckets)], entry)
+        if day < self._day:
+            self._day = day
+        self._nentries += 1
+        if self._nentries > 2 * len(self._buckets):
+            self._resize(2 * len(self._buckets))
+
+    def _pop(self):
+        """
+        Remove the next entry from the event list.
+        :return: the next entry.
+        """
+        buckets = self._buckets
+        nbuckets = len(buckets)
+        width = self._width
+
+        # Scan one year, day by day, starting from the current day
+        for day in range(self._day, self._day + nbuckets):
+            bucket = buckets[day % nbuckets]
+            if bucket and int(bucket[0][0] / width) <= day:
+                self._day = day
+                return self._remove(bucket)
+
+        # No entry in the scanned year: jump directly to the day of the next entry
+        bucket = min((bucket for bucket in buckets if bucket), key=lambda b: b[0])
+        self._day = int(bucket[0][0] / width)
+        return self._remove(bucket)
+
+    def _remove(self, bucket):
+        """
+        Remove the first entry of a bucket, shrinking the buckets if needed.
+        Notice that buckets are not shrunk when removing a dead entry: the resize discards dead entries, resetting
+        their count, while the caller still has to account for the removed one (see *get_next_event*).
+        :param bucket: (list) the bucket.
+        :return: the removed entry.
+        """
+        entry = bucket.pop(0)
+        self._nentries -= 1
+        if entry[2] is None:
+            return entry
+        if len(self._buckets) > CALENDAR_QUEUE_MIN_BUCKETS and self._nentries < len(self._buckets) // 2:
+            self._resize(len(self._buckets) // 2)
+        return entry
+
+    def _compact(self):
+        """
+        Remove all dead entries from the event list.
+        :return: None
+        """
+        logger.debug("Compacting event list: {} dead entries out of {}".format(self._ndead, self._size()))
+        for bucket in self._buckets:
+            bucket[:] = [entry for entry in bucket if entry[2] is not None]
+        self._nentries -= self._ndead
+        self._ndead = 0
+
+    def _resize(self, nbuckets):
+        """
+        Redistribute entries into the given number of buckets, re-estimating the bucket width.
+        Dead entries are discarded.
+        :param nbuckets: (int) the new number of buckets.
+        :return: None
+        """
+        entries = [entry for bucket in self._buckets for entry in bucket if entry[2] is not None]
+        entries.sort()
+        self._ndead = 0
+        self._nentries = len(entries)
+        self._width = self._estimate_width(entries)
+        self._buckets = [[] for _ in range(nbuckets)]
+        for entry in entries:
+            self._buckets[int(entry[0] / self._width) % nbuckets].append(entry)
+        self._day = int(entries[0][0] / self._width) if len(entries) > 0 else int(self._clock / self._width)
+
+    def _estimate_width(self, entries):
+        """
+        Estimate the bucket width as three times the average separation of the next events,
+        ignoring separations larger than twice the average (R. Brown, 1988).
+        :param entries: (list) the entries, sorted.
+        :return: (float) the bucket width.
+        """
+        times = [entry[0] for entry in entries[:CALENDAR_QUEUE_SAMPLES]]
+        separations = [t2 - t1 for t1, t2 in zip(times, times[1:])]
+        if len(separations) == 0:
+            return self._width
+        average = sum(separations) / len(separations)
+        separations = [separation for separation in separations if separation <= 2.0 * average]
+        average = sum(separations) / len(separations)
+        return 3.0 * average if average > 0.0 else self._width
+
+
+@unique
+class CalendarEngine(Enum):
+    """
+    Enumerate the event list engines.
+    """
+
+    def __new__(cls, *args, **kwds):
+        value = len(cls.__members__) + 1
+        obj = object.__new__(cls)
+        obj._value_ = value
+        return obj
+
+    def __init__(self, calendar):
+        self.calendar = calendar
+
+    HEAP = NextEventCalendar  # single-threaded binary heap
+    PRIORITY_QUEUE = PriorityQueueCalendar  # synchronized priority queue
+    CALENDAR_QUEUE = CalendarQueueCalendar  # calendar queue, with automatic resizing
@@ -1,6 +1,7 @@
 import logging
 
 from pydes.core.rnd.rndcmp import RandomComponent
+from pydes.core.rnd.rndstream import CollisionPolicy, StreamAllocator
 from pydes.core.simulation.model.event import EventType
 
 # Logging
@@ -14,20 +15,26 @@ class SimpleCloud:
     A Cloud subsystem.
     """
 
-    def __init__(self, rndgen, config, state, metrics):
+    def __init__(self, rndgen, config, state, metrics, rndstreams=None):
         """
         Create a new Cloud server.
         :param rndgen: (object) the multi-stream rnd number generator.
         :param config: (dict) the Cloud configuration.
         :param state: (dict) the Cloud state.
         :param metrics: (SimulationMetrics) the simulation metrics.
+        :param rndstreams: (StreamAllocator) the stream allocator of the simulation, if any.
         """
+        rndstreams = rndstreams if rndstreams is not None else StreamAllocator(rndgen, policy=CollisionPolicy.EXPAND)
 
         # Randomization - Service
         self.rndservice = RandomComponent(
             gen=rndgen,
             str={
-                tsk: EventType.of(ActionScope.COMPLETION, SystemScope.CLOUD, tsk).value for tsk in TaskScope.concrete()
+                tsk: rndstreams.request(
+                    "cloud_service_{}".format(tsk.name.lower()),
+                    EventType.of(ActionScope.COMPLETION, SystemScope.CLOUD, tsk).value,
+                )
+                for tsk in TaskScope.concrete()
             },
             var={tsk: config["service"][tsk]["distribution"] for tsk in TaskScope.concrete()},
             par={tsk: config["service"][tsk]["parameters"] for tsk in TaskScope.concrete()},
@@ -36,7 +43,13 @@ class SimpleCloud:
         # Randomization - Setup
         self.rndsetup = RandomComponent(
             gen=rndgen,
-            str={tsk: EventType.of(ActionScope.RESTART, SystemScope.CLOUD, tsk).value for tsk in TaskScope.concrete()},
+            str={
+                tsk: rndstreams.request(
+                    "cloud_setup_{}".format(tsk.name.lower()),
+                    EventType.of(ActionScope.RESTART, SystemScope.CLOUD, tsk).value,
+                )
+                for tsk in TaskScope.concrete()
+            },
             var={tsk: config["setup"][tsk]["distribution"] for tsk in TaskScope.concrete()},
             par={tsk: config["setup"][tsk]["parameters"] for tsk in TaskScope.concrete()},
         )
@@ -70,12 +83,12 @@ class SimpleCloud:
         t_completion = t_now + t_service
 
         # Update statistics
-        self.metrics.counters.arrived[SystemScope.CLOUD][tsk] += 1
+        self.metrics.increment_counter("arrived", SystemScope.CLOUD, tsk)
         if restart:
-            self.metrics.counters.switched[SystemScope.CLOUD][tsk] += 1
-        self.metrics.counters.population_area[SystemScope.CLOUD][tsk] += (t_now - self.t_last_event[tsk]) * self.state[
-            tsk
-        ]
+            self.metrics.increment_counter("switched", SystemScope.CLOUD, tsk)
+        self.metrics.increment_counter(
+            "population_area", SystemScope.CLOUD, tsk, (t_now - self.t_last_event[tsk]) * self.state[tsk]
+        )
 
         # Update state
         self.state[tsk] += 1
@@ -101,14 +114,14 @@ class SimpleCloud:
         t_served = t_now - t_arrival
 
         # Update statistics
-        self.metrics.counters.completed[SystemScope.CLOUD][tsk] += 1
-        self.metrics.counters.service[SystemScope.CLOUD][tsk] += t_served
+        self.metrics.increment_counter("completed", SystemScope.CLOUD, tsk)
+        self.metrics.increment_counter("service", SystemScope.CLOUD, tsk, t_served)
         if switched:
-            self.metrics.counters.switched_completed[SystemScope.CLOUD][tsk] += 1
-            self.metrics.counters.switched_service[SystemScope.CLOUD][tsk] += t_served
-        self.metrics.counters.population_area[SystemScope.CLOUD][tsk] += (t_now - self.t_last_event[tsk]) * self.state[
-            tsk
-        ]
+            self.metrics.increment_counter("switched_completed", SystemScope.CLOUD, tsk)
+            self.metrics.increment_counter("switched_service", SystemScope.CLOUD, tsk, t_served)
+        self.metrics.increment_counter(
+            "population_area", SystemScope.CLOUD, tsk, (t_now - self.t_last_event[tsk]) * self.state[tsk]
+        )
 
         # Update state
         self.state[tsk] -= 1
@@ -119,6 +132,18 @@ class SimpleCloud:
     # ==================================================================================================================
     # OTHER
     # ==================================================================================================================
+    def update_population_area(self, t_now):
+        """
+        Accumulate the population area up to the given time, as if an event without effects on the state occurred.
+        :param t_now: (float) the current time.
+        :return: None
+        """
+        for tsk in TaskScope.concrete():
+            self.metrics.increment_counter(
+                "population_area", SystemScope.CLOUD, tsk, (t_now - self.t_last_event[tsk]) * self.state[tsk]
+            )
+            self.t_last_event[tsk] = t_now
+
     def is_idle(self):
         """
         Check weather the Cloud is idle or not.
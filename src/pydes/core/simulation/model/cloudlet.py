@@ -1,6 +1,7 @@
 import logging
 
 from pydes.core.rnd.rndcmp import RandomComponent
+from pydes.core.rnd.rndstream import CollisionPolicy, StreamAllocator
 from pydes.core.simulation.model.controller import (
     ControllerAlgorithm,
     ControllerAlgorithm1,
@@ -19,14 +20,17 @@ class SimpleCloudlet:
     A Cloudlet subsystem.
     """
 
-    def __init__(self, rndgen, config, state, metrics):
+    def __init__(self, rndgen, config, state, metrics, rndstreams=None):
         """
         Create a new Cloudlet.
         :param rndgen: (object) the multi-stream rnd number generator.
         :param config: (dict) the Cloudlet configuration.
         :param state: (dict) the Cloudlet state.
         :param metrics: (SimulationMetrics) the simulation metrics.
+        :param rndstreams: (StreamAllocator) the stream allocator of the simulation, if any.
         """
+        rndstreams = rndstreams if rndstreams is not None else StreamAllocator(rndgen, policy=CollisionPolicy.EXPAND)
+
         # Randomization - Service
         self.rndservice = RandomComponent(
             gen=rndgen,
@@ -39,9 +43,28 @@ class SimpleCloudlet:
         )
 
         # Servers
+        # Every server requests its own streams (the service stream plus the server index), for every task type
         self.n_servers = config["n_servers"]
-        self.servers = [Server(self.rndservice, i) for i in range(self.n_servers)]
-        self.server_selector = config["server_selection"].selector(self.servers)
+        streams = {
+            tsk: [
+                rndstreams.request("cloudlet_service_{}".format(tsk.name.lower()), self.rndservice.str[tsk] + i)
+                for i in range(self.n_servers)
+            ]
+            for tsk in TaskScope.concrete()
+        }
+        self.servers = [
+            Server(
+                RandomComponent(
+                    gen=rndgen,
+                    str={tsk: streams[tsk][i] for tsk in TaskScope.concrete()},
+                    var=self.rndservice.var,
+                    par=self.rndservice.par,
+                ),
+                i,
+            )
+            for i in range(self.n_servers)
+        ]
+        self.server_selector = config["server_selection"].selector(self.servers, rndgen, rndstreams)
 
         # State
         self.state = state
@@ -80,7 +103,9 @@ class SimpleCloudlet:
         Submit the arrival of a task.
         :param tsk: (TaskType) the type of the task.
         :param t_now: (float) the current time.
-        :return: (float) the completion time.
+        :return: (c,i) where
+        *c* is the completion time;
+        *i* is the index of the server the task has been assigned to.
         """
         # Check correctness
         assert sum(self.state[tsk] for tsk in TaskScope.concrete()) < self.n_servers
@@ -90,12 +115,13 @@ class SimpleCloudlet:
         if server_idx is None:
             raise RuntimeError("Cannot find server for arrival of task {} at time {}".format(tsk, t_now))
         t_completion = self.servers[server_idx].submit_arrival(tsk, t_now)
+        self.server_selector.on_busy(server_idx, tsk)
 
         # Update metrics
-        self.metrics.counters.arrived[SystemScope.CLOUDLET][tsk] += 1
-        self.metrics.counters.population_area[SystemScope.CLOUDLET][tsk] += (
-            t_now - self.t_last_event[tsk]
-        ) * self.state[tsk]
+        self.metrics.increment_counter("arrived", SystemScope.CLOUDLET, tsk)
+        self.metrics.increment_counter(
+            "population_area", SystemScope.CLOUDLET, tsk, (t_now - self.t_last_event[tsk]) * self.state[tsk]
+        )
 
         # Update state
         self.state[tsk] += 1
@@ -103,17 +129,17 @@ class SimpleCloudlet:
         # Update timing
         self.t_last_event[tsk] = t_now
 
-        return t_completion
+        return t_completion, server_idx
 
     def submit_interruption(self, tsk, t_now):
         """
         Submit the interruption of a task.
         :param tsk: (TaskType) the type of the task.
         :param t_now: (float) the current time.
-        :return: (c,w,s,r) where
+        :return: (c,a,i) where
         *c* is the completion time to ignore;
         *a* is the arrival time;
-        *r* is the remaining service time ratio;
+        *i* is the index of the interrupted server.
         """
         # Check correctness
         assert self.state[tsk] > 0
@@ -123,15 +149,16 @@ class SimpleCloudlet:
         if server_idx is None:
             raise RuntimeError("Cannot find server for interruption of task {} at time {}".format(tsk, t_now))
         t_completion_to_ignore, t_arrival = self.servers[server_idx].submit_interruption(tsk, t_now)
+        self.server_selector.on_idle(server_idx, tsk)
         t_served = t_now - t_arrival
 
         # Update metrics
-        self.metrics.counters.switched[SystemScope.CLOUDLET][tsk] += 1
-        self.metrics.counters.switched_service_lost[SystemScope.CLOUDLET][tsk] += t_served
-        self.metrics.counters.service[SystemScope.CLOUDLET][tsk] += t_served
-        self.metrics.counters.population_area[SystemScope.CLOUDLET][tsk] += (
-            t_now - self.t_last_event[tsk]
-        ) * self.state[tsk]
+        self.metrics.increment_counter("switched", SystemScope.CLOUDLET, tsk)
+        self.metrics.increment_counter("switched_service_lost", SystemScope.CLOUDLET, tsk, t_served)
+        self.metrics.increment_counter("service", SystemScope.CLOUDLET, tsk, t_served)
+        self.metrics.increment_counter(
+            "population_area", SystemScope.CLOUDLET, tsk, (t_now - self.t_last_event[tsk]) * self.state[tsk]
+        )
 
         # Update state
         self.state[tsk] -= 1
@@ -139,32 +166,36 @@ class SimpleCloudlet:
         # Update timing
         self.t_last_event[tsk] = t_now
 
-        return t_completion_to_ignore, t_arrival
+        return t_completion_to_ignore, t_arrival, server_idx
 
-    def submit_completion(self, tsk, t_now, t_arrival):
+    def submit_completion(self, tsk, t_now, t_arrival, server_idx):
         """
         Submit the completion of a task.
         :param tsk: (TaskType) the type of the task.
         :param t_now: (float) the completion time.
         :param t_arrival: (float) the arrival time.
+        :param server_idx: (int) the index of the server the task has been assigned to.
         :return: None
         """
         # Check correctness
         assert self.state[tsk] > 0
 
         # Compute served time
-        server_idx = self.find_completion_server_idx(tsk, t_now)
-        if server_idx is None:
-            raise RuntimeError("Cannot find server for completion of task {} at time {}".format(tsk, t_now))
-        self.servers[server_idx].submit_completion()
+        server = self.servers[server_idx]
+        if server.task_type is not tsk or server.t_completion != t_now:
+            raise RuntimeError(
+                "Server {} is not completing task {} at time {}: {}".format(server_idx, tsk, t_now, server)
+            )
+        server.submit_completion()
+        self.server_selector.on_idle(server_idx, tsk)
         t_served = t_now - t_arrival
 
         # Update metrics
-        self.metrics.counters.completed[SystemScope.CLOUDLET][tsk] += 1
-        self.metrics.counters.service[SystemScope.CLOUDLET][tsk] += t_served
-        self.metrics.counters.population_area[SystemScope.CLOUDLET][tsk] += (
-            t_now - self.t_last_event[tsk]
-        ) * self.state[tsk]
+        self.metrics.increment_counter("completed", SystemScope.CLOUDLET, tsk)
+        self.metrics.increment_counter("service", SystemScope.CLOUDLET, tsk, t_served)
+        self.metrics.increment_counter(
+            "population_area", SystemScope.CLOUDLET, tsk, (t_now - self.t_last_event[tsk]) * self.state[tsk]
+        )
 
         # Update state
         self.state[tsk] -= 1
@@ -176,6 +207,18 @@ class SimpleCloudlet:
     # OTHER
     # ==================================================================================================================
 
+    def update_population_area(self, t_now):
+        """
+        Accumulate the population area up to the given time, as if an event without effects on the state occurred.
+        :param t_now: (float) the current time.
+        :return: None
+        """
+        for tsk in TaskScope.concrete():
+            self.metrics.increment_counter(
+                "population_area", SystemScope.CLOUDLET, tsk, (t_now - self.t_last_event[tsk]) * self.state[tsk]
+            )
+            self.t_last_event[tsk] = t_now
+
     def is_idle(self):
         """
         Check weather the Cloudlet is idle or not.
@@ -183,18 +226,6 @@ class SimpleCloudlet:
         """
         return sum(self.state[tsk] for tsk in TaskScope.concrete()) == 0
 
-    def find_completion_server_idx(self, task_type, t_completion):
-        """
-        Select a completion server for the given task type and time.
-        :param task_type: (TaskType) the type of task.
-        :param t_completion: (float) the completion time.
-        :return: (int) the index of the completion server, if present; None, otherwise.
-        """
-        for idx, server in enumerate(self.servers):
-            if server.task_type is task_type and server.t_completion == t_completion:
-                return idx
-        return None
-
     def __str__(self):
         """
         String representation.
@@ -2,7 +2,11 @@ import copy
 
 import yaml
 
+from pydes.core.metrics.sampling import SamplingFormat
+from pydes.core.metrics.sampling_policy import SamplingPolicy
+from pydes.core.rnd.rndstream import CollisionPolicy
 from pydes.core.rnd.rndvar import Variate
+from pydes.core.simulation.model.calendar import CalendarEngine
 from pydes.core.simulation.model.controller import ControllerAlgorithm
 from pydes.core.simulation.model.scope import TaskScope
 from pydes.core.simulation.model.server_selection import SelectionRule
@@ -16,10 +20,30 @@ _default_configuration = {
         # Required for PERFORMANCE_ANALYSIS
         # "batches": 64,  # the number of batches
         # "batchdim": 512,  # the batch dimension
+        # Optional for PERFORMANCE_ANALYSIS: stop as soon as the relative half-width of the confidence interval of
+        # every metric is not greater than the target (batches becomes the maximum number of batches)
+        # "precision": {"target": 0.05, "metrics": ["response_system_global"], "min_batches": 10},
+        # Optional for PERFORMANCE_ANALYSIS: start from batchdim and, every time the given (even) number of batches is
+        # collected, merge adjacent batches (doubling batchdim) until the lag-1 autocorrelation of batch means is
+        # not significant or max_batchdim is reached (batches defaults to the number of batches)
+        # "adaptive_batchdim": {"batches": 64, "metrics": ["response_system_global"], "max_batchdim": 65536},
+        # Optional for PERFORMANCE_ANALYSIS: detect the end of warm-up of every metric (MSER-5 rule on the values of
+        # batches of samples) and discard data collected so far, i.e. batches biased by the empty-system start
+        # "warmup": {"metrics": ["throughput_system_global"], "batchdim": 5, "min_batches": 20},
         "confidence": 0.95,  # the level of confidence
+        # "sampling_interval": 1,  # the number of completions between samples of performance metrics
+        # "sampling_format": "CSV",  # the format of the sampling file (CSV, NPZ)
+        # "sampling_compress": True,  # if False, NPZ sampling files are stored uncompressed, i.e. memory-mappable
+        # Optional: the sampling policy (overrides sampling_interval), among EVERY_K (every interval completions),
+        # TIME_GRID (every interval time units) and RESERVOIR (a random subset of size samples, of every interval
+        # completions, written at the end)
+        # "sampling": {"policy": "TIME_GRID", "interval": 1.0},
+        "calendar": "HEAP",  # the event list engine (HEAP, PRIORITY_QUEUE, CALENDAR_QUEUE)
+        "recycle_events": False,  # if True, reuse dead events through a free list
         "rnd": {
-            "generator": "MarcianiMultiStream",  # the class name of the rnd generator
+            "generator": "MarcianiMultiStream",  # the rnd generator class (MarcianiMultiStream, BufferedMultiStream)
             "seed": 123456789,  # the initial seed for the rnd generator
+            "collision": "EXPAND",  # the policy to resolve stream collisions (FAIL, EXPAND)
         },
     },
     "arrival": {
@@ -117,10 +141,24 @@ def load_configuration(filename, norm=True):
 def normalize(config):
     """
     Normalize the format of the configuration.
+    The general section is optional, e.g. it is missing from the configuration of the analytical model.
     :param config: the configuration.
     :return: None
     """
-    config["general"]["mode"] = SimulationMode[config["general"]["mode"]]
+    if "general" in config:
+        config["general"]["mode"] = SimulationMode[config["general"]["mode"]]
+        config["general"]["calendar"] = CalendarEngine[config["general"].get("calendar", CalendarEngine.HEAP.name)]
+        config["general"]["sampling_format"] = SamplingFormat[
+            config["general"].get("sampling_format", SamplingFormat.CSV.name)
+        ]
+        if "sampling" in config["general"]:
+            config["general"]["sampling"]["policy"] = SamplingPolicy[
+                config["general"]["sampling"].get("policy", SamplingPolicy.EVERY_K.name)
+            ]
+        if "random" in config["general"]:
+            config["general"]["random"]["collision"] = CollisionPolicy[
+                config["general"]["random"].get("collision", CollisionPolicy.EXPAND.name)
+            ]
     _normalize_random_config(config["arrival"])
     _normalize_random_config(config["system"]["cloudlet"]["service"])
     _normalize_random_config(config["system"]["cloud"]["service"])
@@ -1,8 +1,10 @@
 from enum import Enum, unique
-from types import SimpleNamespace
 
 from pydes.core.simulation.model.scope import ActionScope, SystemScope, TaskScope
 
+# The maximum number of released events kept in the free list
+FREE_LIST_SIZE = 1024
+
 
 @unique
 class EventType(Enum):
@@ -58,10 +60,10 @@ class EventType(Enum):
         :param tsk:  (TaskType) the task type.
         :return: (EventType) the event type.
         """
-        for event_type in EventType:
-            if event_type.act is action and event_type.sys is sys and event_type.tsk is tsk:
-                return event_type
-        raise KeyError("Cannot find event type for action={}, scope={}, task={}".format(action, sys, tsk))
+        try:
+            return _EVENT_TYPES[(action, sys, tsk)]
+        except KeyError:
+            raise KeyError("Cannot find event type for action={}, scope={}, task={}".format(action, sys, tsk))
 
     def __str__(self):
         """
@@ -78,21 +80,68 @@ class EventType(Enum):
         return self.__str__()
 
 
+# The event types, by (action, scope, task), built once at import
+_EVENT_TYPES = {(event_type.act, event_type.sys, event_type.tsk): event_type for event_type in EventType}
+
+
 class SimpleEvent:
     """
     A simple event, defined by its type, occurrence time and metadata.
+    Events are slotted, so that they do not allocate any attribute dictionary, and can be recycled through a free list:
+    *create* reuses a released event, if any, and *release* returns a dead event (i.e. already retrieved from the
+    calendar and submitted to the system) to the free list.
     """
 
-    def __init__(self, type, time, **kwargs):
+    __slots__ = ("type", "time", "t_arrival", "switched", "server_idx", "handle")
+
+    _free = []  # the free list of released events, shared by all simulations in the process
+
+    def __init__(self, type, time, t_arrival=None, switched=False, server_idx=None):
         """
         Create a new event.
         :param type: (EventType) the type of the event.
         :param time: (float) the occurrence time of the event (s).
-        :param kwargs: (dict) optional metadata.
+        :param t_arrival: (float) optional, the arrival time of the task, for completion events (s).
+        :param switched: (bool) optional, True if the task has been switched from Cloudlet to Cloud, for completion events.
+        :param server_idx: (int) optional, the index of the serving Cloudlet server, for Cloudlet completion events.
         """
         self.type = type
         self.time = time
-        self.meta = SimpleNamespace(**kwargs)
+        self.t_arrival = t_arrival
+        self.switched = switched
+        self.server_idx = server_idx
+        self.handle = None  # the calendar handle, set when the event is scheduled
+
+    @classmethod
+    def create(cls, type, time, t_arrival=None, switched=False, server_idx=None):
+        """
+        Create a new event, reusing a released event, if any.
+        :param type: (EventType) the type of the event.
+        :param time: (float) the occurrence time of the event (s).
+        :param t_arrival: (float) optional, the arrival time of the task, for completion events (s).
+        :param switched: (bool) optional, True if the task has been switched from Cloudlet to Cloud, for completion events.
+        :param server_idx: (int) optional, the index of the serving Cloudlet server, for Cloudlet completion events.
+        :return: (SimpleEvent) the event.
+        """
+        if not cls._free:
+            return cls(type, time, t_arrival, switched, server_idx)
+        event = cls._free.pop()
+        event.type = type
+        event.time = time
+        event.t_arrival = t_arrival
+        event.switched = switched
+        event.server_idx = server_idx
+        event.handle = None
+        return event
+
+    def release(self):
+        """
+        Return the event to the free list, so that it can be reused by *create*.
+        The event must be dead, i.e. it must not be referenced anymore by the calendar or the system.
+        :return: None
+        """
+        if len(SimpleEvent._free) < FREE_LIST_SIZE:
+            SimpleEvent._free.append(self)
 
     def __str__(self):
         """
@@ -100,9 +149,7 @@ class SimpleEvent:
         :return: the string representation.
         """
         sb = [
-            "{attr}={value}".format(attr=attr, value=self.__dict__[attr])
-            for attr in self.__dict__
-            if not attr.startswith("__") and not callable(getattr(self, attr))
+            "{attr}={value}".format(attr=attr, value=getattr(self, attr)) for attr in self.__slots__ if attr != "handle"
         ]
         return "Event({})".format(", ".join(sb))
 
@@ -22,6 +22,13 @@ class SystemScope(Enum):
         """
         return list(x for x in SystemScope if x is not SystemScope.SYSTEM)
 
+    def __index__(self):
+        """
+        Return the index of the scope, so that scopes can index arrays.
+        :return: the index of the scope.
+        """
+        return self._value_
+
     def __str__(self):
         """
         Return the string representation.
@@ -58,6 +65,13 @@ class TaskScope(Enum):
         """
         return list(x for x in TaskScope if x is not TaskScope.GLOBAL)
 
+    def __index__(self):
+        """
+        Return the index of the scope, so that scopes can index arrays.
+        :return: the index of the scope.
+        """
+        return self._value_
+
     def __str__(self):
         """
         Return the string representation.
@@ -1,4 +1,3 @@
-from copy import deepcopy
 from enum import Enum, unique
 
 from pydes.core.simulation.model.scope import TaskScope
@@ -26,16 +25,14 @@ class SimpleServer:
     def __init__(self, rndservice, idx):
         """
         Create a new Server.
-        :param rndservice: (RandomComponent) rnd component for the service process.
+        :param rndservice: (RandomComponent) rnd component for the service process, with the streams of the server.
         :param idx: (int) the server index.
         """
-        # Server Index (used in randomization)
+        # Server Index
         self.idx = idx
 
         # Randomization
-        self.rndservice = deepcopy(rndservice)
-        for tsk in self.rndservice.str:
-            self.rndservice.str[tsk] += self.idx  # decoupling of each server randomness
+        self.rndservice = rndservice
 
         # State and important variables
         self.state = ServerState.IDLE  # the state of the server (ServerState)
@@ -1,18 +1,172 @@
-import random
+from bisect import bisect_left, bisect_right, insort
 from enum import Enum, unique
+from heapq import heappop, heappush
 
+from pydes.core.rnd.rndcmp import RandomComponent
+from pydes.core.rnd.rndstream import CollisionPolicy, StreamAllocator
+from pydes.core.rnd.rndvar import Variate, equilikely
+from pydes.core.simulation.model.scope import TaskScope
 from pydes.core.simulation.model.server import ServerState
 from pydes.core.utils.logutils import get_logger
 
 # Logging
 logger = get_logger(__name__)
 
+# The rnd stream requested by the RANDOM selection rule (not used by any event type)
+SELECTION_STREAM = 0
+
+
+class _SortedIndexSet:
+    """
+    A set of server indices, kept sorted, supporting ordered and cyclic lookups by bisection.
+    """
+
+    def __init__(self, indices=()):
+        """
+        Create a new set of indices.
+        :param indices: (iterable(int)) the initial indices.
+        """
+        self._indices = sorted(indices)
+
+    def add(self, idx):
+        """
+        Add an index to the set.
+        :param idx: (int) the index.
+        :return: None
+        """
+        insort(self._indices, idx)
+
+    def discard(self, idx):
+        """
+        Remove an index from the set, if present.
+        :param idx: (int) the index.
+        :return: None
+        """
+        pos = bisect_left(self._indices, idx)
+        if pos < len(self._indices) and self._indices[pos] == idx:
+            del self._indices[pos]
+
+    def first(self):
+        """
+        Return the lowest index.
+        :return: (int) the lowest index, if present; None, otherwise.
+        """
+        return self._indices[0] if self._indices else None
+
+    def next(self, idx):
+        """
+        Return the lowest index greater than the given one, wrapping around to the lowest index.
+        :param idx: (int) the index.
+        :return: (int) the next index, if present; None, otherwise.
+        """
+        if not self._indices:
+            return None
+        pos = bisect_right(self._indices, idx)
+        return self._indices[pos] if pos < len(self._indices) else self._indices[0]
+
+
+class _IndexableSet:
+    """
+    A set of server indices supporting O(1) insertion, removal and uniform selection by position.
+    """
+
+    def __init__(self, indices=()):
+        """
+        Create a new set of indices.
+        :param indices: (iterable(int)) the initial indices.
+        """
+        self._indices = list(indices)
+        self._positions = {idx: pos for pos, idx in enumerate(self._indices)}
+
+    def add(self, idx):
+        """
+        Add an index to the set.
+        :param idx: (int) the index.
+        :return: None
+        """
+        self._positions[idx] = len(self._indices)
+        self._indices.append(idx)
+
+    def discard(self, idx):
+        """
+        Remove an index from the set, if present, by swapping it with the last one.
+        :param idx: (int) the index.
+        :return: None
+        """
+        pos = self._positions.pop(idx, None)
+        if pos is None:
+            return
+        last = self._indices.pop()
+        if last != idx:
+            self._indices[pos] = last
+            self._positions[last] = pos
+
+    def get(self, pos):
+        """
+        Return the index at the given position.
+        :param pos: (int) the position, in [0, len).
+        :return: (int) the index.
+        """
+        return self._indices[pos]
+
+    def __len__(self):
+        return len(self._indices)
+
+
+class _LazyHeap:
+    """
+    A min-heap of server indices by key, with lazy removal.
+    Every index has at most one live entry: adding or removing an index invalidates its previous entry, which is
+    discarded when it reaches the top of the heap.
+    """
+
+    def __init__(self):
+        """
+        Create a new empty heap.
+        """
+        self._heap = []  # the entries (key, index, version)
+        self._version = {}  # the version of the live entry, by index
+
+    def add(self, idx, key):
+        """
+        Add an index with the given key, replacing its previous entry.
+        :param idx: (int) the index.
+        :param key: the key; ties are broken by index.
+        :return: None
+        """
+        version = abs(self._version.get(idx, 0)) + 1
+        self._version[idx] = version
+        heappush(self._heap, (key, idx, version))
+
+    def discard(self, idx):
+        """
+        Remove an index, if present.
+        :param idx: (int) the index.
+        :return: None
+        """
+        if idx in self._version:
+            self._version[idx] = -abs(self._version[idx])
+
+    def first(self):
+        """
+        Return the index with the lowest key.
+        :return: (int) the index with the lowest key, if present; None, otherwise.
+        """
+        heap = self._heap
+        while heap and self._version[heap[0][1]] != heap[0][2]:
+            heappop(heap)
+        return heap[0][1] if heap else None
+
 
 class BaseServerSelection:
-    def __init__(self, servers):
+    def __init__(self, servers, rndgen, rndstreams=None):
         """
         Create a new server selector.
+        Selectors keep incremental indices of idle and busy servers, that must be updated by notifying every state
+        transition of servers (*on_busy* and *on_idle*).
         :param servers: ([SimpleServer]) the list of servers.
+        :param rndgen: (object) the multi-stream rnd number generator.
+        :param rndstreams: (StreamAllocator) the stream allocator of the simulation, if any.
         """
         self._servers = servers
 
@@ -31,24 +185,58 @@ class BaseServerSelection:
         """
         raise NotImplementedError
 
+    def on_busy(self, idx, tsk):
+        """
+        Notify that a server started serving a task.
+        :param idx: (int) the index of the server.
+        :param tsk: (TaskType) the type of the task.
+        :return: None
+        """
+        pass
+
+    def on_idle(self, idx, tsk):
+        """
+        Notify that a server stopped serving a task, because of completion or interruption.
+        :param idx: (int) the index of the server.
+        :param tsk: (TaskType) the type of the task.
+        :return: None
+        """
+        pass
+
+    def _idle_indices(self):
+        """
+        Return the indices of idle servers.
+        :return: (list(int)) the indices of idle servers.
+        """
+        return [idx for idx, srv in enumerate(self._servers) if srv.state is ServerState.IDLE]
+
+    def _busy_indices(self, tsk):
+        """
+        Return the indices of servers busy with the given task type.
+        :param tsk: (TaskType) the type of the task.
+        :return: (list(int)) the indices of servers busy with the given task type.
+        """
+        return [idx for idx, srv in enumerate(self._servers) if srv.task_type is tsk]
+
 
 class ServerSelectorOrder(BaseServerSelection):
-    def __init__(self, servers):
+    def __init__(self, servers, rndgen, rndstreams=None):
         """
         Create a new server selector based on Order Selection Rule
         :param servers: ([SimpleServer]) the list of servers.
+        :param rndgen: (object) the multi-stream rnd number generator.
+        :param rndstreams: (StreamAllocator) the stream allocator of the simulation, if any.
         """
-        BaseServerSelection.__init__(self, servers)
+        BaseServerSelection.__init__(self, servers, rndgen, rndstreams)
+        self._idle = _SortedIndexSet(self._idle_indices())
+        self._busy = {tsk: _SortedIndexSet(self._busy_indices(tsk)) for tsk in TaskScope.concrete()}
 
     def select_idle(self):
         """
         Select an idle server, according to the adopted server selection rule.
         :return: (int) the index of the selected server, if present; None, otherwise.
         """
-        for (idx, srv) in enumerate(self._servers):
-            if srv.state is ServerState.IDLE:
-                return idx
-        return None
+        return self._idle.first()
 
     def select_interruption(self, task_type):
         """
@@ -56,33 +244,39 @@ class ServerSelectorOrder(BaseServerSelection):
         :param task_type: (TaskType) the type of the task.
         :return: (int) the index of the selected server, if present; None, otherwise.
         """
-        for (idx, srv) in enumerate(self._servers):
-            if srv.task_type is task_type:
-                return idx
-        return None
+        return self._busy[task_type].first()
+
+    def on_busy(self, idx, tsk):
+        self._idle.discard(idx)
+        self._busy[tsk].add(idx)
+
+    def on_idle(self, idx, tsk):
+        self._busy[tsk].discard(idx)
+        self._idle.add(idx)
 
 
 class ServerSelectorCyclic(BaseServerSelection):
-    def __init__(self, servers):
+    def __init__(self, servers, rndgen, rndstreams=None):
         """
         Create a new server selector based on Cyclic Selection Rule.
         :param servers: ([SimpleServer]) the list of servers.
+        :param rndgen: (object) the multi-stream rnd number generator.
+        :param rndstreams: (StreamAllocator) the stream allocator of the simulation, if any.
         """
-        BaseServerSelection.__init__(self, servers)
+        BaseServerSelection.__init__(self, servers, rndgen, rndstreams)
         self._last = 0  # the last selected index
+        self._idle = _SortedIndexSet(self._idle_indices())
+        self._busy = {tsk: _SortedIndexSet(self._busy_indices(tsk)) for tsk in TaskScope.concrete()}
 
     def select_idle(self):
         """
         Select an idle server, according to the adopted server selection rule.
         :return: (int) the index of the selected server, if present; None, otherwise.
         """
-        for i in range(1, len(self._servers) + 1):
-            idx = (self._last + i) % len(self._servers)
-            srv = self._servers[idx]
-            if srv.state is ServerState.IDLE:
-                self._last = idx
-                return idx
-        return None
+        idx = self._idle.next(self._last)
+        if idx is not None:
+            self._last = idx
+        return idx
 
     def select_interruption(self, task_type):
         """
@@ -90,32 +284,45 @@ class ServerSelectorCyclic(BaseServerSelection):
         :param task_type: (TaskType) the type of the task.
         :return: (int) the index of the selected server, if present; None, otherwise.
         """
-        for i in range(1, len(self._servers) + 1):
-            idx = (self._last + i) % len(self._servers)
-            srv = self._servers[idx]
-            if srv.task_type is task_type:
-                self._last = idx
-                return idx
-        return None
+        idx = self._busy[task_type].next(self._last)
+        if idx is not None:
+            self._last = idx
+        return idx
+
+    def on_busy(self, idx, tsk):
+        self._idle.discard(idx)
+        self._busy[tsk].add(idx)
+
+    def on_idle(self, idx, tsk):
+        self._busy[tsk].discard(idx)
+        self._idle.add(idx)
 
 
 class ServerSelectorEquity(BaseServerSelection):
-    def __init__(self, servers):
+    def __init__(self, servers, rndgen, rndstreams=None):
         """
         Create a new server selector based on Equity Selection Rule.
+        Idle servers are kept in a heap by descending idle time; busy servers are kept in a heap by ascending number of
+        interrupted tasks, by task type. Both keys change only when the server changes state.
         :param servers: ([SimpleServer]) the list of servers.
+        :param rndgen: (object) the multi-stream rnd number generator.
+        :param rndstreams: (StreamAllocator) the stream allocator of the simulation, if any.
         """
-        BaseServerSelection.__init__(self, servers)
+        BaseServerSelection.__init__(self, servers, rndgen, rndstreams)
+        self._idle = _LazyHeap()
+        for idx in self._idle_indices():
+            self._idle.add(idx, -self._servers[idx].t_idle)
+        self._busy = {tsk: _LazyHeap() for tsk in TaskScope.concrete()}
+        for tsk in TaskScope.concrete():
+            for idx in self._busy_indices(tsk):
+                self._busy[tsk].add(idx, self._servers[idx].switched[tsk])
 
     def select_idle(self):
         """
         Select an idle server, according to the adopted server selection rule.
         :return: (int) the index of the selected server, if present; None, otherwise.
         """
-        candidates = [(idx, server) for idx, server in enumerate(self._servers) if server.state is ServerState.IDLE]
-        if len(candidates) == 0:
-            return None
-        return max(candidates, key=lambda x: x[1].t_idle)[0]
+        return self._idle.first()
 
     def select_interruption(self, tsk):
         """
@@ -123,29 +330,45 @@ class ServerSelectorEquity(BaseServerSelection):
         :param tsk: (TaskType) the type of the task.
         :return: (int) the index of the selected server, if present; None, otherwise.
         """
-        candidates = [(idx, server) for idx, server in enumerate(self._servers) if server.task_type is tsk]
-        if len(candidates) == 0:
-            return None
-        return min(candidates, key=lambda x: x[1].switched[tsk])[0]
+        return self._busy[tsk].first()
+
+    def on_busy(self, idx, tsk):
+        self._idle.discard(idx)
+        self._busy[tsk].add(idx, self._servers[idx].switched[tsk])
+
+    def on_idle(self, idx, tsk):
+        self._busy[tsk].discard(idx)
+        self._idle.add(idx, -self._servers[idx].t_idle)
 
 
 class ServerSelectorRandom(BaseServerSelection):
-    def __init__(self, servers):
+    def __init__(self, servers, rndgen, rndstreams=None):
         """
         Create a new server selector based on Random Selection Rule.
+        Servers are selected by drawing from a dedicated stream of the given generator, so that selections are
+        reproducible and independent of any other source of randomness.
         :param servers: ([SimpleServer]) the list of servers.
+        :param rndgen: (object) the multi-stream rnd number generator.
+        :param rndstreams: (StreamAllocator) the stream allocator of the simulation, if any.
         """
-        BaseServerSelection.__init__(self, servers)
+        BaseServerSelection.__init__(self, servers, rndgen, rndstreams)
+        rndstreams = rndstreams if rndstreams is not None else StreamAllocator(rndgen, policy=CollisionPolicy.EXPAND)
+        stream = rndstreams.request("cloudlet_selection", SELECTION_STREAM)
+        self.rndselection = RandomComponent(
+            gen=rndgen,
+            str={state: stream for state in ServerState},
+            var={state: Variate.UNIFORM for state in ServerState},
+            par={state: {"a": 0.0, "b": 1.0} for state in ServerState},
+        )
+        self._idle = _IndexableSet(self._idle_indices())
+        self._busy = {tsk: _IndexableSet(self._busy_indices(tsk)) for tsk in TaskScope.concrete()}
 
     def select_idle(self):
         """
         Select an idle server, according to the adopted server selection rule.
         :return: (int) the index of the selected server, if present; None, otherwise.
         """
-        candidates = [(idx, server) for idx, server in enumerate(self._servers) if server.state is ServerState.IDLE]
-        if len(candidates) == 0:
-            return None
-        return random.choice(candidates)[0]
+        return self._choice(self._idle, ServerState.IDLE)
 
     def select_interruption(self, tsk):
         """
@@ -153,10 +376,26 @@ class ServerSelectorRandom(BaseServerSelection):
         :param tsk: (TaskType) the type of the task.
         :return: (int) the index of the selected server, if present; None, otherwise.
         """
-        candidates = [(idx, server) for idx, server in enumerate(self._servers) if server.task_type is tsk]
+        return self._choice(self._busy[tsk], ServerState.BUSY)
+
+    def on_busy(self, idx, tsk):
+        self._idle.discard(idx)
+        self._busy[tsk].add(idx)
+
+    def on_idle(self, idx, tsk):
+        self._busy[tsk].discard(idx)
+        self._idle.add(idx)
+
+    def _choice(self, candidates, state):
+        """
+        Select a candidate uniformly at random.
+        :param candidates: (_IndexableSet) the candidates.
+        :param state: (ServerState) the state of candidates, i.e. IDLE for arrivals and BUSY for interruptions.
+        :return: (int) the selected candidate, if present; None, otherwise.
+        """
         if len(candidates) == 0:
             return None
-        return random.choice(candidates)[0]
+        return candidates.get(equilikely(0, len(candidates) - 1, self.rndselection.generate(state)))
 
 
 @unique
@@ -1,3 +1,4 @@
+from pydes.core.rnd.rndstream import CollisionPolicy, StreamAllocator
 from pydes.core.simulation.model.cloud import SimpleCloud as Cloud
 from pydes.core.simulation.model.cloudlet import SimpleCloudlet as Cloudlet
 from pydes.core.simulation.model.controller import ControllerResponse
@@ -15,13 +16,16 @@ class SimpleCloudletCloudSystem:
     A system composed by a Cloudlet and a Cloud.
     """
 
-    def __init__(self, rndgen, config, metrics):
+    def __init__(self, rndgen, config, metrics, rndstreams=None):
         """
         Create a new system.
         :param rndgen: (object) the multi-stream rnd number generator.
         :param config: (dictionary) the System configuration.
         :param metrics: (SimulationMetrics) the simulation metrics.
+        :param rndstreams: (StreamAllocator) the stream allocator of the simulation, if any.
         """
+        rndstreams = rndstreams if rndstreams is not None else StreamAllocator(rndgen, policy=CollisionPolicy.EXPAND)
+
         # State
         self.state = {sys: {tsk: 0 for tsk in TaskScope.concrete()} for sys in SystemScope.subsystems()}
 
@@ -29,10 +33,19 @@ class SimpleCloudletCloudSystem:
         self.metrics = metrics
 
         # Subsystem - Cloudlet
-        self.cloudlet = Cloudlet(rndgen, config["cloudlet"], self.state[SystemScope.CLOUDLET], self.metrics)
+        self.cloudlet = Cloudlet(rndgen, config["cloudlet"], self.state[SystemScope.CLOUDLET], self.metrics, rndstreams)
+
+        # The scheduled completions in Cloudlet, by server index (used to unschedule completions of interrupted tasks)
+        self.cloudlet_completions = [None] * self.cloudlet.n_servers
 
         # Subsystem - Cloud
-        self.cloud = Cloud(rndgen, config["cloud"], self.state[SystemScope.CLOUD], self.metrics)
+        self.cloud = Cloud(rndgen, config["cloud"], self.state[SystemScope.CLOUD], self.metrics, rndstreams)
+
+        # Events
+        self.completion_types = {
+            sys: {tsk: EventType.of(ActionScope.COMPLETION, sys, tsk) for tsk in TaskScope.concrete()}
+            for sys in SystemScope.subsystems()
+        }
 
     # ==================================================================================================================
     # EVENT SUBMISSION
@@ -49,7 +62,7 @@ class SimpleCloudletCloudSystem:
         :param event: (SimpleEvent) the event
         :return: ([s],[u]) where
         *s* is a list of events to schedule;
-        *u* is a list of events to unschedule.
+        *u* is a list of handles of events to unschedule.
         """
         response_events_to_schedule = []
         response_events_to_unschedule = []
@@ -68,7 +81,9 @@ class SimpleCloudletCloudSystem:
         elif event.type.act is ActionScope.COMPLETION:
 
             # Submit the completion
-            self.submit_completion(event.type.tsk, event.type.sys, event.time, event.meta)
+            self.submit_completion(
+                event.type.tsk, event.type.sys, event.time, event.t_arrival, event.switched, event.server_idx
+            )
         else:
             raise ValueError("Unrecognized event: {}".format(event))
 
@@ -81,7 +96,7 @@ class SimpleCloudletCloudSystem:
         :param t_now: (float) the arrival time.
         :return: (s,u) where
         *s* is a list of events to schedule;
-        *u* is a list of events to unschedule;
+        *u* is a list of handles of events to unschedule;
         """
         e_to_schedule = []
         e_to_unschedule = []
@@ -91,34 +106,32 @@ class SimpleCloudletCloudSystem:
 
         if controller_response is ControllerResponse.SUBMIT_TO_CLOUDLET:
             logger.debug("{} sent to CLOUDLET at {}".format(tsk, t_now))
-            t_completion = self.cloudlet.submit_arrival(tsk, t_now)
-            e_completion = Event(
-                EventType.of(ActionScope.COMPLETION, SystemScope.CLOUDLET, tsk), t_completion, t_arrival=t_now
+            t_completion, server_idx = self.cloudlet.submit_arrival(tsk, t_now)
+            e_completion = Event.create(
+                self.completion_types[SystemScope.CLOUDLET][tsk], t_completion, t_arrival=t_now, server_idx=server_idx
             )
+            self.cloudlet_completions[server_idx] = e_completion
             e_to_schedule.append(e_completion)
 
         elif controller_response is ControllerResponse.SUBMIT_TO_CLOUD:
             logger.debug("{} sent to CLOUD at {}".format(tsk, t_now))
             t_completion = self.cloud.submit_arrival(tsk, t_now)
-            e_completion = Event(
-                EventType.of(ActionScope.COMPLETION, SystemScope.CLOUD, tsk), t_completion, t_arrival=t_now
-            )
+            e_completion = Event.create(self.completion_types[SystemScope.CLOUD][tsk], t_completion, t_arrival=t_now)
             e_to_schedule.append(e_completion)
 
         elif controller_response is ControllerResponse.SUBMIT_TO_CLOUDLET_WITH_INTERRUPTION:
             tsk_interrupt = TaskScope.TASK_2
             logger.debug("{} interrupted in CLOUDLET at {}".format(tsk_interrupt, t_now))
-            t_completion_1, t_arrival_1 = self.cloudlet.submit_interruption(tsk_interrupt, t_now)
-            e_completion_to_ignore = Event(
-                EventType.of(ActionScope.COMPLETION, SystemScope.CLOUDLET, tsk_interrupt), t_completion_1
-            )
-            e_to_unschedule.append(e_completion_to_ignore)
+            t_completion_1, t_arrival_1, server_idx_1 = self.cloudlet.submit_interruption(tsk_interrupt, t_now)
+            e_completion_to_ignore = self.cloudlet_completions[server_idx_1]
+            self.cloudlet_completions[server_idx_1] = None
+            e_to_unschedule.append(e_completion_to_ignore.handle)
 
             logger.debug("{} restarted in CLOUD at {}".format(tsk_interrupt, t_now))
             t_completion = self.cloud.submit_arrival(tsk_interrupt, t_now, restart=True)
             # TODO check t_arrival=t_arrival_1 or t_now
-            e_completion = Event(
-                EventType.of(ActionScope.COMPLETION, SystemScope.CLOUD, tsk_interrupt),
+            e_completion = Event.create(
+                self.completion_types[SystemScope.CLOUD][tsk_interrupt],
                 t_completion,
                 t_arrival=t_now,
                 switched=True,
@@ -126,10 +139,11 @@ class SimpleCloudletCloudSystem:
             e_to_schedule.append(e_completion)
 
             logger.debug("{} sent to CLOUDLET at {}".format(tsk, t_now))
-            t_completion = self.cloudlet.submit_arrival(tsk, t_now)
-            e_completion = Event(
-                EventType.of(ActionScope.COMPLETION, SystemScope.CLOUDLET, tsk), t_completion, t_arrival=t_now
+            t_completion, server_idx = self.cloudlet.submit_arrival(tsk, t_now)
+            e_completion = Event.create(
+                self.completion_types[SystemScope.CLOUDLET][tsk], t_completion, t_arrival=t_now, server_idx=server_idx
             )
+            self.cloudlet_completions[server_idx] = e_completion
             e_to_schedule.append(e_completion)
 
         else:
@@ -193,13 +207,15 @@ class SimpleCloudletCloudSystem:
 
         return e_to_schedule, e_to_unschedule
 
-    def submit_completion(self, tsk, scope, t_now, meta):
+    def submit_completion(self, tsk, scope, t_now, t_arrival, switched=False, server_idx=None):
         """
         Submit the completion of a task.
         :param tsk: (TaskType) the type of task.
         :param scope: (Scope) the scope.
         :param t_now: (float) the occurrence time of the event.
-        :param meta: (dict) metadata associate to the completion event.
+        :param t_arrival: (float) the arrival time of the task.
+        :param switched: (bool) True if the task has been switched from Cloudlet to Cloud.
+        :param server_idx: (int) the index of the serving server, for completions in Cloudlet.
         :return: None
         """
         logger.debug("{} completed in {} at {}".format(tsk, scope, t_now))
@@ -209,10 +225,10 @@ class SimpleCloudletCloudSystem:
 
         # Process event
         if scope is SystemScope.CLOUDLET:
-            self.cloudlet.submit_completion(tsk, t_now, meta.t_arrival)
+            self.cloudlet.submit_completion(tsk, t_now, t_arrival, server_idx)
+            self.cloudlet_completions[server_idx] = None
         elif scope is SystemScope.CLOUD:
-            switched = meta.switched if "switched" in meta.__dict__ else False
-            self.cloud.submit_completion(tsk, t_now, meta.t_arrival, switched)
+            self.cloud.submit_completion(tsk, t_now, t_arrival, switched)
         else:
             raise ValueError("Unrecognized scope {}".format(scope))
 
@@ -220,6 +236,15 @@ class SimpleCloudletCloudSystem:
     # OTHER
     # ==================================================================================================================
 
+    def update_population_area(self, t_now):
+        """
+        Accumulate the population area of the Cloudlet and the Cloud up to the given time.
+        :param t_now: (float) the current time.
+        :return: None
+        """
+        self.cloudlet.update_population_area(t_now)
+        self.cloud.update_population_area(t_now)
+
     def is_idle(self):
         """
         Check weather the system is idle or not.
@@ -1,3 +1,4 @@
+from pydes.core.rnd.rndstream import CollisionPolicy, StreamAllocator
 from pydes.core.rnd.rndvar import exponential
 from pydes.core.simulation.model.event import EventType
 from pydes.core.simulation.model.event import SimpleEvent as Event
@@ -13,18 +14,25 @@ class ExponentialTaskgen:
     A tasks generator for exponential inter-arrivals.
     """
 
-    def __init__(self, rndgen, config):
+    def __init__(self, rndgen, config, rndstreams=None):
         """
         Create a new tasks generator.
         :param rndgen: (object) the multi-stream rnd number generator.
         :param config: (dict) the arrival rates configuration.
+        :param rndstreams: (StreamAllocator) the stream allocator of the simulation, if any.
         """
         # Arrival rates
         self.rates = {tsk: 1.0 / config[tsk]["parameters"]["m"] for tsk in TaskScope.concrete()}
 
         # Randomization
         self.rndgen = rndgen
-        self.stream = {tsk: EventType.of(ActionScope.ARRIVAL, SystemScope.SYSTEM, tsk).value for tsk in TaskScope}
+        rndstreams = rndstreams if rndstreams is not None else StreamAllocator(rndgen, policy=CollisionPolicy.EXPAND)
+        self.stream = {
+            tsk: rndstreams.request(
+                "arrival_{}".format(tsk.name.lower()), EventType.of(ActionScope.ARRIVAL, SystemScope.SYSTEM, tsk).value
+            )
+            for tsk in TaskScope
+        }
         self.lambda_tot = sum(self.rates[tsk] for tsk in TaskScope.concrete())
         self.p_1 = self.rates[TaskScope.TASK_1] / self.lambda_tot
 
@@ -50,7 +58,7 @@ class ExponentialTaskgen:
         t_event = t_clock + exponential(m=(1.0 / self.lambda_tot), u=self.rndgen.rnd())
 
         # Generate the arrival event
-        arrival = Event(self.event_types[tsk], t_event)
+        arrival = Event.create(self.event_types[tsk], t_event)
 
         # Update state
         self.generated[tsk] += 1
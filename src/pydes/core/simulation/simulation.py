@@ -1,23 +1,41 @@
-import os
 from sys import maxsize as INFINITE
 
+from pydes.core.metrics.sampling import SamplingFormat, get_dtypes, get_header
+from pydes.core.metrics.sampling_policy import ReservoirSampler, SamplingPolicy
 from pydes.core.metrics.simulation_metrics import SimulationMetrics
+from pydes.core.metrics.warmup import MSERWarmupDetector
 from pydes.core.rnd import rndgen
+from pydes.core.rnd.rndstream import CollisionPolicy, StreamAllocator, format_streams
 from pydes.core.rnd.rndvar import Variate
-from pydes.core.simulation.model.calendar import NextEventCalendar as Calendar
+from pydes.core.simulation.model.calendar import CalendarEngine
 from pydes.core.simulation.model.controller import ControllerAlgorithm
 from pydes.core.simulation.model.event import ActionScope
 from pydes.core.simulation.model.scope import SystemScope, TaskScope
 from pydes.core.simulation.model.system import SimpleCloudletCloudSystem as System
 from pydes.core.simulation.model.taskgen import ExponentialTaskgen as Taskgen
 from pydes.core.simulation.simulation_mode import SimulationMode
-from pydes.core.utils.file_utils import empty_file
 from pydes.core.utils.guiutils import print_progress
 from pydes.core.utils.report import SimpleReport as Report
 
 # Logging
 # logger = get_logger(__name__)
 
+# The default minimum number of batches before checking the target precision (sequential stopping rule)
+DEFAULT_PRECISION_MIN_BATCHES = 10
+
+# The default performance metrics tested for independence of batch means (adaptive batch dimension)
+DEFAULT_ADAPTIVE_METRICS = ["response_system_global"]
+
+# The default maximum batch dimension (adaptive batch dimension)
+DEFAULT_ADAPTIVE_MAX_BATCHDIM = 65536
+
+# The default performance metrics whose warm-up is detected (warm-up detection)
+DEFAULT_WARMUP_METRICS = ["throughput_system_global"]
+
+# The default number of samples per batch and number of batches at the first evaluation (warm-up detection, MSER-5)
+DEFAULT_WARMUP_BATCHDIM = 5
+DEFAULT_WARMUP_MIN_BATCHES = 20
+
 
 class Simulation:
     """
@@ -39,21 +57,35 @@ class Simulation:
         # Configuration - Transient Analysis
         if self.mode is SimulationMode.TRANSIENT_ANALYSIS:
             self.t_stop = config_general["t_stop"]
-            # self.t_tran = 0
+            self.t_tran = 0.0
             self.batches = INFINITE
             self.batchdim = 1
+            self.adaptive = None
             self.closed_door_condition = lambda: self.closed_door_condition_transient_analysis()
             self.print_progress = lambda: print_progress(
                 self.calendar.get_clock(), self.t_stop, message="Clock: %d" % (self.calendar.get_clock())
             )
-            # self.should_discard_transient_data = False
+            self.warmup = None
 
         # Configuration - Performance Analysis
         elif self.mode is SimulationMode.PERFORMANCE_ANALYSIS:
             self.t_stop = INFINITE
-            # self.t_tran = config_general["t_tran"]
+            # If a warm-up detection is configured, t_tran is the time at which transient data are discarded
+            self.t_tran = 0.0
+            self.warmup = config_general.get("warmup")
             self.batches = config_general["batches"]
             self.batchdim = config_general["batchdim"]
+            # If adaptive, batchdim is the initial batch dimension, doubled until batch means are uncorrelated
+            self.adaptive = config_general.get("adaptive_batchdim")
+            # Batch means must be tested before the closed door condition holds, i.e. within the number of batches
+            if self.adaptive is not None and self.adaptive.get("batches", self.batches) > self.batches:
+                raise ValueError(
+                    "Invalid adaptive batches: should be <= batches, but is {} and batches is {}".format(
+                        self.adaptive["batches"], self.batches
+                    )
+                )
+            # If a precision is configured, batches is the maximum number of batches (sequential stopping rule)
+            self.precision = config_general.get("precision")
             self.closed_door_condition = lambda: self.closed_door_condition_performance_analysis()
             self.print_progress = lambda: print_progress(
                 self.metrics.n_batches,
@@ -61,17 +93,54 @@ class Simulation:
                 message="Clock: %d | Batches: %d | CurrentBatchSamples: %d"
                 % (self.calendar.get_clock(), self.metrics.n_batches, self.metrics.curr_batchdim),
             )
-            # self.should_discard_transient_data = self.t_tran > 0.0
 
         else:
             raise RuntimeError("The current version supports only TRANSIENT_ANALYSIS and PERFORMANCE_ANALYSIS")
 
         # Configuration - Randomization
         self.rndgen = getattr(rndgen, config_general["random"]["generator"])(config_general["random"]["seed"])
+        # Every component requests its streams to the stream allocator, that resolves stream collisions
+        self.rndstreams = StreamAllocator(
+            self.rndgen, policy=config_general["random"].get("collision", CollisionPolicy.EXPAND)
+        )
 
         # The simulation metrics
-        self.metrics = SimulationMetrics(self.batchdim)
         self.confidence = config_general["confidence"]
+        if self.adaptive is not None:
+            self.metrics = SimulationMetrics(
+                self.batchdim,
+                adaptive_batches=self.adaptive.get("batches", self.batches),
+                adaptive_metrics=self.adaptive.get("metrics", DEFAULT_ADAPTIVE_METRICS),
+                alpha=1.0 - self.confidence,
+                max_batchdim=self.adaptive.get("max_batchdim", DEFAULT_ADAPTIVE_MAX_BATCHDIM),
+            )
+        else:
+            self.metrics = SimulationMetrics(self.batchdim)
+
+        # Configuration - Precision (sequential stopping rule)
+        self.precision_measures = None  # the performance metrics to watch, by name
+        self.precision_batches = 0  # the number of batches at the last check
+        self.precision_reached = False  # True if the target precision has been reached
+        if self.mode is SimulationMode.PERFORMANCE_ANALYSIS and self.precision is not None:
+            self.precision_measures = {metric: self.metrics.get_measure(metric) for metric in self.precision["metrics"]}
+
+        # Configuration - Warm-up (initial transient detection)
+        self.should_discard_transient_data = self.warmup is not None
+        self.warmup_indices = None  # the indices of the performance metrics whose warm-up is detected, by name
+        self.warmup_detectors = None  # the warm-up detectors, by name
+        self.warmup_batchdim = None  # the number of samples per batch of warm-up detectors
+        self.warmup_samples = 0  # the number of samples fed to warm-up detectors so far
+        if self.should_discard_transient_data:
+            metrics = self.warmup.get("metrics", DEFAULT_WARMUP_METRICS)
+            self.warmup_indices = {metric: self.metrics.get_index(metric) for metric in metrics}
+            self.warmup_batchdim = self.warmup.get("batchdim", DEFAULT_WARMUP_BATCHDIM)
+            # Batches are formed by the simulation, over counters increments (see *discard_transient_data*)
+            self.warmup_detectors = {
+                metric: MSERWarmupDetector(
+                    batchdim=1, min_batches=self.warmup.get("min_batches", DEFAULT_WARMUP_MIN_BATCHES)
+                )
+                for metric in metrics
+            }
 
         # Configuration - Tasks
         # Checks that the arrival process is Markovian (currently, the only one supported)
@@ -80,11 +149,11 @@ class Simulation:
             for variate in [config["arrival"][tsk]["distribution"] for tsk in TaskScope.concrete()]
         ):
             raise NotImplementedError("The current version supports only exponential arrivals")
-        self.taskgen = Taskgen(rndgen=self.rndgen, config=config["arrival"])
+        self.taskgen = Taskgen(rndgen=self.rndgen, config=config["arrival"], rndstreams=self.rndstreams)
 
         # Configuration - System (Cloudlet and Cloud)
         config_system = config["system"]
-        self.system = System(rndgen=self.rndgen, config=config_system, metrics=self.metrics)
+        self.system = System(rndgen=self.rndgen, config=config_system, metrics=self.metrics, rndstreams=self.rndstreams)
 
         # Configuration - Calendar
         # Notice that the calendar internally manages:
@@ -93,10 +162,31 @@ class Simulation:
         #   (ii.i) possible arrivals, i.e. arrivals with occurrence time lower than stop time.
         #   (ii.ii) departures of possible arrivals.
         # (iii) unscheduling of events to ignore, e.g. completion in Cloudlet of interrupted tasks.
-        self.calendar = Calendar(t_clock=0.0)
+        self.calendar = config_general.get("calendar", CalendarEngine.HEAP).calendar(t_clock=0.0)
+
+        # Events management
+        # If True, events are returned to the free list once processed, and reused for new events.
+        self.recycle_events = config_general.get("recycle_events", False)
 
         # Sampling management
+        # Performance metrics are sampled according to the sampling policy: by default, every sampling_interval
+        # completions (see *SamplingPolicy*)
+        config_sampling = config_general.get("sampling", {})
         self.sampling_file = None
+        self.sampling_format = config_general.get("sampling_format", SamplingFormat.CSV)
+        self.sampling_compress = config_general.get("sampling_compress", True)
+        self.sampling_policy = config_sampling.get("policy", SamplingPolicy.EVERY_K)
+        self.sampling_interval = config_sampling.get("interval", config_general.get("sampling_interval", 1))
+        if self.sampling_policy is SamplingPolicy.RESERVOIR:
+            self.sampler = ReservoirSampler(
+                config_sampling["size"],
+                self.sampling_interval,
+                config_sampling.get("seed", self.rndgen.get_initial_seed()),
+                get_dtypes(),
+            )
+        else:
+            self.sampler = self.sampling_policy.sampler(self.sampling_interval)
+        self.n_completions = 0
 
         # Simulation management
         self.closed_door = False
@@ -114,49 +204,106 @@ class Simulation:
         """
 
         # Initialize sampling
-        self.sampling_file = os.path.join(outdir, "result.sampling.csv")
-        empty_file(self.sampling_file)
-
-        # Initialize first arrivals
-        # Schedule the first events, i.e. task of type 1 and 2.
-        # Notice that the event order by arrival time is managed internally by the Calendar.
-        self.calendar.schedule(self.taskgen.generate(self.calendar.get_clock()))
-
-        # Run the simulation until the stop condition holds true
-        while not self.stop_condition():
-
-            # Get the next event and update the calendar clock.
-            # Notice that the Calendar clock is automatically updated.
-            # Notice that the next event is always a possible event.
-            event = self.calendar.get_next_event()
-
-            # Check the closed-door condition
-            self.closed_door = self.closed_door_condition()
-
-            # Submit the event to the system if:
-            #   * the closed door condition is False
-            #   * the closed door condition is True, but the event is not an ARRIVAL
-            # Notice that every submission generates some other events to be scheduled/unscheduled,
-            # e.g., completions and interruptions (i.e., completions to be ignored).
-            if self.closed_door is False or event.type.act is not ActionScope.ARRIVAL:
-                events_to_schedule, events_to_unschedule = self.system.submit(event)
-                # Schedule/Unschedule response events
-                self.calendar.schedule(*events_to_schedule)
-                self.calendar.unschedule(*events_to_unschedule)
-
-            # If the last event was an arrival and the closed-door condition does not hold, schedule a new arrival
-            # Notice that, impossible events are automatically ignored by the calendar
-            if event.type.act is ActionScope.ARRIVAL and self.closed_door is False:
-                self.calendar.schedule(self.taskgen.generate(self.calendar.get_clock()))
-
-            # Sampling
-            if self.sampling_condition(event):
-                sample = self.metrics.sampling(self.calendar.get_clock())
-                sample.save_csv(self.sampling_file, append=True)
-
-            # Simulation progress
-            if show_progress:
-                self.print_progress()
+        # Samples are streamed to the sampling file, buffered in memory and written in bulk
+        self.sampling_file = self.sampling_format.filename(outdir)
+        with self.sampling_format.open(
+            self.sampling_file, get_header(), self.sampling_compress, get_dtypes()
+        ) as sampling_writer:
+
+            # Initialize first arrivals
+            # Schedule the first events, i.e. task of type 1 and 2.
+            # Notice that the event order by arrival time is managed internally by the Calendar.
+            self.calendar.schedule(self.taskgen.generate(self.calendar.get_clock()))
+
+            # Run the simulation until the stop condition holds true
+            while not self.stop_condition():
+
+                # Get the next event and update the calendar clock.
+                # Notice that the Calendar clock is automatically updated.
+                # Notice that the next event is always a possible event.
+                event = self.calendar.get_next_event()
+
+                # Sampling on the time grid, if any
+                # Notice that grid points are sampled before processing the event, i.e. with the state held since the
+                # last event, and with the population area accumulated up to the grid point.
+                for t_sample in self.sampler.grid_points(self.calendar.get_clock()):
+                    self.system.update_population_area(t_sample)
+                    self.sampling(t_sample, sampling_writer)
+
+                # Check the closed-door condition
+                self.closed_door = self.closed_door_condition()
+
+                # Submit the event to the system if:
+                #   * the closed door condition is False
+                #   * the closed door condition is True, but the event is not an ARRIVAL
+                # Notice that every submission generates some other events to be scheduled/unscheduled,
+                # e.g., completions and interruptions (i.e., handles of completions to be ignored).
+                if self.closed_door is False or event.type.act is not ActionScope.ARRIVAL:
+                    events_to_schedule, handles_to_unschedule = self.system.submit(event)
+                    # Schedule/Unschedule response events
+                    self.calendar.schedule(*events_to_schedule)
+                    self.calendar.unschedule(*handles_to_unschedule)
+
+                # If the last event was an arrival and the closed-door condition does not hold, schedule a new arrival
+                # Notice that, impossible events are automatically ignored by the calendar
+                if event.type.act is ActionScope.ARRIVAL and self.closed_door is False:
+                    self.calendar.schedule(self.taskgen.generate(self.calendar.get_clock()))
+
+                # Sampling
+                if self.sampling_condition(event):
+                    self.sampling(self.calendar.get_clock(), sampling_writer)
+
+                # Recycle the processed event
+                if self.recycle_events:
+                    event.release()
+
+                # Simulation progress
+                if show_progress:
+                    self.print_progress()
+
+            # Write the samples retained by the sampling policy, if any
+            self.sampler.flush(sampling_writer)
+
+    def sampling(self, t_now, sampling_writer):
+        """
+        Samples performance metrics, serializing the sample only if it is accepted by the sampling policy.
+        Notice that the sample is serialized straight from the current values of metrics, without building it.
+        :param t_now: (float) the sampling time.
+        :param sampling_writer: the writer of the sampling file.
+        :return: None
+        """
+        self.metrics.sampling(t_now)
+        if self.sampler.accepts():
+            self.sampler.record(self.metrics.get_row(t_now), sampling_writer)
+        if self.should_discard_transient_data:
+            self.discard_transient_data(t_now)
+
+    def discard_transient_data(self, t_now):
+        """
+        Feeds the warm-up detectors with the batch values of their performance metrics and, as soon as all of them
+        detected the end of warm-up, discards the data collected so far, unless no warm-up has been detected at all.
+        The batch value of a metric is computed over counters increments and elapsed time in the batch, i.e. it is not
+        cumulative, so that the MSER rule is not biased by the autocorrelation of cumulative averages
+        (see *SimulationMetrics.get_interval_metrics*).
+        Data are discarded altogether, i.e. batches and counters, so that performance metrics are computed from then
+        on over counters increments and elapsed time since the end of warm-up (see *SimulationMetrics.discard_data*).
+        Notice that data are discarded at the time of detection, that is not earlier than the end of warm-up.
+        :param t_now: (float) the sampling time.
+        :return: None
+        """
+        self.warmup_samples += 1
+        if self.warmup_samples % self.warmup_batchdim != 0:
+            return
+        self.system.update_population_area(t_now)
+        values = self.metrics.get_interval_metrics(t_now)
+        detected = [
+            self.warmup_detectors[metric].add_sample(values[index]) for metric, index in self.warmup_indices.items()
+        ]
+        if all(detected):
+            self.should_discard_transient_data = False
+            if any(detector.truncation > 0 for detector in self.warmup_detectors.values()):
+                self.metrics.discard_data(t_now)
+                self.t_tran = t_now
 
     # ==================================================================================================================
     # CONDITIONS
@@ -173,10 +320,47 @@ class Simulation:
     def closed_door_condition_performance_analysis(self):
         """
         Checks whether the closed door condition holds true (PERFORMANCE_ANALYSIS).
-        The closed door condition holds true if the desired number of batches have been collected
+        The closed door condition holds true if the desired number of batches have been collected or, if a precision
+        is configured, as soon as the target precision has been reached (see *precision_condition*).
         :return: true, if the closed door condition holds; false, otherwise.
         """
-        return self.metrics.n_batches >= self.batches
+        if self.metrics.n_batches >= self.batches:
+            return True
+        if self.precision_measures is not None and self.metrics.n_batches != self.precision_batches:
+            self.precision_batches = self.metrics.n_batches
+            self.precision_reached = self.precision_condition()
+        return self.precision_reached
+
+    def precision_condition(self):
+        """
+        Checks whether the target precision has been reached, i.e. whether the relative half-width of the confidence
+        interval of every watched metric is not greater than the target, after the minimum number of batches.
+        The condition is checked as batches close and, if the batch dimension is adaptive, only once it is settled.
+        :return: true, if the target precision has been reached; false, otherwise.
+        """
+        if self.metrics.n_batches < self.precision.get("min_batches", DEFAULT_PRECISION_MIN_BATCHES):
+            return False
+        if not self.metrics.batchdim_settled:
+            return False
+        alpha = 1.0 - self.confidence
+        return all(
+            self.relative_half_width(measure, alpha) <= self.precision["target"]
+            for measure in self.precision_measures.values()
+        )
+
+    @staticmethod
+    def relative_half_width(measure, alpha):
+        """
+        Return the relative half-width of the confidence interval of a metric, i.e. the half-width over the mean.
+        :param measure: (BatchedStatistics) the metric.
+        :param alpha: (float) the significance.
+        :return: (float) the relative half-width; infinite, if the mean is zero and the half-width is not.
+        """
+        cint = measure.cint(alpha)
+        mean = abs(measure.mean())
+        if mean == 0.0:
+            return 0.0 if cint == 0.0 else float("inf")
+        return cint / mean
 
     def closed_door_condition_transient_analysis(self):
         """
@@ -189,10 +373,14 @@ class Simulation:
     def sampling_condition(self, event):
         """
         Checks whether the sampling condition holds true.
-        The sampling condition holds true on completion events.
+        The sampling condition holds true on completion events, according to the sampling policy, e.g. on every
+        *sampling_interval*-th completion event.
         :return: true, if the sampling condition holds; false, otherwise.
         """
-        return event.type.act is ActionScope.COMPLETION
+        if event.type.act is not ActionScope.COMPLETION:
+            return False
+        self.n_completions += 1
+        return self.sampler.fires(self.n_completions)
 
     # ==================================================================================================================
     # REPORT
@@ -213,10 +401,20 @@ class Simulation:
             r.add("general", "t_stop", self.t_stop)
         elif self.mode is SimulationMode.PERFORMANCE_ANALYSIS:
             r.add("general", "batches", self.batches)
-            r.add("general", "batchdim", self.batchdim)
+            r.add("general", "batchdim", self.metrics.target_batchdim)
+            if self.adaptive is not None:
+                r.add("general", "batchdim_initial", self.batchdim)
+                r.add("general", "batchdim_settled", self.metrics.batchdim_settled)
+                r.add("general", "batchdim_uncorrelated", self.metrics.batchdim_uncorrelated)
         else:
             raise RuntimeError("The current version supports only TRANSIENT_ANALYSIS and PERFORMANCE_ANALYSIS")
         r.add("general", "confidence", self.confidence)
+        if self.sampling_policy is not SamplingPolicy.EVERY_K:
+            r.add("general", "sampling_policy", self.sampling_policy.name)
+        if self.sampling_policy is SamplingPolicy.RESERVOIR:
+            r.add("general", "sampling_size", self.sampler.size)
+        if self.sampling_interval != 1:
+            r.add("general", "sampling_interval", self.sampling_interval)
 
         # Report - Randomization
         r.add("randomization", "generator", self.rndgen.__class__.__name__)
@@ -224,6 +422,9 @@ class Simulation:
         r.add("randomization", "modulus", self.rndgen.get_modulus())
         r.add("randomization", "multiplier", self.rndgen.get_multiplier())
         r.add("randomization", "streams", self.rndgen.get_nstreams())
+        r.add("randomization", "collision", self.rndstreams.policy.name)
+        for owner, streams in self.rndstreams.get_allocation().items():
+            r.add("randomization", "streams_{}".format(owner), format_streams(streams))
 
         # Report - Arrivals
         for tsk in TaskScope.concrete():
@@ -289,6 +490,20 @@ class Simulation:
         r.add("execution", "clock", self.calendar.get_clock())
         r.add("execution", "collected_samples", self.metrics.n_samples)
         r.add("execution", "collected_batches", self.metrics.n_batches)
+        if self.mode is SimulationMode.PERFORMANCE_ANALYSIS and self.warmup_detectors is not None:
+            r.add("execution", "warmup_detected", not self.should_discard_transient_data)
+            r.add("execution", "t_tran", self.t_tran)
+            for metric, detector in self.warmup_detectors.items():
+                r.add("execution", "warmup_samples_{}".format(metric), detector.truncation * self.warmup_batchdim)
+        if self.mode is SimulationMode.PERFORMANCE_ANALYSIS and self.precision_measures is not None:
+            r.add("execution", "precision_target", self.precision["target"])
+            r.add("execution", "precision_reached", self.precision_reached)
+            for metric, measure in self.precision_measures.items():
+                r.add(
+                    "execution",
+                    "precision_{}".format(metric),
+                    self.relative_half_width(measure, 1.0 - self.confidence),
+                )
 
         # Report - State
         for sys in sorted(self.system.state, key=lambda x: x.name):
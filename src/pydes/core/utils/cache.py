@@ -0,0 +1,160 @@
+"""
+A content-addressed on-disk cache of experiment results.
+"""
+
+import hashlib
+import json
+import os
+import pickle
+from enum import Enum
+from functools import lru_cache
+from tempfile import NamedTemporaryFile
+
+from pydes.core.utils.logutils import get_logger
+
+# Logging
+logger = get_logger(__name__)
+
+# The root of the source files whose content identifies the code version
+SOURCE_ROOT = os.path.dirname(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+# The default maximum size of the cache (bytes)
+DEFAULT_CACHE_SIZE = 256 * 1024 * 1024
+
+
+@lru_cache(maxsize=1)
+def get_code_version():
+    """
+    Return the code version, i.e. the digest of the content of all the source files of the package.
+    :return: (string) the code version.
+    """
+    digest = hashlib.sha256()
+    for root, dirs, files in sorted(os.walk(SOURCE_ROOT)):
+        dirs.sort()
+        for filename in sorted(files):
+            if filename.endswith(".py"):
+                path = os.path.join(root, filename)
+                digest.update(os.path.relpath(path, SOURCE_ROOT).encode())
+                with open(path, "rb") as f:
+                    digest.update(f.read())
+    return digest.hexdigest()
+
+
+def canonical(obj):
+    """
+    Return the canonical form of a configuration, i.e. a JSON-serializable object where enumerations are replaced by
+    their names.
+    :param obj: the configuration, or any of its values.
+    :return: the canonical form.
+    """
+    if isinstance(obj, Enum):
+        return obj.name
+    if isinstance(obj, dict):
+        return {str(canonical(k)): canonical(v) for k, v in obj.items()}
+    if isinstance(obj, (list, tuple)):
+        return [canonical(v) for v in obj]
+    return obj
+
+
+class ResultCache:
+    """
+    A content-addressed on-disk cache of experiment results, e.g. simulation and analytical reports.
+    Results are keyed by the hash of the normalized configuration, the seed, the mode and the code version, so that
+    changing any of them misses the cache.
+    The cache is bounded in size: when it exceeds its maximum size, the least recently used results are evicted.
+    Results are written atomically, so that the cache can be shared among processes.
+    """
+
+    def __init__(self, directory, max_size=DEFAULT_CACHE_SIZE):
+        """
+        Create a new ResultCache.
+        :param directory: (string) the directory of the cache.
+        :param max_size: (int) the maximum size of the cache (bytes).
+        """
+        self.directory = directory
+        self.max_size = max_size
+        os.makedirs(self.directory, exist_ok=True)
+
+    def key(self, config, mode, seed=None):
+        """
+        Return the key of a result.
+        :param config: (dict) the normalized configuration.
+        :param mode: (string) the mode of the experiment.
+        :param seed: (int) the seed, if any.
+        :return: (string) the key.
+        """
+        content = {"config": canonical(config), "mode": canonical(mode), "seed": seed, "version": get_code_version()}
+        return hashlib.sha256(json.dumps(content, sort_keys=True, default=str).encode()).hexdigest()
+
+    def get(self, key):
+        """
+        Retrieve a result, marking it as the most recently used.
+        :param key: (string) the key.
+        :return: the result, if present; None, otherwise.
+        """
+        path = self._path(key)
+        try:
+            with open(path, "rb") as f:
+                result = pickle.load(f)
+            os.utime(path)
+        except (FileNotFoundError, EOFError, pickle.UnpicklingError):
+            logger.debug("Cache miss: %s", key)
+            return None
+        logger.debug("Cache hit: %s", key)
+        return result
+
+    def put(self, key, result):
+        """
+        Store a result, evicting the least recently used results if the cache exceeds its maximum size.
+        :param key: (string) the key.
+        :param result: the result; must be picklable.
+        :return: None
+        """
+        with NamedTemporaryFile("wb", dir=self.directory, suffix=".tmp", delete=False) as f:
+            pickle.dump(result, f)
+        os.replace(f.name, self._path(key))
+        self.evict()
+
+    def evict(self):
+        """
+        Evict the least recently used results, until the cache does not exceed its maximum size.
+        :return: None
+        """
+        entries = []
+        for filename in os.listdir(self.directory):
+            if filename.endswith(".pickle"):
+                try:
+                    stat = os.stat(os.path.join(self.directory, filename))
+                except FileNotFoundError:
+                    continue
+                entries.append((stat.st_mtime, filename, stat.st_size))
+
+        size = sum(entry[2] for entry in entries)
+        for _, filename, entry_size in sorted(entries):
+            if size <= self.max_size:
+                break
+            logger.debug("Cache eviction: %s", filename)
+            try:
+                os.remove(os.path.join(self.directory, filename))
+            except FileNotFoundError:
+                pass
+            size -= entry_size
+
+    def size(self):
+        """
+        Return the size of the cache.
+        :return: (int) the size of the cache (bytes).
+        """
+        return sum(
+            os.path.getsize(os.path.join(self.directory, filename))
+            for filename in os.listdir(self.directory)
+            if filename.endswith(".pickle")
+        )
+
+    def _path(self, key):
+        """
+        Return the path of a result.
+        :param key: (string) the key.
+        :return: (string) the path of the result.
+        """
+        return os.path.join(self.directory, "{}.pickle".format(key))
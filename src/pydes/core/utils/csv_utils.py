@@ -8,6 +8,10 @@ from pydes.core.utils.file_utils import create_dir_tree, empty_file, is_empty_fi
 
 CHAR_TO_REPLACE = [" ", "/"]
 
+# The default budget of buffered rows of a BufferedCSVWriter
+DEFAULT_BUFFER_ROWS = 4096
+DEFAULT_BUFFER_BYTES = 4 * 1024 * 1024
+
 
 def save_csv(filename, names, data, append=False, skip_header=False, empty=False):
     """
@@ -37,6 +41,68 @@ def save_csv(filename, names, data, append=False, skip_header=False, empty=False
             f.write("\n")
 
 
+class BufferedCSVWriter:
+    """
+    A streaming CSV writer, that keeps the file open, writes the header once and buffers rows in memory, flushing them
+    in bulk as soon as either the row budget or the byte budget is exceeded.
+    The CSV layout is the same of *save_csv*.
+    """
+
+    def __init__(self, filename, names, max_rows=DEFAULT_BUFFER_ROWS, max_bytes=DEFAULT_BUFFER_BYTES):
+        """
+        Create a new BufferedCSVWriter, emptying the file and writing the header.
+        :param filename: (string) the filename.
+        :param names: (list(string)) the list of names in header.
+        :param max_rows: (int) the maximum number of buffered rows.
+        :param max_bytes: (int) the maximum number of buffered characters.
+        """
+        create_dir_tree(filename)
+        self.filename = filename
+        self.max_rows = max_rows
+        self.max_bytes = max_bytes
+        self._file = open(filename, "w")
+        self._buffer = [",".join(map(str_csv, names)) + "\n"]
+        self._buffer_bytes = len(self._buffer[0])
+
+    def write(self, row):
+        """
+        Write a row, flushing buffered rows if needed.
+        :param row: (list) the row.
+        :return: None
+        """
+        line = ",".join(map(str, row)) + "\n"
+        self._buffer.append(line)
+        self._buffer_bytes += len(line)
+        if len(self._buffer) >= self.max_rows or self._buffer_bytes >= self.max_bytes:
+            self.flush()
+
+    def flush(self):
+        """
+        Write buffered rows onto the file.
+        :return: None
+        """
+        self._file.write("".join(self._buffer))
+        self._file.flush()
+        self._buffer.clear()
+        self._buffer_bytes = 0
+
+    def close(self):
+        """
+        Flush buffered rows and close the file.
+        :return: None
+        """
+        if not self._file.closed:
+            self.flush()
+            self._file.close()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *args):
+        self.close()
+        return False
+
+
 def str_csv(s):
     """
     Make the string compatible with the CSV format.
@@ -0,0 +1,244 @@
+"""
+Utilities for binary trace file management.
+
+A trace is a columnar, chunked archive of rows, i.e. a ZIP archive (the same container of NPZ files) where every chunk
+of every column is stored as a separate NPY member, named '<column>/<chunk>.npy'.
+Members are either compressed (DEFLATE) or stored, and stored members are memory-mapped on read.
+"""
+
+import struct
+import zipfile
+
+import numpy as np
+
+from pydes.core.utils.file_utils import create_dir_tree
+
+# The default number of rows per chunk of a TraceWriter
+DEFAULT_CHUNK_ROWS = 65536
+
+# The default size of a chunk of all the columns of a TraceWriter (bytes)
+DEFAULT_CHUNK_BYTES = 4 * 1024 * 1024
+
+# The member listing the names of columns, in order
+COLUMNS_MEMBER = "__columns__.npy"
+
+# The layout of the ZIP local file header: signature, ..., file name length, extra field length
+_ZIP_LOCAL_HEADER = struct.Struct("<4s22sHH")
+
+
+def is_trace_file(filename):
+    """
+    Check whether a file is a trace.
+    :param filename: (string) the filename.
+    :return: (bool) True if the file is a trace; False, otherwise.
+    """
+    return filename.endswith(".npz")
+
+
+class TraceWriter:
+    """
+    A streaming trace writer, that buffers rows in memory and writes them as a chunk of every column as soon as the
+    buffer is full.
+    Rows are buffered in a preallocated array of every column, whose length is bounded by both the row budget and the
+    byte budget.
+    The interface is the same of *BufferedCSVWriter*, and the type of every column, if not given, is inferred from its
+    value in the first row.
+    """
+
+    def __init__(
+        self, filename, names, max_rows=DEFAULT_CHUNK_ROWS, compress=True, dtypes=None, max_bytes=DEFAULT_CHUNK_BYTES
+    ):
+        """
+        Create a new TraceWriter, emptying the file and writing the names of columns.
+        :param filename: (string) the filename.
+        :param names: (list(string)) the names of columns.
+        :param max_rows: (int) the maximum number of rows per chunk.
+        :param compress: (bool) if True, chunks are compressed; otherwise, they are stored and memory-mappable.
+        :param dtypes: (list(numpy.dtype)) the types of columns (Default: None, i.e. inferred from the first row).
+        :param max_bytes: (int) the maximum size of a chunk of all the columns (bytes).
+        """
+        create_dir_tree(filename)
+        self.filename = filename
+        self.names = list(names)
+        self.max_rows = max_rows
+        self.max_bytes = max_bytes
+        self._zip = zipfile.ZipFile(filename, "w", zipfile.ZIP_DEFLATED if compress else zipfile.ZIP_STORED)
+        self._columns = None  # the buffer, as an array of every column
+        self._rows = 0  # the number of buffered rows
+        self._chunks = 0
+        self._write_member(COLUMNS_MEMBER, np.array(self.names))
+        if dtypes is not None:
+            self._allocate(dtypes)
+
+    def write(self, row):
+        """
+        Write a row, flushing buffered rows if needed.
+        :param row: (list) the row.
+        :return: None
+        """
+        if self._columns is None:
+            self._allocate([np.asarray(value).dtype for value in row])
+        for column, value in zip(self._columns, row):
+            column[self._rows] = value
+        self._rows += 1
+        if self._rows == len(self._columns[0]):
+            self.flush()
+
+    def flush(self):
+        """
+        Write buffered rows onto the file, as a chunk of every column.
+        :return: None
+        """
+        if self._rows == 0:
+            return
+        for name, column in zip(self.names, self._columns):
+            self._write_member(get_chunk_member(name, self._chunks), column[: self._rows])
+        self._chunks += 1
+        self._rows = 0
+
+    def close(self):
+        """
+        Flush buffered rows and close the file.
+        :return: None
+        """
+        if self._zip.fp is not None:
+            self.flush()
+            self._zip.close()
+
+    def _allocate(self, dtypes):
+        """
+        Allocate the buffer, with as many rows as allowed by both the row budget and the byte budget.
+        :param dtypes: (list(numpy.dtype)) the types of columns.
+        :return: None
+        """
+        dtypes = [np.dtype(dtype) for dtype in dtypes]
+        row_bytes = sum(dtype.itemsize for dtype in dtypes)
+        rows = max(1, min(self.max_rows, self.max_bytes // max(1, row_bytes)))
+        self._columns = [np.empty(rows, dtype=dtype) for dtype in dtypes]
+
+    def _write_member(self, member, array):
+        """
+        Write an array as a member of the archive.
+        :param member: (string) the name of the member.
+        :param array: (numpy.ndarray) the array.
+        :return: None
+        """
+        with self._zip.open(member, "w", force_zip64=True) as f:
+            np.lib.format.write_array(f, array, allow_pickle=False)
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *args):
+        self.close()
+        return False
+
+
+class TraceReader:
+    """
+    A lazy trace reader: only the names of columns are read when the trace is opened, and columns are read on demand,
+    one chunk at a time.
+    Stored chunks are memory-mapped, while compressed chunks are decompressed in memory.
+    """
+
+    def __init__(self, filename):
+        """
+        Open a trace.
+        :param filename: (string) the filename.
+        """
+        self.filename = filename
+        self._zip = zipfile.ZipFile(filename, "r")
+        self.columns = self._read_member(COLUMNS_MEMBER).tolist()
+        self.n_chunks = sum(1 for member in self._zip.namelist() if member.startswith(self.columns[0] + "/"))
+
+    def column(self, name):
+        """
+        Read a column.
+        :param name: (string) the name of the column.
+        :return: (numpy.ndarray) the values of the column.
+        """
+        chunks = [chunk[name] for chunk in self.chunks([name])]
+        return np.concatenate(chunks) if len(chunks) > 0 else np.empty(0)
+
+    def read(self, names=None):
+        """
+        Read some columns.
+        :param names: (list(string)) the names of columns (Default: None, i.e. all the columns).
+        :return: (dict) the values of columns, by name.
+        """
+        return {name: self.column(name) for name in (names if names is not None else self.columns)}
+
+    def chunks(self, names=None):
+        """
+        Iterate over chunks of some columns.
+        :param names: (list(string)) the names of columns (Default: None, i.e. all the columns).
+        :return: (generator(dict)) the values of columns in every chunk, by name.
+        """
+        names = names if names is not None else self.columns
+        for name in names:
+            if name not in self.columns:
+                raise KeyError("Unknown column: {}".format(name))
+        for chunk in range(self.n_chunks):
+            yield {name: self._read_member(get_chunk_member(name, chunk)) for name in names}
+
+    def rows(self, names=None):
+        """
+        Iterate over rows of some columns.
+        :param names: (list(string)) the names of columns (Default: None, i.e. all the columns).
+        :return: (generator(dict)) the values of columns in every row, by name.
+        """
+        names = names if names is not None else self.columns
+        for chunk in self.chunks(names):
+            for values in zip(*(chunk[name].tolist() for name in names)):
+                yield dict(zip(names, values))
+
+    def close(self):
+        """
+        Close the file.
+        :return: None
+        """
+        self._zip.close()
+
+    def _read_member(self, member):
+        """
+        Read an array from a member of the archive, memory-mapping it if stored.
+        :param member: (string) the name of the member.
+        :return: (numpy.ndarray) the array.
+        """
+        info = self._zip.getinfo(member)
+        if info.compress_type != zipfile.ZIP_STORED:
+            with self._zip.open(info) as f:
+                return np.lib.format.read_array(f, allow_pickle=False)
+
+        # The member starts after the local file header, whose extra field may differ from the central directory one
+        with open(self.filename, "rb") as f:
+            f.seek(info.header_offset)
+            _, _, name_length, extra_length = _ZIP_LOCAL_HEADER.unpack(f.read(_ZIP_LOCAL_HEADER.size))
+            f.seek(name_length + extra_length, 1)
+            if np.lib.format.read_magic(f) == (1, 0):
+                shape, fortran_order, dtype = np.lib.format.read_array_header_1_0(f)
+            else:
+                shape, fortran_order, dtype = np.lib.format.read_array_header_2_0(f)
+            offset = f.tell()
+        if 0 in shape:
+            return np.empty(shape, dtype=dtype)
+        return np.memmap(
+            self.filename, dtype=dtype, mode="r", offset=offset, shape=shape, order="F" if fortran_order else "C"
+        )
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *args):
+        self.close()
+        return False
+
+
+def get_chunk_member(name, chunk):
+    """
+    Return the name of the member storing a chunk of a column.
+    :param name: (string) the name of the column.
+    :param chunk: (int) the index of the chunk.
+    :return: (string) the name of the member.
+    """
+    return "{}/{:06d}.npy".format(name, chunk)
@@ -1,12 +1,15 @@
 """
 ANALYTICAL SOLUTION: Solves the analytical model leveraging Markov Chains.
+If a cache directory is given, solutions of identical configurations are retrieved from the cache, instead of solved.
 """
 
 import logging
 import os
+from copy import deepcopy
 
 from pydes.core.analytical.analytical_solver import AnalyticalSolver
-from pydes.core.simulation.model.config import load_configuration
+from pydes.core.simulation.model.config import load_configuration, normalize
+from pydes.core.utils.cache import DEFAULT_CACHE_SIZE, ResultCache
 from pydes.core.utils.dictutils import merge
 
 # Logging
@@ -16,20 +19,47 @@ logger = logging.getLogger(__name__)
 DEFAULT_CONFIG_PATH = "analytical_solution.yaml"
 DEFAULT_OUTDIR = "out/analytical_solution"
 DEFAULT_PARAMETERS = {}
+DEFAULT_CACHE_DIR = None  # if None, solutions are not cached
 
+# The mode of the experiment, used as part of the cache key
+CACHE_MODE = "ANALYTICAL_SOLUTION"
 
-def run(config_path=DEFAULT_CONFIG_PATH, outdir=DEFAULT_OUTDIR, parameters=DEFAULT_PARAMETERS):
+
+def run(
+    config_path=DEFAULT_CONFIG_PATH,
+    outdir=DEFAULT_OUTDIR,
+    parameters=DEFAULT_PARAMETERS,
+    cache_dir=DEFAULT_CACHE_DIR,
+    cache_size=DEFAULT_CACHE_SIZE,
+):
     """
     Execute the experiment.
     :param config_path: (string) the path of the configuration file.
     :param outdir: (string) the path of output directory.
     :param parameters: (dict) parameters to overwrite.
-    :return: None
+    :param cache_dir: (string) the path of the cache directory; if None, solutions are not cached.
+    :param cache_size: (int) the maximum size of the cache (bytes).
+    :return: (SimpleReport) the analytical solution report.
     """
 
     # Load configuration
     config = merge(load_configuration(config_path, norm=False), parameters)
 
+    # Retrieve the solution from cache, if present
+    cache = ResultCache(cache_dir, cache_size) if cache_dir is not None else None
+    if cache is not None:
+        # Solutions are keyed by the normalized configuration, e.g. rates and means are equivalent, while the solver
+        # takes the configuration as loaded
+        normalized = deepcopy(config)
+        normalize(normalized)
+        key = cache.key(normalized, CACHE_MODE)
+        cached = cache.get(key)
+        if cached is not None:
+            logger.info("Retrieved analytical solution from cache ({}) with configuration:\n{}".format(key, config))
+            report, markov_chain = cached
+            save_solution(report, markov_chain, outdir)
+            return report
+
     logger.info("Launching analytical solver with configuration:\n{}".format(config))
 
     solver = AnalyticalSolver(config)
@@ -37,12 +67,27 @@ def run(config_path=DEFAULT_CONFIG_PATH, outdir=DEFAULT_OUTDIR, parameters=DEFAU
     solver.solve()
 
     report = solver.generate_report()
+    if cache is not None:
+        # The Markov chain is cached along with the report, to regenerate its artifacts on cache hits
+        cache.put(key, (report, solver.markov_chain))
+
+    save_solution(report, solver.markov_chain, outdir)
+
+    return report
 
+
+def save_solution(report, markov_chain, outdir):
+    """
+    Print and save the analytical solution, i.e. the report and the Markov chain.
+    :param report: (SimpleReport) the analytical solution report.
+    :param markov_chain: (MarkovChain) the solved Markov chain.
+    :param outdir: (string) the path of output directory.
+    :return: None
+    """
     print(report)
     report.save_txt(os.path.join(outdir, "result.txt"), append=True, empty=True)
     report.save_csv(os.path.join(outdir, "result.csv"), append=True, empty=True)
 
-    markov_chain = solver.markov_chain
     print("Markov Chain / Transition Matrix\n\n{}".format(markov_chain.matrixs()))
     markov_chain.render_graph(os.path.join(outdir, "MarkovChain"))
 
@@ -0,0 +1,95 @@
+"""
+EXPERIMENT
+
+Compare the event list engines as the number of pending events grows.
+Input: the numbers of pending events, the number of hold operations and the calendar engines to compare.
+Output: the average time (us) of a hold operation (retrieve the next event, schedule a new one) for every engine and
+number of pending events.
+
+Notes: the benchmark implements the classic "hold model": the calendar is filled with the given number of events,
+then each hold retrieves the next event and schedules a new one, exponentially distributed after the clock, so that
+the number of pending events stays constant.
+Results are stored in folder 'out/benchmark/calendar'.
+"""
+
+import random
+from os import path
+from time import perf_counter
+
+from pydes.core.simulation.model.calendar import CalendarEngine
+from pydes.core.simulation.model.event import EventType, SimpleEvent
+from pydes.core.utils.csv_utils import save_csv
+from pydes.core.utils.logutils import get_logger
+from pydes.core.utils.report import SimpleReport
+
+# Logging
+logger = get_logger(__name__)
+
+# Defaults
+DEFAULT_EVENTS = (10, 100, 1000, 10000, 100000)
+DEFAULT_HOLDS = 100000
+DEFAULT_ENGINES = tuple(engine.name for engine in CalendarEngine)
+DEFAULT_SEED = 123456789
+DEFAULT_OUTDIR = "out/benchmark/calendar"
+
+
+def hold(engine, events, holds, seed=DEFAULT_SEED):
+    """
+    Measure the average time of a hold operation for the given engine and number of pending events.
+    :param engine: (CalendarEngine) the calendar engine.
+    :param events: (int) the number of pending events.
+    :param holds: (int) the number of hold operations.
+    :param seed: (int) the seed for the event times, so that all engines process the same events.
+    :return: (float) the average time (us) of a hold operation.
+    """
+    rnd = random.Random(seed)
+    increments = [rnd.expovariate(1.0) for _ in range(holds)]
+
+    calendar = engine.calendar(t_clock=0.0)
+    calendar.schedule(*[SimpleEvent(EventType.COMPLETION_CLOUD_TASK_1, rnd.expovariate(1.0)) for _ in range(events)])
+
+    t_start = perf_counter()
+    for increment in increments:
+        e = calendar.get_next_event()
+        calendar.schedule(SimpleEvent(EventType.COMPLETION_CLOUD_TASK_1, e.time + increment))
+    t_stop = perf_counter()
+
+    return (t_stop - t_start) / holds * 1e6
+
+
+def run(events=DEFAULT_EVENTS, holds=DEFAULT_HOLDS, engines=DEFAULT_ENGINES, outdir=DEFAULT_OUTDIR):
+    """
+    Compare the calendar engines as the number of pending events grows.
+    :param events: (list(int)) the numbers of pending events.
+    :param holds: (int) the number of hold operations for each measure.
+    :param engines: (list(str)) the names of the calendar engines to compare.
+    :param outdir: (str) path to the output directory.
+    """
+    engines = [CalendarEngine[name] for name in engines]
+
+    filename = path.join(outdir, "calendar")
+
+    data = []
+    for n in events:
+        row = [n]
+        for engine in engines:
+            logger.info("Measuring engine {} with {} pending events".format(engine.name, n))
+            row.append(hold(engine, n, holds))
+        data.append(row)
+
+    save_csv(filename + ".csv", ["events"] + ["{}_us".format(engine.name) for engine in engines], data, empty=True)
+
+    # Report
+    r = SimpleReport("CALENDAR BENCHMARK")
+    r.add("General", "Holds", holds)
+    r.add("General", "Engines", ", ".join(engine.name for engine in engines))
+    for row in data:
+        for engine, t in zip(engines, row[1:]):
+            r.add("Result (us/hold)", "{} with {} events".format(engine.name, row[0]), t)
+    r.save_txt(filename + ".txt")
+
+    print(r)
+
+
+if __name__ == "__main__":
+    run(DEFAULT_EVENTS, DEFAULT_HOLDS, DEFAULT_ENGINES)
@@ -0,0 +1,133 @@
+"""
+EXPERIMENT
+
+Compare the throughput and memory footprint of event implementations.
+Input: the number of pending events, the number of hold operations and the event implementations to compare.
+Output: the number of events processed per second and the peak resident set size (RSS) for every implementation.
+
+Notes: the benchmark implements the "hold model" on the binary-heap calendar: the calendar is filled with the given
+number of completions, then each hold retrieves the next completion, reads its metadata and schedules a new one.
+The LEGACY implementation reproduces the former event layout (attribute dictionary and SimpleNamespace metadata),
+SLOTTED is the current *SimpleEvent* and RECYCLED is the current *SimpleEvent* with free-list reuse.
+Every implementation is measured in a fresh process, so that peak RSS values are not affected by each other.
+Results are stored in folder 'out/benchmark/events'.
+"""
+
+import random
+import resource
+from multiprocessing import get_context
+from os import path
+from time import perf_counter
+from types import SimpleNamespace
+
+from pydes.core.simulation.model.calendar import NextEventCalendar
+from pydes.core.simulation.model.event import EventType, SimpleEvent
+from pydes.core.utils.csv_utils import save_csv
+from pydes.core.utils.logutils import get_logger
+from pydes.core.utils.report import SimpleReport
+
+# Logging
+logger = get_logger(__name__)
+
+# Defaults
+DEFAULT_EVENTS = 100000
+DEFAULT_HOLDS = 1000000
+DEFAULT_IMPLEMENTATIONS = ("LEGACY", "SLOTTED", "RECYCLED")
+DEFAULT_SEED = 123456789
+DEFAULT_OUTDIR = "out/benchmark/events"
+
+
+class LegacyEvent:
+    """
+    The former event layout, with an attribute dictionary and SimpleNamespace metadata.
+    """
+
+    def __init__(self, type, time, **kwargs):
+        self.type = type
+        self.time = time
+        self.meta = SimpleNamespace(**kwargs)
+        self.handle = None
+
+    @classmethod
+    def create(cls, type, time, t_arrival=None, switched=False):
+        return (
+            cls(type, time, t_arrival=t_arrival, switched=switched)
+            if switched
+            else cls(type, time, t_arrival=t_arrival)
+        )
+
+    @property
+    def switched(self):
+        return self.meta.switched if "switched" in self.meta.__dict__ else False
+
+    def release(self):
+        pass
+
+
+def hold(implementation, events, holds, seed=DEFAULT_SEED):
+    """
+    Measure the throughput and the peak RSS of the hold model for the given event implementation.
+    :param implementation: (str) the event implementation (LEGACY, SLOTTED, RECYCLED).
+    :param events: (int) the number of pending events.
+    :param holds: (int) the number of hold operations.
+    :param seed: (int) the seed for the event times, so that all implementations process the same events.
+    :return: (float, int) the number of events processed per second and the peak RSS (KiB).
+    """
+    event_class = LegacyEvent if implementation == "LEGACY" else SimpleEvent
+    recycle = implementation == "RECYCLED"
+    completion = EventType.COMPLETION_CLOUD_TASK_2
+
+    rnd = random.Random(seed)
+    increments = [rnd.expovariate(1.0) for _ in range(holds)]
+
+    calendar = NextEventCalendar(t_clock=0.0)
+    calendar.schedule(
+        *[event_class.create(completion, rnd.expovariate(1.0), t_arrival=0.0, switched=True) for _ in range(events)]
+    )
+
+    t_start = perf_counter()
+    for increment in increments:
+        e = calendar.get_next_event()
+        t_completion = e.time + increment
+        switched = not e.switched
+        calendar.schedule(event_class.create(completion, t_completion, t_arrival=e.time, switched=switched))
+        if recycle:
+            e.release()
+    t_stop = perf_counter()
+
+    return holds / (t_stop - t_start), resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+
+
+def run(events=DEFAULT_EVENTS, holds=DEFAULT_HOLDS, implementations=DEFAULT_IMPLEMENTATIONS, outdir=DEFAULT_OUTDIR):
+    """
+    Compare the event implementations.
+    :param events: (int) the number of pending events.
+    :param holds: (int) the number of hold operations.
+    :param implementations: (list(str)) the event implementations to compare (LEGACY, SLOTTED, RECYCLED).
+    :param outdir: (str) path to the output directory.
+    """
+    filename = path.join(outdir, "events")
+
+    data = []
+    with get_context("spawn").Pool(processes=1, maxtasksperchild=1) as pool:
+        for implementation in implementations:
+            logger.info("Measuring implementation {} with {} pending events".format(implementation, events))
+            throughput, rss = pool.apply(hold, (implementation, events, holds))
+            data.append((implementation, throughput, rss))
+
+    save_csv(filename + ".csv", ["implementation", "events_per_sec", "peak_rss_kib"], data, empty=True)
+
+    # Report
+    r = SimpleReport("EVENTS BENCHMARK")
+    r.add("General", "Events", events)
+    r.add("General", "Holds", holds)
+    for implementation, throughput, rss in data:
+        r.add("Result", "{} events/sec".format(implementation), throughput)
+        r.add("Result", "{} peak RSS (KiB)".format(implementation), rss)
+    r.save_txt(filename + ".txt")
+
+    print(r)
+
+
+if __name__ == "__main__":
+    run(DEFAULT_EVENTS, DEFAULT_HOLDS, DEFAULT_IMPLEMENTATIONS)
@@ -0,0 +1,92 @@
+"""
+EXPERIMENT
+
+Compare the throughput of scalar and block generation of pseudo-random numbers.
+Input: the amount of pseudo-random numbers and the block sizes to compare.
+Output: the number of pseudo-random numbers generated per second by *rnd* and by *rnd_block* with every block size.
+
+Notes: both paths generate the same sequence, from the same stream; the benchmark checks that it is the case.
+Results are stored in folder 'out/benchmark/rnd'.
+"""
+
+from os import path
+from time import perf_counter
+
+import numpy as np
+
+from pydes.core.rnd.rndgen import MarcianiMultiStream
+from pydes.core.utils.csv_utils import save_csv
+from pydes.core.utils.logutils import get_logger
+from pydes.core.utils.report import SimpleReport
+
+# Logging
+logger = get_logger(__name__)
+
+# Defaults
+DEFAULT_SAMSIZE = 1000000
+DEFAULT_BLOCKS = (1, 16, 256, 4096, 65536)
+DEFAULT_OUTDIR = "out/benchmark/rnd"
+
+
+def scalar(generator, samsize):
+    """
+    Generate pseudo-random numbers one by one.
+    :param generator: (MarcianiMultiStream) the generator.
+    :param samsize: (int) the amount of pseudo-random numbers.
+    :return: (numpy.ndarray, float) the pseudo-random numbers and the throughput (numbers/s).
+    """
+    t_start = perf_counter()
+    u = [generator.rnd() for _ in range(samsize)]
+    t_stop = perf_counter()
+    return np.array(u), samsize / (t_stop - t_start)
+
+
+def block(generator, samsize, size):
+    """
+    Generate pseudo-random numbers block by block.
+    :param generator: (MarcianiMultiStream) the generator.
+    :param samsize: (int) the amount of pseudo-random numbers.
+    :param size: (int) the block size.
+    :return: (numpy.ndarray, float) the pseudo-random numbers and the throughput (numbers/s).
+    """
+    t_start = perf_counter()
+    u = [generator.rnd_block(min(size, samsize - i)) for i in range(0, samsize, size)]
+    t_stop = perf_counter()
+    return np.concatenate(u), samsize / (t_stop - t_start)
+
+
+def run(samsize=DEFAULT_SAMSIZE, blocks=DEFAULT_BLOCKS, outdir=DEFAULT_OUTDIR):
+    """
+    Compare scalar and block generation.
+    :param samsize: (int) the amount of pseudo-random numbers.
+    :param blocks: (list(int)) the block sizes.
+    :param outdir: (str) path to the output directory.
+    """
+    filename = path.join(outdir, "rnd")
+
+    logger.info("Measuring scalar generation of {} numbers".format(samsize))
+    expected, throughput = scalar(MarcianiMultiStream(), samsize)
+    data = [("rnd", 1, throughput, 1.0)]
+
+    for size in blocks:
+        logger.info("Measuring block generation of {} numbers with block size {}".format(samsize, size))
+        u, t = block(MarcianiMultiStream(), samsize, size)
+        if u.tobytes() != expected.tobytes():
+            raise RuntimeError("Block generation with block size {} differs from scalar generation".format(size))
+        data.append(("rnd_block", size, t, t / throughput))
+
+    save_csv(filename + ".csv", ["method", "block", "numbers_per_sec", "speedup"], data, empty=True)
+
+    # Report
+    r = SimpleReport("RND BENCHMARK")
+    r.add("General", "Sample Size", samsize)
+    for method, size, t, speedup in data:
+        r.add("Result (numbers/s)", "{} (block {})".format(method, size), t)
+        r.add("Result (speedup)", "{} (block {})".format(method, size), speedup)
+    r.save_txt(filename + ".txt")
+
+    print(r)
+
+
+if __name__ == "__main__":
+    run(DEFAULT_SAMSIZE, DEFAULT_BLOCKS)
@@ -1,6 +1,7 @@
 """
 PERFORMANCE ANALYSIS: Evaluate the system performance, according to settings in 'config.yaml'
 Results are stored in 'result.csv' and can be visualized running the Matlab script 'result.m'
+If a cache directory is given, results of identical configurations are retrieved from the cache, instead of simulated.
 """
 
 import logging
@@ -8,6 +9,7 @@ import os
 
 from pydes.core.simulation.model.config import load_configuration
 from pydes.core.simulation.simulation import Simulation as Simulation
+from pydes.core.utils.cache import DEFAULT_CACHE_SIZE, ResultCache
 from pydes.core.utils.dictutils import merge
 
 # Logging
@@ -17,28 +19,62 @@ logger = logging.getLogger(__name__)
 DEFAULT_CONFIG_PATH = "performance_analysis.yaml"
 DEFAULT_OUTDIR = "out/performance_analysis"
 DEFAULT_PARAMETERS = {}
+DEFAULT_CACHE_DIR = None  # if None, results are not cached
 
 
-def run(config_path=DEFAULT_CONFIG_PATH, outdir=DEFAULT_OUTDIR, parameters=DEFAULT_PARAMETERS):
+def run(
+    config_path=DEFAULT_CONFIG_PATH,
+    outdir=DEFAULT_OUTDIR,
+    parameters=DEFAULT_PARAMETERS,
+    cache_dir=DEFAULT_CACHE_DIR,
+    cache_size=DEFAULT_CACHE_SIZE,
+):
     """
     Execute the experiment.
     :param config_path: (string) the path of the configuration file.
     :param outdir: (string) the path of the output directory.
     :param parameters: (dict) parameters to overwrite.
-    :return: None
+    :param cache_dir: (string) the path of the cache directory; if None, results are not cached.
+    :param cache_size: (int) the maximum size of the cache (bytes).
+    :return: (SimpleReport) the simulation report.
     """
 
     config = merge(load_configuration(config_path), parameters)
 
-    logger.info("Launching performance analysis with configuration:\n{}".format(config))
+    return simulate(config, outdir, cache=ResultCache(cache_dir, cache_size) if cache_dir is not None else None)
+
+
+def simulate(config, outdir=DEFAULT_OUTDIR, show_progress=True, cache=None):
+    """
+    Execute the experiment on a loaded configuration.
+    :param config: (dict) the normalized configuration.
+    :param outdir: (string) the path of the output directory.
+    :param show_progress: (bool) if True, print the simulation real time progress bar.
+    :param cache: (ResultCache) the cache of results, if any.
+    :return: (SimpleReport) the simulation report.
+    """
+
+    key = None
+    report = None
+    if cache is not None:
+        key = cache.key(config, config["general"]["mode"], config["general"]["random"]["seed"])
+        report = cache.get(key)
+
+    if report is None:
+        logger.info("Launching performance analysis with configuration:\n{}".format(config))
+        simulation = Simulation(config)
+        simulation.run(outdir=outdir, show_progress=show_progress)
+        report = simulation.generate_report()
+        if cache is not None:
+            cache.put(key, report)
+    else:
+        logger.info("Retrieved performance analysis from cache ({}) with configuration:\n{}".format(key, config))
 
-    simulation = Simulation(config)
-    simulation.run(outdir=outdir, show_progress=True)
     reportfilecsv = os.path.join(outdir, "result.csv")
     reportfiletxt = os.path.join(outdir, "result.txt")
-    report = simulation.generate_report()
     report.save_txt(reportfiletxt, append=False, empty=True)
     report.save_csv(reportfilecsv, append=False, empty=True)
+    return report
 
 
 if __name__ == "__main__":
@@ -0,0 +1,158 @@
+"""
+PARAMETER SWEEP: Evaluate the system performance over a grid of parameters, according to settings in 'config.yaml'
+The grid maps parameters, as dotted paths in the configuration, to their values, e.g.
+{"system.cloudlet.threshold": [5, 20], "system.cloudlet.n_servers": [20, 40]}, and points are the cartesian product.
+Points are executed on a pool of worker processes, and points already executed (i.e. with a 'result.csv') are skipped.
+Results of every point are stored in folder 'out/sweep/<point>', and are consolidated in 'out/sweep/result.csv'.
+If a cache directory is given, results of points already executed in other sweeps are retrieved from the cache.
+"""
+
+import hashlib
+import logging
+import os
+import re
+from concurrent.futures import ProcessPoolExecutor
+from copy import deepcopy
+from itertools import product
+
+from pydes.core.simulation.model.config import load_configuration, normalize
+from pydes.core.utils.cache import DEFAULT_CACHE_SIZE, ResultCache
+from pydes.core.utils.csv_utils import read_csv, save_csv
+from pydes.core.utils.dictutils import merge
+from pydes.exp.simulation import performance_analysis
+
+# Logging
+logger = logging.getLogger(__name__)
+
+# Defaults
+DEFAULT_CONFIG_PATH = "performance_analysis.yaml"
+DEFAULT_OUTDIR = "out/sweep"
+DEFAULT_GRID = {}
+DEFAULT_PARAMETERS = {}
+DEFAULT_WORKERS = 1
+DEFAULT_CACHE_DIR = None  # if None, results are not cached
+
+# The characters replaced in names of points, i.e. all but the ones safe in a file name
+_UNSAFE_CHARS = re.compile(r"[^A-Za-z0-9._-]")
+
+
+def run(
+    config_path=DEFAULT_CONFIG_PATH,
+    outdir=DEFAULT_OUTDIR,
+    grid=DEFAULT_GRID,
+    parameters=DEFAULT_PARAMETERS,
+    workers=DEFAULT_WORKERS,
+    cache_dir=DEFAULT_CACHE_DIR,
+    cache_size=DEFAULT_CACHE_SIZE,
+):
+    """
+    Execute the experiment.
+    :param config_path: (string) the path of the configuration file.
+    :param outdir: (string) the path of the output directory.
+    :param grid: (dict) the values of every swept parameter, by dotted path in the configuration.
+    :param parameters: (dict) parameters to overwrite, for every point.
+    :param workers: (int) the number of parallel workers.
+    :param cache_dir: (string) the path of the cache directory, shared by workers; if None, results are not cached.
+    :param cache_size: (int) the maximum size of the cache (bytes).
+    :return: (list(dict)) the consolidated results, by point.
+    """
+    config = merge(load_configuration(config_path, norm=False), parameters)
+
+    points = get_points(grid)
+    outdirs = [os.path.join(outdir, get_point_name(point)) for point in points]
+    pending = [
+        (point, outdir_point)
+        for point, outdir_point in zip(points, outdirs)
+        if not os.path.isfile(os.path.join(outdir_point, "result.csv"))
+    ]
+
+    logger.info(
+        "Launching sweep of {} points ({} already executed) on {} workers".format(
+            len(points), len(points) - len(pending), workers
+        )
+    )
+    configs = [get_point_configuration(config, point) for point, _ in pending]
+    outdirs_pending = [outdir_point for _, outdir_point in pending]
+    caches = [ResultCache(cache_dir, cache_size) if cache_dir is not None else None] * len(pending)
+    if workers > 1:
+        with ProcessPoolExecutor(max_workers=workers) as executor:
+            list(executor.map(run_point, configs, outdirs_pending, caches))
+    else:
+        list(map(run_point, configs, outdirs_pending, caches))
+
+    results = []
+    for point, outdir_point in zip(points, outdirs):
+        result = dict(point)
+        result.update(read_csv(os.path.join(outdir_point, "result.csv"))[0])
+        results.append(result)
+
+    header = []
+    for result in results:
+        header.extend(name for name in result if name not in header)
+    data = [[result.get(name, "") for name in header] for result in results]
+    save_csv(os.path.join(outdir, "result.csv"), header, data, append=False, empty=True)
+
+    return results
+
+
+def get_points(grid):
+    """
+    Return the points of the grid, i.e. the cartesian product of the values of every parameter.
+    :param grid: (dict) the values of every swept parameter, by dotted path in the configuration.
+    :return: (list(dict)) the points, each one mapping parameters to values.
+    """
+    return [dict(zip(grid.keys(), values)) for values in product(*grid.values())]
+
+
+def get_point_name(point):
+    """
+    Return the name of a point, used as the name of its output directory.
+    Characters that are not safe in a file name (e.g. separators and spaces) are replaced, and the name is suffixed by
+    the digest of the original one, so that names of distinct points are still distinct.
+    :param point: (dict) the point.
+    :return: (string) the name of the point.
+    """
+    name = "__".join("{}-{}".format(param, value) for param, value in point.items()) or "default"
+    slug = _UNSAFE_CHARS.sub("_", name)
+    if slug != name:
+        slug += "__" + hashlib.sha256(name.encode()).hexdigest()[:8]
+    return slug
+
+
+def get_point_configuration(config, point):
+    """
+    Return the normalized configuration of a point.
+    :param config: (dict) the base configuration, not normalized.
+    :param point: (dict) the point.
+    :return: (dict) the normalized configuration of the point.
+    """
+    config = deepcopy(config)
+    for param, value in point.items():
+        nested = value
+        for key in reversed(param.split(".")):
+            nested = {key: nested}
+        merge(config, nested)
+    normalize(config)
+    return config
+
+
+def run_point(config, outdir, cache=None):
+    """
+    Execute a single point.
+    :param config: (dict) the normalized configuration of the point.
+    :param outdir: (string) the path of the output directory of the point.
+    :param cache: (ResultCache) the cache of results, if any.
+    :return: None
+    """
+    performance_analysis.simulate(config, outdir, show_progress=False, cache=cache)
+    logger.info("Completed point {}".format(outdir))
+
+
+if __name__ == "__main__":
+    config_path = DEFAULT_CONFIG_PATH
+    outdir = DEFAULT_OUTDIR
+    grid = DEFAULT_GRID
+    parameters = DEFAULT_PARAMETERS
+    workers = DEFAULT_WORKERS
+
+    run(config_path, outdir, grid, parameters, workers)
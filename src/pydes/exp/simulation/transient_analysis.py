@@ -1,13 +1,24 @@
 """
 TRANSIENT ANALYSIS: Evaluate the system transient phase, according to settings in 'config.yaml'
 Results are stored in 'result.csv' and can be visualized running the Matlab script 'pmcsn.mlx'
+Replications can be executed in parallel: in this case, their starting seeds are precomputed by jump-ahead, so that
+every replication draws from non-overlapping substreams, and the replication reports are merged into ensemble
+statistics ('result.ensemble.txt' and 'result.ensemble.csv'), that do not depend on the number of workers.
+In both cases, the samples of replications are aligned on a common time grid (every 't_sample' seconds) and streamed
+into the ensemble mean and confidence band of every performance metric ('result.ensemble.sampling.csv').
 """
 
 import logging
+import os
+from concurrent.futures import ProcessPoolExecutor
+from copy import deepcopy
 
+from pydes.core.metrics.accumulator import WelfordAccumulator
+from pydes.core.metrics.ensemble import EnsembleMetrics, get_time_grid
 from pydes.core.simulation.model.config import load_configuration
 from pydes.core.simulation.simulation import Simulation as Simulation
 from pydes.core.utils.dictutils import merge
+from pydes.core.utils.report import SimpleReport
 
 # Logging
 logger = logging.getLogger(__name__)
@@ -16,14 +27,17 @@ logger = logging.getLogger(__name__)
 DEFAULT_CONFIG_PATH = "transient_analysis.yaml"
 DEFAULT_OUTDIR = "out/transient_analysis"
 DEFAULT_PARAMETERS = {}
+DEFAULT_WORKERS = None  # if None, replications are executed sequentially, each one seeded by the previous one
+DEFAULT_GRID_POINTS = 100  # the number of grid intervals, if the sampling interval 't_sample' is not configured
 
 
-def run(config_path=DEFAULT_CONFIG_PATH, outdir=DEFAULT_OUTDIR, parameters=DEFAULT_PARAMETERS):
+def run(config_path=DEFAULT_CONFIG_PATH, outdir=DEFAULT_OUTDIR, parameters=DEFAULT_PARAMETERS, workers=DEFAULT_WORKERS):
     """
     Execute the experiment.
     :param config_path: (string) the path of the configuration file.
     :param outdir: (string) the path of the output directory.
     :param parameters: (dict) parameters to overwrite.
+    :param workers: (int) the number of parallel workers; if None, replications are executed sequentially.
     :return: None
     """
 
@@ -31,8 +45,13 @@ def run(config_path=DEFAULT_CONFIG_PATH, outdir=DEFAULT_OUTDIR, parameters=DEFAU
 
     logger.info("Launching transient analysis with configuration:\n{}".format(config))
 
+    if workers is not None:
+        run_parallel(config, outdir, workers)
+        return
+
     replications = config["general"]["replications"]
     seed = config["general"]["random"]["seed"]
+    ensemble = get_ensemble_metrics(config)
 
     for replication in range(0, replications):
         config["general"]["random"]["seed"] = seed
@@ -40,12 +59,130 @@ def run(config_path=DEFAULT_CONFIG_PATH, outdir=DEFAULT_OUTDIR, parameters=DEFAU
         logger.info("Launching replication {}/{} with seed {}".format(replication + 1, replications, seed))
         simulation = Simulation(config, "SIMULATION-TRANSIENT-ANALYSIS")
         simulation.run(outdir=outdir_replica, show_progress=True)
+        ensemble.add_replication(simulation.sampling_file)
         seed = simulation.rndgen.get_seed()
 
+    ensemble.save_csv(os.path.join(outdir, "result.ensemble.sampling.csv"), 1.0 - config["general"]["confidence"])
+
+
+def run_parallel(config, outdir, workers):
+    """
+    Execute the replications on a pool of worker processes, and merge their reports into ensemble statistics.
+    :param config: (dict) the normalized configuration.
+    :param outdir: (string) the path of the output directory.
+    :param workers: (int) the number of parallel workers.
+    :return: (SimpleReport) the ensemble report.
+    """
+    replications = config["general"]["replications"]
+    seeds = get_replication_seeds(config, replications)
+
+    logger.info("Launching {} replications on {} workers with seeds {}".format(replications, workers, seeds))
+    configs = [config] * replications
+    outdirs = ["{}/seed_{}".format(outdir, seed) for seed in seeds]
+    ensemble = get_ensemble_metrics(config)
+    reports = []
+    with ProcessPoolExecutor(max_workers=workers) if workers > 1 else _InProcessExecutor() as executor:
+        # Results are retrieved in replication order, as soon as available
+        for outdir_replica, report in zip(outdirs, executor.map(run_replication, configs, seeds, outdirs)):
+            ensemble.add_replication(config["general"]["sampling_format"].filename(outdir_replica))
+            reports.append(report)
+
+    alpha = 1.0 - config["general"]["confidence"]
+    ensemble.save_csv(os.path.join(outdir, "result.ensemble.sampling.csv"), alpha)
+    report = merge_reports(reports, seeds, alpha)
+    report.save_txt(os.path.join(outdir, "result.ensemble.txt"), append=False, empty=True)
+    report.save_csv(os.path.join(outdir, "result.ensemble.csv"), append=False, empty=True)
+    return report
+
+
+def get_ensemble_metrics(config):
+    """
+    Create the ensemble statistics of replications, on the time grid of the given configuration.
+    :param config: (dict) the normalized configuration.
+    :return: (EnsembleMetrics) the ensemble statistics.
+    """
+    t_stop = config["general"]["t_stop"]
+    t_sample = config["general"].get("t_sample", t_stop / DEFAULT_GRID_POINTS)
+    return EnsembleMetrics(get_time_grid(t_stop, t_sample))
+
+
+def get_replication_seeds(config, replications):
+    """
+    Compute the starting seeds of replications, by jumping ahead the generator of the given configuration.
+    Every replication draws from substreams of jump_size/replications numbers, that do not overlap as long as
+    no replication draws more numbers from any stream (see *MarcianiMultiStream.spawn*).
+    The generator is taken once its streams are allocated to the simulation components, as the allocation may expand
+    it, i.e. change its jump size (see *StreamAllocator*), the same way in every replication.
+    :param config: (dict) the normalized configuration.
+    :param replications: (int) the number of replications.
+    :return: (list(int)) the starting seeds, by replication.
+    """
+    generator = Simulation(deepcopy(config), "SIMULATION-TRANSIENT-ANALYSIS").rndgen
+    return [spawned.get_initial_seed() for spawned in generator.spawn(replications)]
+
+
+def run_replication(config, seed, outdir):
+    """
+    Execute a single replication.
+    :param config: (dict) the normalized configuration.
+    :param seed: (int) the starting seed.
+    :param outdir: (string) the path of the output directory of the replication.
+    :return: (SimpleReport) the report of the replication.
+    """
+    config = deepcopy(config)
+    config["general"]["random"]["seed"] = seed
+    simulation = Simulation(config, "SIMULATION-TRANSIENT-ANALYSIS")
+    simulation.run(outdir=outdir, show_progress=False)
+    logger.info("Completed replication with seed {}".format(seed))
+    return simulation.generate_report()
+
+
+def merge_reports(reports, seeds, alpha):
+    """
+    Merge the reports of replications into ensemble statistics, i.e. the mean, standard deviation and confidence
+    interval across replications of every statistic mean.
+    Reports are merged in replication order, so that ensemble statistics do not depend on the execution order.
+    :param reports: ([SimpleReport]) the reports, by replication.
+    :param seeds: ([int]) the starting seeds, by replication.
+    :param alpha: (float) the significance.
+    :return: (SimpleReport) the ensemble report.
+    """
+    accumulators = {}
+    for report in reports:
+        for param, value in report.params["statistics"]:
+            if param.endswith("_mean"):
+                accumulators.setdefault(param[: -len("_mean")], WelfordAccumulator()).add_value(value)
+
+    r = SimpleReport("TRANSIENT-ANALYSIS-ENSEMBLE")
+    r.add("general", "replications", len(reports))
+    r.add("general", "seeds", " ".join(str(seed) for seed in seeds))
+    r.add("general", "confidence", 1.0 - alpha)
+    for statistic, accumulator in accumulators.items():
+        r.add("ensemble", "{}_mean".format(statistic), accumulator.mean())
+        r.add("ensemble", "{}_sdev".format(statistic), accumulator.sdev())
+        r.add("ensemble", "{}_cint".format(statistic), accumulator.cint(alpha))
+    return r
+
+
+class _InProcessExecutor:
+    """
+    An executor that runs tasks in the current process, lazily, with the same interface of *ProcessPoolExecutor*.
+    """
+
+    def map(self, fn, *iterables):
+        return map(fn, *iterables)
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *args):
+        return False
+
 
 if __name__ == "__main__":
     config_path = DEFAULT_CONFIG_PATH
     outdir = DEFAULT_OUTDIR
     parameters = DEFAULT_PARAMETERS
+    workers = DEFAULT_WORKERS
 
-    run(config_path, outdir, parameters)
+    run(config_path, outdir, parameters, workers)
@@ -3,7 +3,7 @@ from copy import deepcopy
 from random import randint
 from statistics import mean, stdev
 
-from pydes.core.metrics.batch_means import BatchedMeasure
+from pydes.core.metrics.batch_means import BatchedMeasure, BatchedMeasureArray
 
 N_BATCH = 10
 BATCH_DIM = 100
@@ -52,3 +52,71 @@ class BatchMeansTest(unittest.TestCase):
             )
         self.assertEqual(round(expected_mean, PRECISION), round(self.metric.mean(), PRECISION))
         self.assertEqual(round(expected_sdev, PRECISION), round(self.metric.sdev(), PRECISION))
+
+    def test_merge_batches(self):
+        """
+        Verify that merging batches is equivalent to batching with double dimension.
+        :return: None
+        """
+        expected_batch_means = [
+            mean(self.samples[i : i + 2 * BATCH_DIM]) for i in range(0, len(self.samples), 2 * BATCH_DIM)
+        ]
+
+        self.metric.merge_batches()
+
+        self.assertEqual(N_BATCH // 2, self.metric.nbatch())
+        for i in range(len(expected_batch_means)):
+            self.assertEqual(
+                round(expected_batch_means[i], PRECISION), round(self.metric.get_batch_means()[i], PRECISION)
+            )
+
+    def test_autocorrelation(self):
+        """
+        Verify the lag-1 autocorrelation of batch means.
+        :return: None
+        """
+        metric = BatchedMeasure()
+        for batch_mean in [1.0, 2.0, 3.0, 4.0]:
+            metric.add_sample(batch_mean)
+            metric.register_batch()
+        # deviations: -1.5, -0.5, 0.5, 1.5
+        self.assertAlmostEqual((0.75 - 0.25 + 0.75) / 5.0, metric.autocorrelation(1))
+        self.assertEqual(0.0, BatchedMeasure().autocorrelation(1))
+
+    def test_batched_measure_array(self):
+        """
+        Verify that every cell of an array of measures, updated at once, is equivalent to a measure.
+        :return: None
+        """
+        metrics = [[BatchedMeasure() for _ in range(3)] for _ in range(2)]
+        array = BatchedMeasureArray((2, 3))
+        for i in range(N_BATCH * BATCH_DIM):
+            values = [[randint(1, 1000) for _ in range(3)] for _ in range(2)]
+            array.add_sample(values)
+            for r in range(2):
+                for c in range(3):
+                    metrics[r][c].add_sample(values[r][c])
+            if (i + 1) % BATCH_DIM == 0:
+                array.register_batch()
+                for r in range(2):
+                    for c in range(3):
+                        metrics[r][c].register_batch()
+
+        array.merge_batches()
+        for r in range(2):
+            for c in range(3):
+                metrics[r][c].merge_batches()
+                cell = array.cell((r, c))
+                self.assertEqual(metrics[r][c].get_value(), cell.get_value())
+                self.assertEqual(metrics[r][c].get_batch_means(), cell.get_batch_means())
+                self.assertEqual(metrics[r][c].nbatch(), cell.nbatch())
+                self.assertEqual(metrics[r][c].mean(), cell.mean())
+                self.assertEqual(metrics[r][c].sdev(), cell.sdev())
+                self.assertEqual(metrics[r][c].autocorrelation(1), cell.autocorrelation(1))
+
+        # Cells are views: samples and batches are managed by the array only
+        for method in ("add_sample", "register_batch", "merge_batches", "discard_data", "clear"):
+            self.assertFalse(hasattr(array.cell((0, 0)), method), method)
+
+        array.discard_data()
+        self.assertEqual(0, array.cell((0, 0)).nbatch())
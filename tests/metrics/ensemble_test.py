@@ -0,0 +1,101 @@
+import os
+import tempfile
+import unittest
+from csv import DictReader
+from statistics import mean
+
+from pydes.core.metrics.ensemble import (
+    EnsembleMetrics,
+    get_performance_metrics,
+    get_time_grid,
+)
+from pydes.core.utils.csv_utils import save_csv
+from pydes.core.utils.trace_utils import TraceWriter
+
+METRICS = ["response_system_global", "throughput_system_global"]
+REPLICATIONS = [
+    [(0.5, 1.0, 10.0), (1.5, 2.0, 20.0), (2.5, 3.0, 30.0)],
+    [(0.2, 4.0, 40.0), (2.2, 5.0, 50.0)],
+    [(1.2, 6.0, 60.0)],
+]
+
+
+class EnsembleTest(unittest.TestCase):
+    def setUp(self):
+        self.tmpdir = tempfile.TemporaryDirectory()
+        self.files = []
+        for i, samples in enumerate(REPLICATIONS):
+            filename = os.path.join(self.tmpdir.name, "replication_{}.csv".format(i))
+            save_csv(filename, ["time"] + METRICS, samples)
+            self.files.append(filename)
+
+    def tearDown(self):
+        self.tmpdir.cleanup()
+
+    def test_performance_metrics(self):
+        """
+        Verify that every performance metric is aggregated, by default.
+        :return: None
+        """
+        metrics = get_performance_metrics()
+        self.assertEqual(54, len(metrics))
+        self.assertIn("response_system_global", metrics)
+        self.assertEqual([0.0, 1.0, 2.0, 3.0], get_time_grid(3, 1.0))
+
+    def test_ensemble(self):
+        """
+        Verify that replications are aligned on the time grid by holding their last sample,
+        and that ensemble means are computed per grid point.
+        :return: None
+        """
+        ensemble = EnsembleMetrics(get_time_grid(3, 1.0), METRICS)
+        for filename in self.files:
+            ensemble.add_replication(filename)
+        self.assertEqual(3, ensemble.n_replications)
+        self._check_ensemble(ensemble)
+
+    def test_ensemble_trace(self):
+        """
+        Verify that replications stored as traces are aggregated as the ones stored as CSV.
+        :return: None
+        """
+        ensemble = EnsembleMetrics(get_time_grid(3, 1.0), METRICS)
+        for i, samples in enumerate(REPLICATIONS):
+            filename = os.path.join(self.tmpdir.name, "replication_{}.npz".format(i))
+            with TraceWriter(filename, ["time", "population_system_global"] + METRICS, max_rows=2) as writer:
+                for sample in samples:
+                    writer.write([sample[0], 0.0] + list(sample[1:]))
+            ensemble.add_replication(filename)
+        self.assertEqual(3, ensemble.n_replications)
+        self._check_ensemble(ensemble)
+
+    def _check_ensemble(self, ensemble):
+        """
+        Check the ensemble means of replications.
+        :param ensemble: (EnsembleMetrics) the ensemble statistics.
+        :return: None
+        """
+
+        expected = {
+            0.0: [],
+            1.0: [1.0, 4.0],
+            2.0: [2.0, 4.0, 6.0],
+            3.0: [3.0, 5.0, 6.0],
+        }
+        filename = os.path.join(self.tmpdir.name, "ensemble.csv")
+        ensemble.save_csv(filename, 0.05)
+        with open(filename, "r") as f:
+            rows = list(DictReader(f))
+        self.assertEqual(4, len(rows))
+        for row in rows:
+            values = expected[float(row["time"])]
+            self.assertEqual(len(values), int(row["replications"]))
+            if len(values) > 0:
+                self.assertAlmostEqual(mean(values), float(row["response_system_global_mean"]))
+                self.assertAlmostEqual(10 * mean(values), float(row["throughput_system_global_mean"]))
+                self.assertLessEqual(float(row["response_system_global_lower"]), mean(values))
+                self.assertGreaterEqual(float(row["response_system_global_upper"]), mean(values))
+
+
+if __name__ == "__main__":
+    unittest.main()
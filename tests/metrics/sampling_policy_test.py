@@ -0,0 +1,92 @@
+import unittest
+
+import numpy as np
+
+from pydes.core.metrics.sampling_policy import (
+    EveryKSampler,
+    ReservoirSampler,
+    TimeGridSampler,
+)
+
+
+class ListWriter(list):
+    def write(self, row):
+        self.append(row)
+
+
+class SamplingPolicyTest(unittest.TestCase):
+    def test_every_k(self):
+        """
+        Verify that the every-k-th-completion sampler fires every k completions, and writes every sample.
+        :return: None
+        """
+        sampler = EveryKSampler(3)
+        self.assertEqual([3, 6, 9], [n for n in range(1, 11) if sampler.fires(n)])
+        self.assertEqual([], list(sampler.grid_points(100.0)))
+        self.assertTrue(sampler.accepts())
+
+    def test_time_grid(self):
+        """
+        Verify that the time grid sampler returns every grid point passed since the last event, once.
+        :return: None
+        """
+        sampler = TimeGridSampler(0.5)
+        self.assertEqual([], list(sampler.grid_points(0.3)))
+        self.assertEqual([0.5, 1.0, 1.5], list(sampler.grid_points(1.7)))
+        self.assertEqual([], list(sampler.grid_points(1.9)))
+        self.assertEqual([2.0], list(sampler.grid_points(2.0)))
+        self.assertFalse(sampler.fires(1))
+
+    def test_reservoir(self):
+        """
+        Verify that the reservoir retains all the samples, until full, and then a fixed number of samples, written
+        sorted by time, and that every sample is retained with the same probability.
+        :return: None
+        """
+        writer = ListWriter()
+        sampler = ReservoirSampler(10, seed=123456789)
+        for i in range(5):
+            if sampler.accepts():
+                sampler.record([i], writer)
+        self.assertEqual([], writer)
+        sampler.flush(writer)
+        self.assertEqual([[i] for i in range(5)], writer)
+
+        n, size, runs = 100, 10, 2000
+        hits = [0] * n
+        for seed in range(runs):
+            writer = ListWriter()
+            sampler = ReservoirSampler(size, seed=seed)
+            for i in range(n):
+                if sampler.accepts():
+                    sampler.record([i], writer)
+            sampler.flush(writer)
+            self.assertEqual(size, len(writer))
+            self.assertEqual(sorted(writer), writer)
+            for row in writer:
+                hits[row[0]] += 1
+        expected = runs * size / n
+        for first, last in ((0, n // 2), (n // 2, n)):
+            self.assertAlmostEqual(1.0, sum(hits[first:last]) / (expected * (last - first)), delta=0.05)
+
+    def test_reservoir_types(self):
+        """
+        Verify that samples retained in the reservoir keep the types of their values, either given or inferred.
+        :return: None
+        """
+        for dtypes in (None, [np.float64, np.int64]):
+            writer = ListWriter()
+            sampler = ReservoirSampler(2, dtypes=dtypes)
+            for i in range(5):
+                if sampler.accepts():
+                    sampler.record([i + 0.5, i], writer)
+            sampler.flush(writer)
+            self.assertEqual(2, len(writer))
+            for time, completed in writer:
+                self.assertIsInstance(time, float)
+                self.assertIsInstance(completed, int)
+                self.assertEqual(time - 0.5, completed)
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -1,5 +1,6 @@
 import unittest
 
+from pydes.core.metrics.sampling import get_header
 from pydes.core.metrics.simulation_metrics import SimulationMetrics
 from pydes.core.simulation.model.scope import SystemScope, TaskScope
 
@@ -49,5 +50,121 @@ class SimulationMetricsTest(unittest.TestCase):
         self.assertEqual(expected, actual, "CSV file representation is not correct.")
 
 
+class SimulationMetricsCountersTest(unittest.TestCase):
+    def setUp(self):
+        self.simulation_metrics = SimulationMetrics(10)
+
+    def test_increment_counter(self):
+        """
+        Verify that system and global counters are kept consistent with subsystem-scoped and task-scoped counters.
+        :return: None
+        """
+        counters = self.simulation_metrics.counters
+        for value, counter in enumerate(counters.__dict__, 1):
+            for sys in SystemScope.subsystems():
+                for tsk in TaskScope.concrete():
+                    self.simulation_metrics.increment_counter(counter, sys, tsk, value)
+                    self.simulation_metrics.increment_counter(counter, sys, tsk)
+
+        for counter in counters.__dict__:
+            values = getattr(counters, counter)
+            for sys in SystemScope.subsystems():
+                self.assertEqual(
+                    sum(values[sys][tsk] for tsk in TaskScope.concrete()), values[sys][TaskScope.GLOBAL], counter
+                )
+            for tsk in TaskScope:
+                if counter == "switched":
+                    expected = values[SystemScope.CLOUDLET][tsk]
+                elif counter == "switched_completed":
+                    expected = values[SystemScope.CLOUD][tsk]
+                else:
+                    expected = sum(values[sys][tsk] for sys in SystemScope.subsystems())
+                self.assertEqual(expected, values[SystemScope.SYSTEM][tsk], counter)
+
+    def test_discard_data(self):
+        """
+        Verify that, once data are discarded at a given time, performance metrics are computed over counters
+        increments and elapsed time since then, i.e. they no longer include data collected before.
+        :return: None
+        """
+        metrics = self.simulation_metrics
+        for _ in range(10):
+            metrics.increment_counter("completed", SystemScope.CLOUDLET, TaskScope.TASK_1)
+        metrics.increment_counter("service", SystemScope.CLOUDLET, TaskScope.TASK_1, 100.0)
+        metrics.increment_counter("population_area", SystemScope.CLOUDLET, TaskScope.TASK_1, 50.0)
+        metrics.sampling(5.0)
+        response = metrics.get_measure("response_system_global")
+        throughput = metrics.get_measure("throughput_system_global")
+        population = metrics.get_measure("population_system_global")
+        self.assertEqual(10.0, response.get_value())
+
+        metrics.discard_data(5.0)
+        for _ in range(4):
+            metrics.increment_counter("completed", SystemScope.CLOUDLET, TaskScope.TASK_1)
+        metrics.increment_counter("service", SystemScope.CLOUDLET, TaskScope.TASK_1, 8.0)
+        metrics.increment_counter("population_area", SystemScope.CLOUDLET, TaskScope.TASK_1, 6.0)
+        metrics.sampling(9.0)
+        self.assertEqual(2.0, response.get_value())
+        self.assertEqual(1.0, throughput.get_value())
+        self.assertEqual(1.5, population.get_value())
+        self.assertEqual(14, metrics.counters.completed[SystemScope.SYSTEM][TaskScope.GLOBAL])
+
+        # A sample at the origin has no elapsed time
+        metrics.discard_data(9.0)
+        metrics.sampling(9.0)
+        self.assertEqual(0.0, throughput.get_value())
+        self.assertEqual(0.0, population.get_value())
+
+    def test_get_interval_metrics(self):
+        """
+        Verify that interval performance metrics are computed over counters increments and elapsed time since the
+        previous interval, i.e. they are not cumulative.
+        :return: None
+        """
+        metrics = self.simulation_metrics
+        i, sys, tsk = metrics.get_index("throughput_system_global")
+        j = metrics.get_index("response_system_global")[0]
+        for _ in range(10):
+            metrics.increment_counter("completed", SystemScope.CLOUDLET, TaskScope.TASK_1)
+        metrics.increment_counter("service", SystemScope.CLOUDLET, TaskScope.TASK_1, 100.0)
+        values = metrics.get_interval_metrics(5.0)
+        self.assertEqual(2.0, values[i, sys, tsk])
+        self.assertEqual(10.0, values[j, sys, tsk])
+
+        for _ in range(4):
+            metrics.increment_counter("completed", SystemScope.CLOUDLET, TaskScope.TASK_1)
+        metrics.increment_counter("service", SystemScope.CLOUDLET, TaskScope.TASK_1, 8.0)
+        values = metrics.get_interval_metrics(9.0)
+        self.assertEqual(1.0, values[i, sys, tsk])
+        self.assertEqual(2.0, values[j, sys, tsk])
+
+        values = metrics.get_interval_metrics(9.0)
+        self.assertEqual(0.0, values[i, sys, tsk])
+        self.assertEqual(0.0, values[j, sys, tsk])
+
+    def test_get_row(self):
+        """
+        Verify that rows serialized from the current values are the same of rows of built samples, with the same
+        types, and that they are not affected by later updates.
+        :return: None
+        """
+        for value, counter in enumerate(self.simulation_metrics.counters.__dict__, 1):
+            self.simulation_metrics.increment_counter(counter, SystemScope.CLOUDLET, TaskScope.TASK_1, value)
+            self.simulation_metrics.increment_counter(counter, SystemScope.CLOUD, TaskScope.TASK_2)
+        self.assertIsNone(self.simulation_metrics.sampling(2.0))
+
+        row = self.simulation_metrics.get_row(2.0)
+        expected = self.simulation_metrics.build_sample(2.0).get_row()
+        self.assertEqual(len(get_header()), len(row))
+        self.assertEqual(expected, row)
+        self.assertEqual([type(value) for value in expected], [type(value) for value in row])
+
+        self.simulation_metrics.increment_counter("completed", SystemScope.CLOUDLET, TaskScope.TASK_1)
+        self.simulation_metrics.sampling(4.0)
+        self.assertEqual(expected, row)
+        self.assertNotEqual(row, self.simulation_metrics.get_row(4.0))
+        self.assertEqual(self.simulation_metrics.build_sample(4.0).get_row(), self.simulation_metrics.get_row(4.0))
+
+
 if __name__ == "__main__":
     unittest.main()
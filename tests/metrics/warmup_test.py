@@ -0,0 +1,49 @@
+import unittest
+from random import Random
+
+from pydes.core.metrics.warmup import MSERWarmupDetector
+
+
+class WarmupTest(unittest.TestCase):
+    def setUp(self):
+        self.rnd = Random(123456789)
+
+    def test_warmup(self):
+        """
+        Verify that the end of a warm-up is detected, close to the end of the initial transient.
+        :return: None
+        """
+        detector = MSERWarmupDetector()
+        samples = 0
+        while not detector.add_sample(self.rnd.gauss(100.0 * max(0.0, 1.0 - samples / 200.0), 1.0)):
+            samples += 1
+        self.assertTrue(detector.detected)
+        self.assertGreaterEqual(detector.truncation, 150)
+        self.assertLessEqual(detector.truncation, 250)
+
+    def test_no_warmup(self):
+        """
+        Verify that no warm-up is detected for a stationary stream.
+        :return: None
+        """
+        detector = MSERWarmupDetector()
+        for _ in range(100):
+            detector.add_sample(self.rnd.gauss(0.0, 1.0))
+        self.assertTrue(detector.detected)
+        self.assertEqual(0, detector.truncation)
+
+    def test_truncation_point(self):
+        """
+        Verify that the truncation point is not evaluated beyond the first half of batches, so that a stream that is
+        still in its transient is not truncated.
+        :return: None
+        """
+        detector = MSERWarmupDetector(batchdim=1, min_batches=10)
+        for i in range(10):
+            self.assertFalse(detector.add_sample(float(i)))
+        self.assertEqual(5, detector.truncation_point())
+        self.assertIsNone(detector.truncation)
+
+
+if __name__ == "__main__":
+    unittest.main()
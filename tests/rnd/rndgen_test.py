@@ -1,6 +1,14 @@
 import unittest
 
-from pydes.core.rnd.rndgen import MarcianiMultiStream, MarcianiSingleStream
+import numpy as np
+
+from pydes.core.rnd.rndgen import (
+    BLOCK_SIZE,
+    BufferedMultiStream,
+    MarcianiMultiStream,
+    MarcianiSingleStream,
+)
+from pydes.core.rnd.rndstream import CollisionPolicy, StreamAllocator, format_streams
 
 
 class RndgenTest(unittest.TestCase):
@@ -44,6 +52,174 @@ class RndgenTest(unittest.TestCase):
 
         self.assertEqual(generator.get_seed(), CHECK_VALUE, "{} is not correct!".format(generator.__class__.__name__))
 
+    def test_rnd_block(self):
+        """
+        Verify that block generation matches scalar generation bit for bit, across block boundaries and streams.
+        :return: None
+        """
+        for n in [0, 1, 7, BLOCK_SIZE - 1, BLOCK_SIZE, BLOCK_SIZE + 1, 3 * BLOCK_SIZE + 5]:
+            for stream in [0, 5]:
+                scalar = MarcianiMultiStream(iseed=1)
+                block = MarcianiMultiStream(iseed=1)
+                scalar.stream(stream)
+                block.stream(stream)
+
+                expected = np.array([scalar.rnd() for _ in range(n)], dtype=np.float64)
+                actual = block.rnd_block(n)
+
+                self.assertEqual(expected.tobytes(), actual.tobytes())
+                self.assertEqual(scalar.get_seed(), block.get_seed())
+                self.assertEqual(scalar.rnd(), block.rnd())
+
+    def test_rnd_block_single_stream(self):
+        """
+        Verify the correctness of block generation: MarcianiSingleStream
+        :return: None
+        """
+        CHECK_VALUE = 399268537
+        CHECK_ITERS = 10000
+
+        generator = MarcianiSingleStream(iseed=1)
+        generator.rnd_block(CHECK_ITERS)
+
+        self.assertEqual(generator.get_seed(), CHECK_VALUE, "{} is not correct!".format(generator.__class__.__name__))
+
+    def test_rnd_buffered(self):
+        """
+        Verify that the buffered generator produces the same sequences and seeds of the unbuffered one,
+        with streams interleaved across buffer refills.
+        :return: None
+        """
+        generator = MarcianiMultiStream(iseed=1)
+        buffered = BufferedMultiStream(iseed=1, buffer=16)
+
+        for i in range(1000):
+            stream = (i * 7) % 5
+            generator.stream(stream)
+            buffered.stream(stream)
+            self.assertEqual(generator.rnd(), buffered.rnd())
+            if i % 37 == 0:
+                self.assertEqual(generator.get_seed(), buffered.get_seed())
+            if i % 101 == 0:
+                self.assertEqual(generator.rnd_block(20).tobytes(), buffered.rnd_block(20).tobytes())
+            if i % 211 == 0:
+                generator.put_seed(i + 1)
+                buffered.put_seed(i + 1)
+
+    def test_jump(self):
+        """
+        Verify that jumping ahead by k steps leaves the stream in the same state of k calls of rnd.
+        :return: None
+        """
+        generator = MarcianiMultiStream(iseed=1)
+        jumped = MarcianiMultiStream(iseed=1)
+        for stream in [0, 3]:
+            generator.stream(stream)
+            jumped.stream(stream)
+            for _ in range(10000):
+                generator.rnd()
+            jumped.jump(10000)
+            self.assertEqual(generator.get_seed(), jumped.get_seed())
+
+    def test_jumper(self):
+        """
+        Verify that jumpers computed from jump sizes match the suggested configurations,
+        and that any number of streams can be requested.
+        :return: None
+        """
+        self.assertEqual(40509, MarcianiMultiStream(jumper=None, jump_size=16775552)._jumper)
+        self.assertEqual(16775552, MarcianiMultiStream().get_jump_size())
+
+        generator = MarcianiMultiStream(streams=1024, jumper=None)
+        self.assertEqual(1024, generator.get_nstreams())
+        self.assertEqual(2147483646 // 1024, generator.get_jump_size())
+        generator.stream(1023)
+        reference = MarcianiMultiStream(streams=1024, jumper=None)
+        reference.jump(1023 * reference.get_jump_size())
+        self.assertEqual(reference.get_seed(), generator.get_seed())
+
+    def test_spawn(self):
+        """
+        Verify that spawned generators start from disjoint substreams.
+        :return: None
+        """
+        generator = MarcianiMultiStream(iseed=1)
+        generators = generator.spawn(4)
+        substream = generator.get_jump_size() // 4
+        for i, spawned in enumerate(generators):
+            for stream in [0, 7]:
+                reference = MarcianiMultiStream(iseed=1)
+                reference.stream(stream)
+                reference.jump(i * substream)
+                spawned.stream(stream)
+                self.assertEqual(reference.get_seed(), spawned.get_seed())
+
+    def test_stream_allocator(self):
+        """
+        Verify that the stream allocator hands out disjoint streams, and fails when streams are exhausted.
+        :return: None
+        """
+        allocator = StreamAllocator(MarcianiMultiStream(streams=8, jumper=None))
+        self.assertEqual([0, 1, 2], allocator.allocate("servers", 3))
+        self.assertEqual([3], allocator.allocate("arrivals"))
+        self.assertEqual([4, 5], allocator.allocate("servers", 2))
+        self.assertEqual({"servers": [0, 1, 2, 4, 5], "arrivals": [3]}, allocator.get_allocation())
+        self.assertEqual(2, allocator.free())
+        with self.assertRaises(RuntimeError):
+            allocator.allocate("cloud", 3)
+        self.assertEqual(3, len(allocator.spawn(3)))
+
+    def test_stream_collision(self):
+        """
+        Verify that stream collisions either fail fast or are resolved by allocating free streams, expanding the
+        generator when needed.
+        :return: None
+        """
+        allocator = StreamAllocator(MarcianiMultiStream(streams=8, jumper=None))
+        self.assertEqual(1, allocator.request("arrivals", 1))
+        with self.assertRaises(RuntimeError):
+            allocator.request("servers", 1)
+        with self.assertRaises(RuntimeError):
+            allocator.request("servers", 8)
+
+        generator = MarcianiMultiStream(streams=4, jumper=None)
+        allocator = StreamAllocator(generator, policy=CollisionPolicy.EXPAND)
+        self.assertEqual([1, 2], [allocator.request("arrivals", s) for s in (1, 2)])
+        self.assertEqual([3, 4, 5], [allocator.request("servers", 2 + i) for i in range(3)])
+        self.assertEqual(8, generator.get_nstreams())
+        self.assertEqual(0, allocator.request("selection", 0))
+        self.assertEqual({"arrivals": [1, 2], "servers": [3, 4, 5], "selection": [0]}, allocator.get_allocation())
+        self.assertEqual("3-5", format_streams(allocator.get_allocation()["servers"]))
+        self.assertEqual("1-3 5 7-8", format_streams([1, 2, 3, 5, 7, 8]))
+
+    def test_expand(self):
+        """
+        Verify that expanding a generator keeps its streams, when the jump size fits the new number of streams,
+        and that expanded streams are disjoint.
+        :return: None
+        """
+        generator = MarcianiMultiStream()
+        generator.expand(128)
+        self.assertEqual(128, generator.get_nstreams())
+        reference = MarcianiMultiStream()
+        for s in range(128):
+            generator.stream(s)
+            reference.stream(s)
+            self.assertEqual(reference.rnd(), generator.rnd())
+
+        generator = MarcianiMultiStream(streams=4, jumper=None)
+        generator.expand(16)
+        self.assertEqual((generator.get_modulus() - 1) // 16, generator.get_jump_size())
+        seeds = []
+        for s in range(16):
+            generator.stream(s)
+            seeds.append(generator.get_seed())
+        self.assertEqual(16, len(set(seeds)))
+        generator.stream(1)
+        generator.put_seed(seeds[0])
+        generator.jump(generator.get_jump_size())
+        self.assertEqual(seeds[1], generator.get_seed())
+
 
 if __name__ == "__main__":
     unittest.main()
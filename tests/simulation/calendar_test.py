@@ -1,7 +1,12 @@
 import unittest
 
 from pydes.core.rnd.rndgen import MarcianiMultiStream
-from pydes.core.simulation.model.calendar import NextEventCalendar
+from pydes.core.simulation.model.calendar import (
+    CalendarEngine,
+    CalendarQueueCalendar,
+    NextEventCalendar,
+    PriorityQueueCalendar,
+)
 from pydes.core.simulation.model.event import EventType
 from pydes.core.simulation.model.event import SimpleEvent as Event
 
@@ -56,7 +61,7 @@ class CalendarTest(unittest.TestCase):
         # step 2: unschedule
         for _ev in _events:
             if _ev.type is EventType.ARRIVAL_TASK_2:
-                calendar.unschedule(_ev)
+                calendar.unschedule(_ev.handle)
         _events[:] = [x for x in _events if not x.type == EventType.ARRIVAL_TASK_2]
 
         # step 3: test
@@ -67,6 +72,153 @@ class CalendarTest(unittest.TestCase):
             self.assertEqual(_events[_idx], event)
             _idx += 1
 
+    def test_engines_ordering(self):
+        """
+        Verify that all the event list engines retrieve events in the same order.
+        :return: None
+        """
+        rndgen = MarcianiMultiStream()
+
+        # Creation
+        calendars = [engine.calendar() for engine in CalendarEngine]
+
+        # step 1: schedule (with ties on occurrence time)
+        for event_type in EventType:
+            for i in range(10):
+                u = round(rndgen.rnd(), 2)
+                event = Event(event_type, u)
+                for calendar in calendars:
+                    calendar.schedule(event)
+
+        # step 2: test
+        while not calendars[0].empty():
+            expected = calendars[0].get_next_event()
+            for calendar in calendars[1:]:
+                self.assertIs(expected, calendar.get_next_event())
+        for calendar in calendars:
+            self.assertTrue(calendar.empty())
+
+    def test_scheduling_ties(self):
+        """
+        Verify that events with the same occurrence time are retrieved in scheduling order.
+        :return: None
+        """
+        for calendar in (NextEventCalendar(), PriorityQueueCalendar()):
+            _events = [Event(event_type, 1.0) for event_type in EventType]
+            calendar.schedule(*_events)
+            for _ev in _events:
+                self.assertIs(_ev, calendar.get_next_event())
+            self.assertEqual(1.0, calendar.get_clock())
+
+    def test_unscheduling_by_handle(self):
+        """
+        Verify that unscheduling removes exactly the event identified by the handle, even among equal events.
+        :return: None
+        """
+        for engine in CalendarEngine:
+            calendar = engine.calendar()
+
+            # step 1: schedule events with the same type and time
+            _events = [Event(EventType.COMPLETION_CLOUDLET_TASK_2, 1.0) for _ in range(3)]
+            handles = calendar.schedule(*_events)
+            self.assertEqual([_ev.handle for _ev in _events], handles)
+
+            # step 2: unschedule the second one (twice, the second time is a no-op)
+            calendar.unschedule(handles[1])
+            calendar.unschedule(handles[1])
+
+            # step 3: test
+            self.assertIs(_events[0], calendar.get_next_event())
+            self.assertIs(_events[2], calendar.get_next_event())
+            self.assertTrue(calendar.empty())
+            self.assertIsNone(calendar.get_next_event())
+
+            # step 4: unscheduling retrieved events is a no-op
+            calendar.unschedule(*handles)
+            self.assertTrue(calendar.empty())
+
+    def test_compaction(self):
+        """
+        Verify that dead entries are compacted, preserving the order of live events.
+        :return: None
+        """
+        rndgen = MarcianiMultiStream()
+
+        for engine in CalendarEngine:
+            calendar = engine.calendar(compaction=0.25)
+
+            # step 1: schedule
+            _events = [Event(EventType.COMPLETION_CLOUDLET_TASK_2, rndgen.rnd()) for _ in range(1000)]
+            calendar.schedule(*_events)
+
+            # step 2: unschedule half of the events
+            for _ev in _events[::2]:
+                calendar.unschedule(_ev.handle)
+            self.assertLess(calendar._size(), 700)
+
+            # step 3: test
+            _expected = sorted(_events[1::2], key=lambda x: x.time)
+            for _ev in _expected:
+                self.assertIs(_ev, calendar.get_next_event())
+            self.assertTrue(calendar.empty())
+
+    def test_calendar_queue_resizing(self):
+        """
+        Verify that the calendar queue resizes its buckets as the event population grows and shrinks,
+        retrieving events in the same order as the binary heap while they are interleaved with scheduling.
+        :return: None
+        """
+        rndgen = MarcianiMultiStream()
+
+        heap = NextEventCalendar()
+        calendar = CalendarQueueCalendar()
+
+        # step 1: grow, holding events at increasing times
+        for _ in range(2000):
+            event = Event(EventType.COMPLETION_CLOUD_TASK_1, heap.get_clock() + rndgen.rnd())
+            heap.schedule(event)
+            calendar.schedule(event)
+            if rndgen.rnd() < 0.25:
+                self.assertIs(heap.get_next_event(), calendar.get_next_event())
+        self.assertGreater(len(calendar._buckets), 256)
+
+        # step 2: shrink
+        while not heap.empty():
+            self.assertIs(heap.get_next_event(), calendar.get_next_event())
+        self.assertTrue(calendar.empty())
+        self.assertLess(len(calendar._buckets), 8)
+
+    def test_calendar_queue_unscheduling(self):
+        """
+        Verify that the calendar queue retrieves events in the same order as the binary heap when events are heavily
+        unscheduled, so that dead entries are retrieved while the buckets shrink.
+        :return: None
+        """
+        rndgen = MarcianiMultiStream()
+
+        for _ in range(50):
+            heap = NextEventCalendar()
+            calendar = CalendarQueueCalendar()
+            handles = []
+            for _ in range(1000):
+                u = rndgen.rnd()
+                if u < 0.45:
+                    event = Event(EventType.COMPLETION_CLOUD_TASK_1, heap.get_clock() + rndgen.rnd())
+                    handles.append((heap.schedule(event)[0], calendar.schedule(event)[0]))
+                elif u < 0.75 and len(handles) > 0:
+                    heap_handle, calendar_handle = handles.pop(int(rndgen.rnd() * len(handles)))
+                    heap.unschedule(heap_handle)
+                    calendar.unschedule(calendar_handle)
+                else:
+                    self.assertIs(heap.get_next_event(), calendar.get_next_event())
+                    self.assertEqual(heap.empty(), calendar.empty())
+                self.assertGreaterEqual(calendar._ndead, 0)
+
+            while not heap.empty():
+                self.assertIs(heap.get_next_event(), calendar.get_next_event())
+            self.assertTrue(calendar.empty())
+            self.assertIsNone(calendar.get_next_event())
+
 
 if __name__ == "__main__":
     unittest.main()
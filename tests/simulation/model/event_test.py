@@ -0,0 +1,57 @@
+import unittest
+
+from pydes.core.simulation.model.calendar import NextEventCalendar
+from pydes.core.simulation.model.event import EventType, SimpleEvent
+from pydes.core.simulation.model.scope import ActionScope, SystemScope, TaskScope
+
+
+class EventTest(unittest.TestCase):
+    def test_event_type_lookup(self):
+        """
+        Verify that every event type is found by (action, scope, task), and that missing triples raise KeyError.
+        :return: None
+        """
+        for event_type in EventType:
+            self.assertIs(event_type, EventType.of(event_type.act, event_type.sys, event_type.tsk))
+        with self.assertRaises(KeyError):
+            EventType.of(ActionScope.COMPLETION, SystemScope.SYSTEM, TaskScope.GLOBAL)
+
+    def test_slots(self):
+        """
+        Verify that events do not allocate an attribute dictionary, and expose typed metadata.
+        :return: None
+        """
+        event = SimpleEvent(EventType.COMPLETION_CLOUD_TASK_2, 2.0, t_arrival=1.0, switched=True)
+        self.assertFalse(hasattr(event, "__dict__"))
+        self.assertEqual(1.0, event.t_arrival)
+        self.assertTrue(event.switched)
+        self.assertFalse(SimpleEvent(EventType.COMPLETION_CLOUD_TASK_2, 2.0, t_arrival=1.0).switched)
+
+    def test_recycling(self):
+        """
+        Verify that released events are reused, with fresh metadata and handle, and scheduled correctly.
+        :return: None
+        """
+        calendar = NextEventCalendar()
+
+        e_1 = SimpleEvent.create(EventType.COMPLETION_CLOUDLET_TASK_2, 2.0, t_arrival=1.0, switched=True, server_idx=3)
+        calendar.schedule(e_1)
+        self.assertIs(e_1, calendar.get_next_event())
+        e_1.release()
+
+        e_2 = SimpleEvent.create(EventType.COMPLETION_CLOUDLET_TASK_1, 3.0, t_arrival=2.5)
+        self.assertIs(e_1, e_2)
+        self.assertIs(EventType.COMPLETION_CLOUDLET_TASK_1, e_2.type)
+        self.assertEqual(3.0, e_2.time)
+        self.assertEqual(2.5, e_2.t_arrival)
+        self.assertFalse(e_2.switched)
+        self.assertIsNone(e_2.server_idx)
+        self.assertIsNone(e_2.handle)
+
+        calendar.schedule(e_2)
+        self.assertIs(e_2, calendar.get_next_event())
+        self.assertEqual(3.0, calendar.get_clock())
+
+
+if __name__ == "__main__":
+    unittest.main()
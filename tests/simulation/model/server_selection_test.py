@@ -0,0 +1,128 @@
+import random
+import unittest
+
+from pydes.core.rnd.rndcmp import RandomComponent
+from pydes.core.rnd.rndgen import MarcianiMultiStream
+from pydes.core.rnd.rndvar import Variate
+from pydes.core.simulation.model.scope import TaskScope
+from pydes.core.simulation.model.server import ServerState
+from pydes.core.simulation.model.server import SimpleServer as Server
+from pydes.core.simulation.model.server_selection import SelectionRule
+
+
+def select_idle_linear(rule, servers, last):
+    """
+    The reference idle server selection, by linear scan.
+    """
+    candidates = [idx for idx, srv in enumerate(servers) if srv.state is ServerState.IDLE]
+    if len(candidates) == 0:
+        return None
+    if rule is SelectionRule.ORDER:
+        return candidates[0]
+    if rule is SelectionRule.CYCLIC:
+        return next((idx for idx in candidates if idx > last), candidates[0])
+    if rule is SelectionRule.EQUITY:
+        return max(candidates, key=lambda idx: servers[idx].t_idle)
+
+
+def select_interruption_linear(rule, servers, last, tsk):
+    """
+    The reference interruption server selection, by linear scan.
+    """
+    candidates = [idx for idx, srv in enumerate(servers) if srv.task_type is tsk]
+    if len(candidates) == 0:
+        return None
+    if rule is SelectionRule.ORDER:
+        return candidates[0]
+    if rule is SelectionRule.CYCLIC:
+        return next((idx for idx in candidates if idx > last), candidates[0])
+    if rule is SelectionRule.EQUITY:
+        return min(candidates, key=lambda idx: servers[idx].switched[tsk])
+
+
+class ServerSelectionTest(unittest.TestCase):
+    def setUp(self):
+        self.rndgen = MarcianiMultiStream()
+        self.rndservice = RandomComponent(
+            gen=self.rndgen,
+            str={tsk: tsk.value for tsk in TaskScope.concrete()},
+            var={tsk: Variate.EXPONENTIAL for tsk in TaskScope.concrete()},
+            par={tsk: {"m": 1.0} for tsk in TaskScope.concrete()},
+        )
+
+    def test_incremental_selection(self):
+        """
+        Verify that incremental selectors select the same servers as linear scans, across random state transitions.
+        :return: None
+        """
+        for rule in SelectionRule:
+            servers = [Server(self.rndservice, i) for i in range(50)]
+            selector = rule.selector(servers, self.rndgen)
+            last = 0
+            t_now = 0.0
+
+            for _ in range(5000):
+                t_now += 0.01
+                u = self.rndgen.rnd()
+                tsk = TaskScope.TASK_1 if self.rndgen.rnd() < 0.5 else TaskScope.TASK_2
+
+                if u < 0.5:
+                    # arrival
+                    idx = selector.select_idle()
+                    if rule is SelectionRule.RANDOM:
+                        self.assertTrue(idx is None or servers[idx].state is ServerState.IDLE)
+                    else:
+                        self.assertEqual(select_idle_linear(rule, servers, last), idx)
+                    if idx is None:
+                        continue
+                    servers[idx].submit_arrival(tsk, t_now)
+                    selector.on_busy(idx, tsk)
+                elif u < 0.75:
+                    # interruption
+                    idx = selector.select_interruption(tsk)
+                    if rule is SelectionRule.RANDOM:
+                        self.assertTrue(idx is None or servers[idx].task_type is tsk)
+                    else:
+                        self.assertEqual(select_interruption_linear(rule, servers, last, tsk), idx)
+                    if idx is None:
+                        continue
+                    servers[idx].t_completion = t_now
+                    servers[idx].submit_interruption(tsk, t_now)
+                    selector.on_idle(idx, tsk)
+                else:
+                    # completion
+                    busy = [idx for idx, srv in enumerate(servers) if srv.state is ServerState.BUSY]
+                    if len(busy) == 0:
+                        continue
+                    idx = busy[int(self.rndgen.rnd() * len(busy))]
+                    tsk = servers[idx].task_type
+                    servers[idx].submit_completion()
+                    selector.on_idle(idx, tsk)
+                    continue
+                last = idx
+
+    def test_random_reproducibility(self):
+        """
+        Verify that the RANDOM rule selects the same servers given the same seed, regardless of the global random state.
+        :return: None
+        """
+        selections = []
+        for seed in (123456789, 123456789):
+            rndgen = MarcianiMultiStream(iseed=seed)
+            servers = [Server(self.rndservice, i) for i in range(50)]
+            selector = SelectionRule.RANDOM.selector(servers, rndgen)
+            selected = []
+            for _ in range(40):
+                idx = selector.select_idle()
+                servers[idx].submit_arrival(TaskScope.TASK_2, 0.0)
+                selector.on_busy(idx, TaskScope.TASK_2)
+                selected.append(idx)
+            selected.append(selector.select_interruption(TaskScope.TASK_2))
+            selections.append(selected)
+            random.seed(seed + 1)
+        self.assertEqual(selections[0], selections[1])
+        self.assertNotEqual(list(range(40)), selections[0][:40])
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -1,9 +1,23 @@
+import os
+import tempfile
 import unittest
+from copy import deepcopy
 
-from pydes.core.simulation.model.config import get_default_configuration
-from pydes.core.simulation.model.scope import TaskScope
+import numpy as np
+
+from pydes.core.metrics.sampling import SamplingFormat
+from pydes.core.metrics.sampling_policy import SamplingPolicy
+from pydes.core.simulation.model.config import (
+    get_default_configuration,
+    load_configuration,
+)
+from pydes.core.simulation.model.scope import SystemScope, TaskScope
 from pydes.core.simulation.model.server_selection import SelectionRule
 from pydes.core.simulation.simulation import Simulation as Simulation
+from pydes.core.utils.csv_utils import read_csv
+from pydes.core.utils.trace_utils import TraceReader
+
+CONFIG_PATH = os.path.join(os.path.dirname(__file__), "..", "..", "resources", "config", "performance_analysis_1.yaml")
 
 
 class SimulationCloudTest(unittest.TestCase):
@@ -15,6 +29,27 @@ class SimulationCloudTest(unittest.TestCase):
         self.n_batch = 3
         self.t_batch = 50
 
+        # A short performance analysis, whose general settings are overridden by every test (see *simulate*)
+        self.config = load_configuration(CONFIG_PATH)
+        self.config["general"]["batches"] = 5
+        self.config["general"]["batchdim"] = 20
+        self.tmpdir = tempfile.TemporaryDirectory()
+
+    def tearDown(self):
+        self.tmpdir.cleanup()
+
+    def simulate(self, **general):
+        """
+        Run a simulation of the test configuration, overriding its general settings.
+        :param general: the general settings to override.
+        :return: (Simulation) the simulation, once run.
+        """
+        config = deepcopy(self.config)
+        config["general"].update(general)
+        simulation = Simulation(config)
+        simulation.run(outdir=self.tmpdir.name)
+        return simulation
+
     def test_run(self):
         """
         Check the absence of exception for notable configurations.
@@ -30,6 +65,131 @@ class SimulationCloudTest(unittest.TestCase):
             simulation = Simulation(config)
             simulation.run()
 
+    def test_precision(self):
+        """
+        Verify that a simulation with a target precision stops as soon as the precision is reached,
+        and never before the maximum number of batches otherwise.
+        :return: None
+        """
+        precision = {"target": 0.5, "metrics": ["response_system_global"], "min_batches": 3}
+        simulation = self.simulate(batches=40, precision=precision)
+        measure = simulation.metrics.get_measure("response_system_global")
+        self.assertTrue(simulation.precision_reached)
+        self.assertLess(simulation.metrics.n_batches, 40)
+        self.assertLessEqual(measure.cint(1.0 - simulation.confidence), 0.5 * measure.mean())
+
+        simulation = self.simulate(batches=40, precision=dict(precision, target=0.0))
+        self.assertFalse(simulation.precision_reached)
+        self.assertGreaterEqual(simulation.metrics.n_batches, 40)
+
+    def test_adaptive_batchdim(self):
+        """
+        Verify that an adaptive batch dimension doubles, merging batches, while batch means are correlated,
+        up to the maximum batch dimension.
+        :return: None
+        """
+        simulation = self.simulate(batches=16, batchdim=2, adaptive_batchdim={"batches": 16, "max_batchdim": 16})
+        self.assertTrue(simulation.metrics.batchdim_settled)
+        self.assertFalse(simulation.metrics.batchdim_uncorrelated)
+        self.assertEqual(16, simulation.metrics.target_batchdim)
+        self.assertGreaterEqual(simulation.metrics.n_batches, 16)
+        measure = simulation.metrics.get_measure("response_system_global")
+        self.assertEqual(simulation.metrics.n_batches, measure.nbatch())
+
+        # Batch means are tested within the number of batches
+        with self.assertRaises(ValueError):
+            self.simulate(batches=16, adaptive_batchdim={"batches": 32})
+
+    def test_warmup(self):
+        """
+        Verify that data collected during the warm-up are discarded, once its end has been detected, e.g. for the
+        population, that grows from the empty-system start.
+        :return: None
+        """
+        simulation = self.simulate(batches=20, batchdim=50, warmup={"metrics": ["population_system_global"]})
+        sampled = len(read_csv(simulation.sampling_file))
+        detector = simulation.warmup_detectors["population_system_global"]
+        self.assertTrue(detector.detected)
+        self.assertGreater(detector.truncation, 0)
+        self.assertGreater(simulation.t_tran, 0.0)
+        self.assertEqual(simulation.t_tran, simulation.metrics.t_origin)
+        self.assertGreaterEqual(simulation.metrics.n_batches, 20)
+        self.assertGreaterEqual(
+            sampled - simulation.metrics.n_samples, detector.truncation * simulation.warmup_batchdim
+        )
+
+    def test_sampling_interval(self):
+        """
+        Verify that performance metrics are sampled every sampling interval completions.
+        :return: None
+        """
+        simulation = self.simulate(sampling_interval=3)
+        completed = simulation.metrics.counters.completed[SystemScope.SYSTEM][TaskScope.GLOBAL]
+        self.assertEqual(completed, simulation.n_completions)
+        self.assertEqual(completed // 3, simulation.metrics.n_samples)
+
+    def test_sampling_policy(self):
+        """
+        Verify that samples on the time grid are taken every sampling interval time units, and that samples in the
+        reservoir are a sorted subset of the ones taken every completion, with the size of the reservoir.
+        :return: None
+        """
+        samples, n_samples = {}, {}
+        for sampling in (
+            {"policy": SamplingPolicy.EVERY_K},
+            {"policy": SamplingPolicy.TIME_GRID, "interval": 0.5},
+            {"policy": SamplingPolicy.RESERVOIR, "size": 50},
+        ):
+            simulation = self.simulate(sampling=sampling)
+            samples[sampling["policy"]] = read_csv(simulation.sampling_file)
+            n_samples[sampling["policy"]] = simulation.metrics.n_samples
+
+        times = [float(sample["time"]) for sample in samples[SamplingPolicy.TIME_GRID]]
+        self.assertEqual(n_samples[SamplingPolicy.TIME_GRID], len(times))
+        for k, t in enumerate(times, 1):
+            self.assertEqual(k * 0.5, t)
+
+        self.assertEqual(n_samples[SamplingPolicy.EVERY_K], n_samples[SamplingPolicy.RESERVOIR])
+        self.assertEqual(50, len(samples[SamplingPolicy.RESERVOIR]))
+        expected = {sample["time"]: sample for sample in samples[SamplingPolicy.EVERY_K]}
+        times = [float(sample["time"]) for sample in samples[SamplingPolicy.RESERVOIR]]
+        self.assertEqual(sorted(times), times)
+        for sample in samples[SamplingPolicy.RESERVOIR]:
+            self.assertEqual(expected[sample["time"]], sample)
+
+    def test_sampling_format(self):
+        """
+        Verify that the sampling trace has the same samples of the sampling CSV.
+        :return: None
+        """
+        samples = {}
+        for sampling_format in SamplingFormat:
+            simulation = self.simulate(sampling_format=sampling_format)
+            self.assertTrue(simulation.sampling_file.endswith(".{}".format(sampling_format.extension)))
+            if sampling_format is SamplingFormat.CSV:
+                samples[sampling_format] = read_csv(simulation.sampling_file)
+            else:
+                with TraceReader(simulation.sampling_file) as reader:
+                    samples[sampling_format] = list(reader.rows())
+        self.assertEqual(len(samples[SamplingFormat.CSV]), len(samples[SamplingFormat.NPZ]))
+        for expected, actual in zip(samples[SamplingFormat.CSV], samples[SamplingFormat.NPZ]):
+            self.assertEqual(list(expected), list(actual))
+            for name, value in expected.items():
+                self.assertEqual(float(value), float(actual[name]))
+
+    def test_sampling_compress(self):
+        """
+        Verify that the sampling trace is memory-mapped on read if it is not compressed.
+        :return: None
+        """
+        for sampling_compress in (True, False):
+            simulation = self.simulate(sampling_format=SamplingFormat.NPZ, sampling_compress=sampling_compress)
+            with TraceReader(simulation.sampling_file) as reader:
+                chunk = next(reader.chunks())
+                self.assertEqual(simulation.metrics.n_samples, reader.column("time").size)
+                for name in reader.columns:
+                    self.assertEqual(not sampling_compress, isinstance(chunk[name], np.memmap))
+
     @unittest.skip("Under Debugging")
     def test_flow_consistency(self):
         """
@@ -0,0 +1,37 @@
+import json
+import unittest
+
+from pydes.cli import main
+from pydes.exp.simulation.sweep import get_point_name
+
+
+class SweepTest(unittest.TestCase):
+    def test_point_name(self):
+        """
+        Verify that names of points are safe file names, and distinct for distinct points.
+        :return: None
+        """
+        self.assertEqual("default", get_point_name({}))
+        self.assertEqual(
+            "system.cloudlet.threshold-5__system.cloudlet.n_servers-20",
+            get_point_name({"system.cloudlet.threshold": 5, "system.cloudlet.n_servers": 20}),
+        )
+
+        names = [get_point_name({"general.name": value}) for value in ("../a b", "../a/b", "_.._a_b")]
+        self.assertEqual(len(names), len(set(names)))
+        for name in names:
+            self.assertRegex(name, r"^[A-Za-z0-9._-]+$")
+
+    def test_help_examples(self):
+        """
+        Verify that the JSON examples in the help of the sweep command are valid JSON.
+        :return: None
+        """
+        for option in ("grid", "parameters"):
+            param = next(param for param in main.commands["sweep"].params if param.name == option)
+            example = param.help.split("e.g. ", 1)[1].rstrip(".")
+            self.assertIsInstance(json.loads(example), dict)
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,43 @@
+import os
+import unittest
+from copy import deepcopy
+
+from pydes.core.rnd.rndgen import DEFAULT_STREAMS, lehmer_jump
+from pydes.core.simulation.model.config import load_configuration
+from pydes.core.simulation.simulation import Simulation as Simulation
+from pydes.exp.simulation.transient_analysis import get_replication_seeds
+
+CONFIG_PATH = os.path.join(os.path.dirname(__file__), "..", "..", "resources", "config", "transient_analysis_1.yaml")
+
+
+class TransientAnalysisTest(unittest.TestCase):
+    def test_replication_seeds_expanded(self):
+        """
+        Verify that replication seeds do not overlap when the stream allocation expands the generator, i.e. that they
+        are spaced by the jump size of the expanded generator, that is the same in every replication.
+        :return: None
+        """
+        config = load_configuration(CONFIG_PATH)
+        config["system"]["cloudlet"]["n_servers"] = DEFAULT_STREAMS + 1
+        replications = 4
+
+        seeds = get_replication_seeds(config, replications)
+
+        self.assertEqual(replications, len(set(seeds)))
+        for seed in seeds:
+            replica = deepcopy(config)
+            replica["general"]["random"]["seed"] = seed
+            generator = Simulation(replica).rndgen
+            self.assertGreater(generator.get_nstreams(), DEFAULT_STREAMS)
+            substream = generator.get_jump_size() // replications
+            self.assertEqual(
+                [
+                    lehmer_jump(seeds[0], i * substream, generator.get_multiplier(), generator.get_modulus())
+                    for i in range(replications)
+                ],
+                seeds,
+            )
+
+
+if __name__ == "__main__":
+    unittest.main()
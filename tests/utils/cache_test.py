@@ -0,0 +1,100 @@
+import os
+import tempfile
+import time
+import unittest
+
+from pydes.core.simulation.model.config import (
+    get_default_configuration,
+    load_configuration,
+    normalize,
+)
+from pydes.core.simulation.simulation_mode import SimulationMode
+from pydes.core.utils.cache import ResultCache
+from pydes.core.utils.report import SimpleReport
+
+ANALYTICAL_CONFIG_PATH = os.path.join(
+    os.path.dirname(__file__), "..", "..", "resources", "config", "analytical_solution_1.yaml"
+)
+
+
+class CacheTest(unittest.TestCase):
+    def setUp(self):
+        self.tmpdir = tempfile.TemporaryDirectory()
+        self.cache = ResultCache(self.tmpdir.name)
+
+    def tearDown(self):
+        self.tmpdir.cleanup()
+
+    def test_key(self):
+        """
+        Verify that keys depend on the content of the configuration, the mode and the seed only.
+        :return: None
+        """
+        config = get_default_configuration(SimulationMode.PERFORMANCE_ANALYSIS)
+        key = self.cache.key(config, SimulationMode.PERFORMANCE_ANALYSIS, 123456789)
+        self.assertEqual(
+            key,
+            self.cache.key(
+                get_default_configuration(SimulationMode.PERFORMANCE_ANALYSIS),
+                SimulationMode.PERFORMANCE_ANALYSIS,
+                123456789,
+            ),
+        )
+        self.assertNotEqual(key, self.cache.key(config, SimulationMode.PERFORMANCE_ANALYSIS, 987654321))
+        self.assertNotEqual(key, self.cache.key(config, SimulationMode.TRANSIENT_ANALYSIS, 123456789))
+        config["system"]["cloudlet"]["n_servers"] += 1
+        self.assertNotEqual(key, self.cache.key(config, SimulationMode.PERFORMANCE_ANALYSIS, 123456789))
+
+    def test_key_normalized(self):
+        """
+        Verify that equivalent configurations have the same key once normalized, e.g. a rate and its mean.
+        :return: None
+        """
+        config = load_configuration(ANALYTICAL_CONFIG_PATH, norm=False)
+        equivalent = load_configuration(ANALYTICAL_CONFIG_PATH, norm=False)
+        parameters = equivalent["system"]["cloudlet"]["service"]["TASK_1"]["parameters"]
+        parameters["m"] = 1.0 / parameters.pop("r")
+        self.assertNotEqual(
+            self.cache.key(config, "ANALYTICAL_SOLUTION"), self.cache.key(equivalent, "ANALYTICAL_SOLUTION")
+        )
+
+        normalize(config)
+        normalize(equivalent)
+        self.assertEqual(
+            self.cache.key(config, "ANALYTICAL_SOLUTION"), self.cache.key(equivalent, "ANALYTICAL_SOLUTION")
+        )
+
+    def test_get_put(self):
+        """
+        Verify that stored reports are retrieved.
+        :return: None
+        """
+        report = SimpleReport("SAMPLE-REPORT")
+        report.add("section", "param", 1.5)
+        self.assertIsNone(self.cache.get("key"))
+        self.cache.put("key", report)
+        self.assertEqual(str(report), str(self.cache.get("key")))
+
+    def test_eviction(self):
+        """
+        Verify that the least recently used results are evicted when the cache exceeds its maximum size.
+        :return: None
+        """
+        for key in ("a", "b", "c"):
+            self.cache.put(key, "x" * 1000)
+        size = self.cache.size()
+
+        # Make "a" the most recently used, so that "b" is the least recently used
+        now = time.time()
+        for i, key in enumerate(("b", "c", "a")):
+            os.utime(os.path.join(self.tmpdir.name, "{}.pickle".format(key)), (now + i, now + i))
+
+        self.cache.max_size = size - 1
+        self.cache.evict()
+        self.assertIsNone(self.cache.get("b"))
+        self.assertIsNotNone(self.cache.get("a"))
+        self.assertIsNotNone(self.cache.get("c"))
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,44 @@
+import os
+import tempfile
+import unittest
+
+from pydes.core.utils.csv_utils import BufferedCSVWriter, save_csv
+
+HEADER = ["time", "Response Time", "throughput/system"]
+ROWS = [[0.5, 1, 2.5], [1.5, 3, 4.5], [2.5, 5, 6.5]]
+
+
+class CSVUtilsTest(unittest.TestCase):
+    def setUp(self):
+        self.tmpdir = tempfile.TemporaryDirectory()
+
+    def tearDown(self):
+        self.tmpdir.cleanup()
+
+    def test_buffered_writer(self):
+        """
+        Verify that the buffered writer has the same CSV layout of rows appended one by one,
+        and that rows are flushed as soon as the row budget is exceeded.
+        :return: None
+        """
+        expected_file = os.path.join(self.tmpdir.name, "expected.csv")
+        for row in ROWS:
+            save_csv(expected_file, HEADER, [row], append=True)
+        with open(expected_file, "r") as f:
+            expected = f.read()
+
+        actual_file = os.path.join(self.tmpdir.name, "actual.csv")
+        with BufferedCSVWriter(actual_file, HEADER, max_rows=3) as writer:
+            writer.write(ROWS[0])
+            with open(actual_file, "r") as f:
+                self.assertEqual("", f.read())
+            writer.write(ROWS[1])
+            with open(actual_file, "r") as f:
+                self.assertEqual(expected.splitlines(keepends=True)[:3], f.readlines())
+            writer.write(ROWS[2])
+        with open(actual_file, "r") as f:
+            self.assertEqual(expected, f.read())
+
+
+if __name__ == "__main__":
+    unittest.main()
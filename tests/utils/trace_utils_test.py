@@ -0,0 +1,85 @@
+import os
+import tempfile
+import unittest
+
+import numpy as np
+
+from pydes.core.utils.trace_utils import TraceReader, TraceWriter, is_trace_file
+
+HEADER = ["time", "completed", "response"]
+ROWS = [[0.5, 1, 2.5], [1.5, 3, 4.5], [2.5, 5, 6.5], [3.5, 7, 8.5], [4.5, 9, 10.5]]
+
+
+class TraceUtilsTest(unittest.TestCase):
+    def setUp(self):
+        self.tmpdir = tempfile.TemporaryDirectory()
+
+    def tearDown(self):
+        self.tmpdir.cleanup()
+
+    def test_round_trip(self):
+        """
+        Verify that columns are read back with their values and types, both from compressed and stored traces,
+        and that stored traces are memory-mapped.
+        :return: None
+        """
+        for compress in (True, False):
+            filename = os.path.join(self.tmpdir.name, "trace_{}.npz".format(compress))
+            self.assertTrue(is_trace_file(filename))
+            with TraceWriter(filename, HEADER, max_rows=2, compress=compress) as writer:
+                for row in ROWS:
+                    writer.write(row)
+
+            with TraceReader(filename) as reader:
+                self.assertEqual(HEADER, reader.columns)
+                self.assertEqual(3, reader.n_chunks)
+                columns = reader.read()
+                for i, name in enumerate(HEADER):
+                    self.assertEqual([row[i] for row in ROWS], columns[name].tolist())
+                self.assertEqual(np.int64, columns["completed"].dtype)
+                self.assertEqual(np.float64, columns["response"].dtype)
+
+                chunk = next(reader.chunks(["response"]))
+                self.assertEqual(["response"], list(chunk))
+                self.assertEqual(not compress, isinstance(chunk["response"], np.memmap))
+
+                self.assertEqual(
+                    [{"time": row[0], "response": row[2]} for row in ROWS], list(reader.rows(["time", "response"]))
+                )
+                with self.assertRaises(KeyError):
+                    reader.column("unknown")
+
+    def test_empty(self):
+        """
+        Verify that a trace without rows has its columns only.
+        :return: None
+        """
+        filename = os.path.join(self.tmpdir.name, "empty.npz")
+        with TraceWriter(filename, HEADER):
+            pass
+        with TraceReader(filename) as reader:
+            self.assertEqual(HEADER, reader.columns)
+            self.assertEqual(0, reader.n_chunks)
+            self.assertEqual(0, len(reader.column("time")))
+
+    def test_byte_budget(self):
+        """
+        Verify that chunks are bounded by the byte budget, and that columns have the given types.
+        :return: None
+        """
+        filename = os.path.join(self.tmpdir.name, "budget.npz")
+        dtypes = [np.float64, np.int32, np.float32]
+        with TraceWriter(filename, HEADER, dtypes=dtypes, max_bytes=2 * 16) as writer:
+            for row in ROWS:
+                writer.write(row)
+
+        with TraceReader(filename) as reader:
+            self.assertEqual(3, reader.n_chunks)
+            columns = reader.read()
+            for i, name in enumerate(HEADER):
+                self.assertEqual(dtypes[i], columns[name].dtype)
+                self.assertEqual([row[i] for row in ROWS], columns[name].tolist())
+
+
+if __name__ == "__main__":
+    unittest.main()